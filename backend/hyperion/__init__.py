@@ -133,7 +133,7 @@ async def shutdown():
     """
     Shutdown all Hyperion components
     """
-    global core, config, lifecycle, integration
+    global core, config, lifecycle, integration, observability, security
     
     logger.info("Shutting down Hyperion")
     
@@ -149,6 +149,14 @@ async def shutdown():
     if core:
         await core.stop()
     
+    # Flush queued trace spans
+    if observability:
+        await observability.shutdown_export()
+    
+    # Stop the token expiry sweep
+    if security:
+        await security.stop_token_sweep()
+    
     logger.info("Hyperion shutdown complete")
 
 
@@ -7,12 +7,15 @@ and cloud services.
 
 import asyncio
 import base64
+import gzip
 import hashlib
 import hmac
 import json
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
@@ -26,6 +29,33 @@ try:
 except ImportError:
     HAS_REQUESTS = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+
+def _encode_json(payload: Any) -> bytes:
+    """
+    Encode a payload as UTF-8 JSON, using orjson when available
+    
+    Args:
+        payload: JSON-serializable payload
+        
+    Returns:
+        Encoded JSON bytes
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
 
 class IntegrationType(Enum):
     """Types of supported integrations"""
@@ -327,7 +357,10 @@ class IntegrationManager:
         for name, integration in list(self.integrations.items()):
             if hasattr(integration, 'shutdown') and callable(integration.shutdown):
                 try:
-                    integration.shutdown()
+                    if hasattr(integration, 'shutdown_async'):
+                        await integration.shutdown_async()
+                    else:
+                        integration.shutdown()
                     logger.info(f"Shutdown integration: {name}")
                 except Exception as e:
                     logger.warning(f"Error shutting down integration {name}: {str(e)}")
@@ -393,6 +426,10 @@ class BaseIntegration:
         """Shutdown the integration"""
         pass
     
+    async def shutdown_async(self) -> None:
+        """Shutdown the integration from the event loop"""
+        self.shutdown()
+    
     def _redact_sensitive_config(self) -> Dict[str, Any]:
         """
         Create a copy of config with sensitive fields redacted
@@ -1701,6 +1738,11 @@ class CustomIntegration(BaseIntegration):
                 - alerts_url: URL for sending alerts
                 - auth_header: Optional authentication header
                 - method: HTTP method to use (POST, PUT)
+                - encode_offload_threshold: Log batch size above which JSON
+                  encoding and the request run in a worker thread (default 2000)
+                - compression: Optional payload compression for metrics and
+                  logs ('zstd' or 'gzip'); the endpoint must accept the
+                  matching Content-Encoding
         """
         super().__init__(name, config, IntegrationType.CUSTOM)
         self.metrics_url = config.get('metrics_url')
@@ -1708,6 +1750,18 @@ class CustomIntegration(BaseIntegration):
         self.alerts_url = config.get('alerts_url')
         self.auth_header = config.get('auth_header')
         self.method = config.get('method', 'POST').upper()
+        self.encode_offload_threshold = config.get('encode_offload_threshold', 2000)
+        self._encoder_pool = None
+        
+        # Payload compression
+        self.compression = config.get('compression')
+        if self.compression == 'zstd' and not HAS_ZSTD:
+            logger.warning("zstandard library not available, falling back to gzip compression")
+            self.compression = 'gzip'
+        elif self.compression not in (None, 'zstd', 'gzip'):
+            logger.warning(f"Unsupported compression '{self.compression}', sending uncompressed")
+            self.compression = None
+        self._compressors = threading.local()  # zstd compressors are not thread-safe
         
         # Authentication header parsing
         self.auth = None
@@ -1733,6 +1787,28 @@ class CustomIntegration(BaseIntegration):
             logger.warning("Requests library not available, custom integration will be disabled")
             self.enabled = False
     
+    def _encode_body(self, payload: Dict[str, Any]) -> bytes:
+        """
+        Encode a payload as JSON and apply the configured compression
+        
+        Args:
+            payload: Request payload
+            
+        Returns:
+            Request body bytes
+        """
+        body = _encode_json(payload)
+        
+        if self.compression == 'zstd':
+            compressor = getattr(self._compressors, 'zstd', None)
+            if compressor is None:
+                compressor = zstandard.ZstdCompressor(level=3)
+                self._compressors.zstd = compressor
+            return compressor.compress(body)
+        if self.compression == 'gzip':
+            return gzip.compress(body, compresslevel=6)
+        return body
+    
     async def send_metrics(
         self,
         metrics: Dict[str, Any],
@@ -1763,8 +1839,12 @@ class CustomIntegration(BaseIntegration):
             if tags:
                 payload['tags'] = tags
             
+            body = self._encode_body(payload)
+            
             # Prepare request
             headers = {'Content-Type': 'application/json'}
+            if self.compression:
+                headers['Content-Encoding'] = self.compression
             if hasattr(self, 'headers'):
                 headers.update(self.headers)
             
@@ -1772,14 +1852,14 @@ class CustomIntegration(BaseIntegration):
             if self.method == 'POST':
                 response = requests.post(
                     self.metrics_url,
-                    json=payload,
+                    data=body,
                     headers=headers,
                     auth=self.auth
                 )
             elif self.method == 'PUT':
                 response = requests.put(
                     self.metrics_url,
-                    json=payload,
+                    data=body,
                     headers=headers,
                     auth=self.auth
                 )
@@ -1803,6 +1883,29 @@ class CustomIntegration(BaseIntegration):
             logger.error(f"Error sending metrics to custom endpoint: {str(e)}", exc_info=True)
             return False
     
+    def _encode_and_send(self, url: str, payload: Dict[str, Any]) -> Any:
+        """
+        Encode a payload and send it with the configured HTTP method
+        
+        Args:
+            url: Endpoint URL
+            payload: Request payload
+            
+        Returns:
+            HTTP response
+        """
+        body = self._encode_body(payload)
+        
+        # Prepare request
+        headers = {'Content-Type': 'application/json'}
+        if self.compression:
+            headers['Content-Encoding'] = self.compression
+        if hasattr(self, 'headers'):
+            headers.update(self.headers)
+        
+        send = requests.post if self.method == 'POST' else requests.put
+        return send(url, data=body, headers=headers, auth=self.auth)
+    
     async def send_logs(
         self,
         logs: List[Dict[str, Any]],
@@ -1833,29 +1936,23 @@ class CustomIntegration(BaseIntegration):
             if tags:
                 payload['tags'] = tags
             
-            # Prepare request
-            headers = {'Content-Type': 'application/json'}
-            if hasattr(self, 'headers'):
-                headers.update(self.headers)
+            if self.method not in ('POST', 'PUT'):
+                self.last_error = f"Unsupported HTTP method: {self.method}"
+                return False
             
-            # Send request
-            if self.method == 'POST':
-                response = requests.post(
-                    self.logs_url,
-                    json=payload,
-                    headers=headers,
-                    auth=self.auth
-                )
-            elif self.method == 'PUT':
-                response = requests.put(
-                    self.logs_url,
-                    json=payload,
-                    headers=headers,
-                    auth=self.auth
+            # Encode and send large batches off the event loop
+            if len(logs) > self.encode_offload_threshold:
+                if self._encoder_pool is None:
+                    self._encoder_pool = ThreadPoolExecutor(
+                        max_workers=1,
+                        thread_name_prefix=f"{self.name}-encoder"
+                    )
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    self._encoder_pool, self._encode_and_send, self.logs_url, payload
                 )
             else:
-                self.last_error = f"Unsupported HTTP method: {self.method}"
-                return False
+                response = self._encode_and_send(self.logs_url, payload)
             
             success = response.status_code in (200, 201, 202)
             if success:
@@ -1942,3 +2039,16 @@ class CustomIntegration(BaseIntegration):
             self.last_error = str(e)
             logger.error(f"Error sending alert to custom endpoint: {str(e)}", exc_info=True)
             return False
+    
+    def shutdown(self) -> None:
+        """Shutdown the integration without waiting for its encoder thread"""
+        pool, self._encoder_pool = self._encoder_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+    
+    async def shutdown_async(self) -> None:
+        """Shutdown the integration and wait for pending sends to finish"""
+        pool, self._encoder_pool = self._encoder_pool, None
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, pool.shutdown)
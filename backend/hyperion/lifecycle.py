@@ -12,11 +12,89 @@ import signal
 import sys
 import time
 import traceback
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
 
+class _LifecycleResult:
+    """Serialization shared by the startup and shutdown result records"""
+    
+    __slots__ = ()
+    
+    # Keys reported for each status, in addition to the common ones
+    _STATUS_KEYS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'success': ('elapsed',),
+        'timeout': ('timeout',),
+        'error': ('error',),
+    }
+    _COMMON_KEYS: ClassVar[Tuple[str, ...]] = ('status',)
+    
+    @property
+    def traceback(self) -> str:
+        """Formatted traceback of the captured exception, built on access"""
+        if self.exc_info is None:
+            return ''
+        return ''.join(self.exc_info.format())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a plain dictionary for API responses
+        
+        Only the keys that apply to the result's status are included. Only
+        failed results with a captured exception carry a 'traceback' entry,
+        so successful results never pay for formatting one.
+        """
+        keys = self._COMMON_KEYS + self._STATUS_KEYS.get(self.status, ())
+        data = {key: getattr(self, key) for key in keys}
+        if self.exc_info is not None:
+            data['traceback'] = self.traceback
+        return data
+
+
+def _capture_exception(exc: BaseException) -> traceback.TracebackException:
+    """
+    Capture an exception for a result record without keeping its frames alive
+    
+    Args:
+        exc: Exception to capture
+        
+    Returns:
+        Traceback snapshot; source lines are only read when it is formatted
+    """
+    return traceback.TracebackException.from_exception(exc, lookup_lines=False)
+
+
+@dataclass(slots=True)
+class ShutdownResult(_LifecycleResult):
+    """Outcome of a single shutdown handler"""
+    _COMMON_KEYS: ClassVar[Tuple[str, ...]] = ('name', 'status')
+    
+    name: str
+    status: str
+    elapsed: float = 0.0
+    timeout: float = 0.0
+    error: str = ''
+    exc_info: Optional[traceback.TracebackException] = None
+
+
+@dataclass(slots=True)
+class StartupResult(_LifecycleResult):
+    """Outcome of a single component initialization"""
+    _STATUS_KEYS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        **_LifecycleResult._STATUS_KEYS,
+        'success': ('elapsed', 'result'),
+    }
+    
+    status: str
+    elapsed: float = 0.0
+    timeout: float = 0.0
+    error: str = ''
+    exc_info: Optional[traceback.TracebackException] = None
+    result: Any = None
+
+
 class ShutdownManager:
     """
     Manage graceful shutdown of application components
@@ -38,6 +116,7 @@ class ShutdownManager:
         self.shutdown_started = 0.0
         self.shutdown_complete = False
         self.shutdown_results = []
+        self._done_event = asyncio.Event()
         
         # Signal handling setup
         self._setup_signal_handlers()
@@ -101,9 +180,10 @@ class ShutdownManager:
         # Sort by priority (descending)
         self.registered_handlers.sort(key=lambda x: x['priority'], reverse=True)
         
-        logger.debug(
-            f"Registered shutdown handler '{handler_name}' with priority {priority}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Registered shutdown handler '%s' with priority %s", handler_name, priority
+            )
     
     async def execute_shutdown(self, signal_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -120,10 +200,9 @@ class ShutdownManager:
             logger.info("Shutdown already in progress")
             
             # Wait for shutdown to complete
-            while not self.shutdown_complete:
-                await asyncio.sleep(0.1)
+            await self._done_event.wait()
                 
-            return {'results': self.shutdown_results}
+            return {'results': [r.to_dict() for r in self.shutdown_results]}
             
         self.shutdown_in_progress = True
         self.shutdown_started = time.time()
@@ -146,20 +225,18 @@ class ShutdownManager:
                     f"Running shutdown handler '{name}' (priority {priority})"
                 )
                 
-                # Create task with timeout
-                handler_task = asyncio.create_task(handler())
-                
                 try:
                     start_time = time.time()
-                    await asyncio.wait_for(handler_task, timeout=timeout)
+                    if timeout is None:
+                        await handler()
+                    else:
+                        await asyncio.wait_for(handler(), timeout=timeout)
                     elapsed = time.time() - start_time
                     
                     # Record success
-                    self.shutdown_results.append({
-                        'name': name,
-                        'status': 'success',
-                        'elapsed': elapsed
-                    })
+                    self.shutdown_results.append(
+                        ShutdownResult(name=name, status='success', elapsed=elapsed)
+                    )
                     
                     logger.info(
                         f"Shutdown handler '{name}' completed in {elapsed:.2f}s"
@@ -167,11 +244,9 @@ class ShutdownManager:
                     
                 except asyncio.TimeoutError:
                     # Record timeout
-                    self.shutdown_results.append({
-                        'name': name,
-                        'status': 'timeout',
-                        'timeout': timeout
-                    })
+                    self.shutdown_results.append(
+                        ShutdownResult(name=name, status='timeout', timeout=timeout)
+                    )
                     
                     logger.warning(
                         f"Shutdown handler '{name}' timed out after {timeout}s"
@@ -179,12 +254,12 @@ class ShutdownManager:
                     
             except Exception as e:
                 # Record error
-                self.shutdown_results.append({
-                    'name': name,
-                    'status': 'error',
-                    'error': str(e),
-                    'traceback': traceback.format_exc()
-                })
+                self.shutdown_results.append(ShutdownResult(
+                    name=name,
+                    status='error',
+                    error=str(e),
+                    exc_info=_capture_exception(e)
+                ))
                 
                 logger.error(
                     f"Error in shutdown handler '{name}': {str(e)}",
@@ -193,19 +268,20 @@ class ShutdownManager:
         
         # Mark shutdown as complete
         self.shutdown_complete = True
+        self._done_event.set()
         total_time = time.time() - self.shutdown_started
         
         # Log shutdown completion
         logger.info(
             f"Shutdown sequence completed in {total_time:.2f}s: "
-            f"{len([r for r in self.shutdown_results if r['status'] == 'success'])} successful, "
-            f"{len([r for r in self.shutdown_results if r['status'] == 'timeout'])} timeouts, "
-            f"{len([r for r in self.shutdown_results if r['status'] == 'error'])} errors"
+            f"{len([r for r in self.shutdown_results if r.status == 'success'])} successful, "
+            f"{len([r for r in self.shutdown_results if r.status == 'timeout'])} timeouts, "
+            f"{len([r for r in self.shutdown_results if r.status == 'error'])} errors"
         )
         
         # Return results
         return {
-            'results': self.shutdown_results,
+            'results': [r.to_dict() for r in self.shutdown_results],
             'total_time': total_time
         }
 
@@ -231,6 +307,7 @@ class StartupManager:
         self.initialized = set()  # set of initialized component names
         self.startup_complete = False
         self.startup_results = {}
+        self._topo_order = []  # dependency-first order from the last cycle check
     
     def register_component(
         self,
@@ -265,9 +342,10 @@ class StartupManager:
                 self.dependencies[dep] = []
             self.dependencies[dep].append(name)
             
-        logger.debug(
-            f"Registered component '{name}' with dependencies: {dependencies or []}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Registered component '%s' with dependencies: %s", name, dependencies or []
+            )
     
     async def initialize_all(self) -> Dict[str, Any]:
         """
@@ -301,8 +379,9 @@ class StartupManager:
             )
             
             # Check for circular dependencies
+            cyclic = self._find_circular_dependencies()
             for name in remaining:
-                if self._has_circular_dependency(name):
+                if name in cyclic:
                     logger.error(
                         f"Circular dependency detected for component '{name}'"
                     )
@@ -324,7 +403,10 @@ class StartupManager:
                 name for name, config in self.components.items()
                 if not config['initialized'] and config['required']
             ],
-            'results': self.startup_results
+            'results': {
+                name: result.to_dict()
+                for name, result in self.startup_results.items()
+            }
         }
     
     async def _initialize_component(self, name: str) -> bool:
@@ -345,10 +427,10 @@ class StartupManager:
         for dep in self.components[name]['dependencies']:
             if dep not in self.components:
                 logger.error(f"Missing dependency '{dep}' for component '{name}'")
-                self.startup_results[name] = {
-                    'status': 'error',
-                    'error': f"Missing dependency '{dep}'"
-                }
+                self.startup_results[name] = StartupResult(
+                    status='error',
+                    error=f"Missing dependency '{dep}'"
+                )
                 return False
                 
             # Initialize dependency
@@ -359,10 +441,10 @@ class StartupManager:
                 logger.error(
                     f"Required dependency '{dep}' failed for component '{name}'"
                 )
-                self.startup_results[name] = {
-                    'status': 'error',
-                    'error': f"Required dependency '{dep}' failed"
-                }
+                self.startup_results[name] = StartupResult(
+                    status='error',
+                    error=f"Required dependency '{dep}' failed"
+                )
                 return False
         
         # All dependencies are initialized, initialize this component
@@ -373,12 +455,13 @@ class StartupManager:
         try:
             logger.info(f"Initializing component '{name}'")
             
-            # Create task with timeout
             start_time = time.time()
-            init_task = asyncio.create_task(initializer())
             
             try:
-                result = await asyncio.wait_for(init_task, timeout=timeout)
+                if timeout is None:
+                    result = await initializer()
+                else:
+                    result = await asyncio.wait_for(initializer(), timeout=timeout)
                 elapsed = time.time() - start_time
                 
                 # Record success
@@ -386,11 +469,11 @@ class StartupManager:
                 config['result'] = result
                 self.initialized.add(name)
                 
-                self.startup_results[name] = {
-                    'status': 'success',
-                    'elapsed': elapsed,
-                    'result': result
-                }
+                self.startup_results[name] = StartupResult(
+                    status='success',
+                    elapsed=elapsed,
+                    result=result
+                )
                 
                 logger.info(
                     f"Component '{name}' initialized in {elapsed:.2f}s"
@@ -411,10 +494,10 @@ class StartupManager:
                 
             except asyncio.TimeoutError:
                 # Record timeout
-                self.startup_results[name] = {
-                    'status': 'timeout',
-                    'timeout': timeout
-                }
+                self.startup_results[name] = StartupResult(
+                    status='timeout',
+                    timeout=timeout
+                )
                 
                 logger.error(
                     f"Component '{name}' initialization timed out after {timeout}s"
@@ -423,11 +506,11 @@ class StartupManager:
                 
         except Exception as e:
             # Record error
-            self.startup_results[name] = {
-                'status': 'error',
-                'error': str(e),
-                'traceback': traceback.format_exc()
-            }
+            self.startup_results[name] = StartupResult(
+                status='error',
+                error=str(e),
+                exc_info=_capture_exception(e)
+            )
             
             logger.error(
                 f"Error initializing component '{name}': {str(e)}",
@@ -435,39 +518,97 @@ class StartupManager:
             )
             return False
     
-    def _has_circular_dependency(
-        self, 
-        name: str, 
-        path: Set[str] = None
-    ) -> bool:
+    def _find_circular_dependencies(self) -> Set[str]:
+        """
+        Find all components that have a circular dependency
+        
+        A component has a circular dependency if it lies on a dependency cycle
+        or depends, directly or indirectly, on a component that does. Cycles
+        are the strongly connected components found by a single iterative
+        Tarjan traversal, so every component and edge is visited once and no
+        Python recursion is involved. Components are stored in
+        ``self._topo_order`` in the order their components complete, which
+        puts dependencies before dependents.
+        
+        Returns:
+            Set of component names with a circular dependency
+        """
+        components = self.components
+        index = {}
+        lowlink = {}
+        scc_stack = []
+        on_stack = set()
+        cyclic = set()
+        order = []
+        
+        for root in components:
+            if root in index:
+                continue
+                
+            index[root] = lowlink[root] = len(index)
+            scc_stack.append(root)
+            on_stack.add(root)
+            stack = [(root, iter(components[root]['dependencies']))]
+            
+            while stack:
+                node, deps = stack[-1]
+                for dep in deps:
+                    if dep not in components:
+                        continue
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = len(index)
+                        scc_stack.append(dep)
+                        on_stack.add(dep)
+                        stack.append((dep, iter(components[dep]['dependencies'])))
+                        break
+                    if dep in on_stack and index[dep] < lowlink[node]:
+                        lowlink[node] = index[dep]
+                else:
+                    stack.pop()
+                    if stack:
+                        parent = stack[-1][0]
+                        if lowlink[node] < lowlink[parent]:
+                            lowlink[parent] = lowlink[node]
+                    
+                    if lowlink[node] != index[node]:
+                        continue
+                        
+                    # node roots a strongly connected component; components it
+                    # depends on outside of it are already classified
+                    scc = []
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        scc.append(member)
+                        if member == node:
+                            break
+                    
+                    if (
+                        len(scc) > 1
+                        or node in components[node]['dependencies']
+                        or any(
+                            dep in cyclic
+                            for member in scc
+                            for dep in components[member]['dependencies']
+                        )
+                    ):
+                        cyclic.update(scc)
+                    order.extend(scc)
+        
+        self._topo_order = order
+        return cyclic
+    
+    def _has_circular_dependency(self, name: str) -> bool:
         """
         Check if a component has circular dependencies
         
         Args:
             name: Component name to check
-            path: Current dependency path (for recursion)
             
         Returns:
             True if circular dependency is detected, False otherwise
         """
-        if path is None:
-            path = set()
-            
-        # If we've seen this component before in the path, we have a cycle
-        if name in path:
-            return True
-            
-        # Add this component to the path
-        path.add(name)
-        
-        # Check dependencies
-        for dep in self.components[name]['dependencies']:
-            if dep in self.components and self._has_circular_dependency(dep, path):
-                return True
-                
-        # Remove from path when backtracking
-        path.remove(name)
-        return False
+        return name in self._find_circular_dependencies()
     
     def get_component_result(self, name: str) -> Any:
         """
@@ -11,13 +11,16 @@ import logging
 import os
 import sys
 import time
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-# Add parent directory to path for local development
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Add parent directory to path when run as a script during local development
+if not __package__:
+    _PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _PARENT_DIR not in sys.path:
+        sys.path.insert(0, _PARENT_DIR)
 
 from hyperion.core import HyperionCore
-from hyperion.metrics import MetricsCollector
+from hyperion.metrics import HistoricalSample, MetricsCollector
 from hyperion.cloud import CloudIntegration
 from hyperion.container import ContainerMonitor
 from hyperion.energy import EnergyMonitor
@@ -32,6 +35,29 @@ logging.basicConfig(
 
 logger = logging.getLogger('hyperion')
 
+_SEP = "=" * 60
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+
+def _enable_windows_vt_mode() -> bool:
+    """
+    Enable ANSI escape processing on the Windows console
+    
+    Returns:
+        True if the console now understands ANSI escape sequences
+    """
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
 
 class HyperionCLI:
     """Command line interface for Hyperion monitor"""
@@ -45,6 +71,15 @@ class HyperionCLI:
         self.ml = None
         self.running = False
         self.output_file = None
+        self._out_fp = None
+        self._sample_q = None
+        self._formatters = None
+        self._report_prefix = None
+        self._cached_ts_sec = 0
+        self._cached_ts_str = ''
+        self._is_tty = sys.stdout.isatty()
+        if self._is_tty and os.name == 'nt':
+            self._is_tty = _enable_windows_vt_mode()
         self.report_interval = 10  # seconds
     
     def parse_args(self):
@@ -132,15 +167,27 @@ class HyperionCLI:
         if args.ml:
             self.ml = MLIntegration()
         
-        # Set output file if specified
+        # Set output file if specified; kept open and buffered across reports
         if args.output:
             self.output_file = args.output
+            self._out_fp = open(self.output_file, 'wb', buffering=1 << 20)
             
-        # Set report interval
+        # Set report interval and format dispatch
         self.report_interval = args.report_interval
+        self._formatters = self._build_formatters()
+        
+        # In debug mode, have asyncio warn about callbacks blocking the loop > 50 ms
+        if args.debug:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = 0.05
         
         # Start the monitor
         await self.monitor.start()
+        
+        # Environment details are fixed once the monitor has started
+        self._report_prefix = self._build_report_prefix()
+        
         logger.info("Hyperion initialized and started")
     
     async def run_command(self, args):
@@ -154,43 +201,121 @@ class HyperionCLI:
     
     async def run_monitor(self, args):
         """Run continuous monitoring"""
-        logger.info(f"Starting continuous monitoring (interval: {self.monitor.config['check_interval']}s)")
+        logger.info("Starting continuous monitoring (interval: %ss)", self.monitor.config['check_interval'])
         
         self.running = True
-        start_time = time.time()
-        last_report_time = 0
+        deadline = time.monotonic() + args.duration if args.duration else None
+        self._sample_q = asyncio.Queue(maxsize=64)
+        
+        # Collection and reporting run as separate producer/consumer tasks
+        await asyncio.gather(
+            self._producer(self.monitor.config['check_interval'], deadline),
+            self._reporter(args)
+        )
+        
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.info("Monitoring duration of %ss elapsed, stopping", args.duration)
+        
+        # Final report
+        self.output_report(args.format, args.pretty)
+        logger.info("Monitoring stopped")
+    
+    async def _producer(self, interval: float, deadline: Optional[float] = None):
+        """
+        Collect metric samples at a fixed interval
+        
+        Each sample is also pushed to the sample queue, if one is set up. When
+        the queue is full the oldest sample is dropped so collection never
+        blocks on a slow consumer. A None sentinel is queued once collection
+        stops.
+        
+        Args:
+            interval: Collection interval in seconds
+            deadline: Optional monotonic time at which to stop running
+        """
+        queue = self._sample_q
+        
+        try:
+            await self._collect_loop(interval, deadline, queue)
+        finally:
+            if queue is not None:
+                self._put_sample(queue, None)
+    
+    @staticmethod
+    def _put_sample(queue: asyncio.Queue, sample):
+        """Queue a sample, dropping the oldest one when the queue is full"""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(sample)
+    
+    async def _collect_loop(self, interval: float, deadline: Optional[float], queue: Optional[asyncio.Queue]):
+        """Collect samples until stopped or the deadline is reached"""
+        _time = time.monotonic
+        _sleep = asyncio.sleep
+        put_sample = self._put_sample
         
         while self.running:
             try:
-                # Check if duration has elapsed
-                if args.duration and (time.time() - start_time) > args.duration:
-                    logger.info(f"Monitoring duration of {args.duration}s elapsed, stopping")
+                now = _time()
+                if deadline is not None and now >= deadline:
                     self.running = False
                     break
                 
-                # Update metrics
                 if self.metrics:
                     self.metrics.collect_all_metrics(self.monitor)
+                    
+                    if queue is not None:
+                        put_sample(queue, self.metrics.historical_data[-1])
                 
-                # Generate and output report at specified intervals
-                if (time.time() - last_report_time) >= self.report_interval:
-                    self.output_report(args.format, args.pretty)
-                    last_report_time = time.time()
-                
-                # Short sleep to avoid tight loop
-                await asyncio.sleep(1.0)
+                # Sleep until the next sample or the deadline is due
+                wake_at = now + interval
+                if deadline is not None:
+                    wake_at = min(wake_at, deadline)
+                await _sleep(max(0.0, wake_at - _time()))
                 
-            except KeyboardInterrupt:
-                logger.info("Monitoring interrupted by user")
-                self.running = False
-                break
             except Exception as e:
-                logger.error(f"Error during monitoring: {str(e)}", exc_info=True)
+                logger.error("Error during metric collection: %s", e, exc_info=True)
                 await asyncio.sleep(5.0)  # Longer delay on error
+    
+    async def _reporter(self, args):
+        """
+        Consume collected samples and report on the newest one every report interval
         
-        # Final report
-        self.output_report(args.format, args.pretty)
-        logger.info("Monitoring stopped")
+        A report is output for the first sample that arrives once the report
+        interval has elapsed, so every report describes a single consistent
+        sample. Runs until the producer queues its None sentinel.
+        
+        Args:
+            args: Parsed command line arguments
+        """
+        _time = time.monotonic
+        queue = self._sample_q
+        next_report = _time()
+        
+        while True:
+            sample = await queue.get()
+            if sample is None:
+                break
+            
+            # Only the newest of the samples collected meanwhile is reported
+            stopping = False
+            while not queue.empty():
+                newer = queue.get_nowait()
+                if newer is None:
+                    stopping = True
+                    break
+                sample = newer
+            
+            now = _time()
+            if now >= next_report:
+                try:
+                    await self.output_report_async(args.format, args.pretty, sample)
+                except Exception as e:
+                    logger.error("Error during reporting: %s", e, exc_info=True)
+                next_report = now + self.report_interval
+            
+            if stopping:
+                break
     
     async def show_status(self, args):
         """Show current system status"""
@@ -204,7 +329,7 @@ class HyperionCLI:
     async def run_profile(self, args):
         """Run a short system profile"""
         duration = args.duration
-        logger.info(f"Starting system profile for {duration} seconds")
+        logger.info("Starting system profile for %s seconds", duration)
         
         # Record start state
         if self.metrics:
@@ -213,23 +338,7 @@ class HyperionCLI:
         
         # Run for specified duration
         self.running = True
-        start_time = time.time()
-        
-        while self.running and (time.time() - start_time) < duration:
-            try:
-                # Update metrics
-                if self.metrics:
-                    self.metrics.collect_all_metrics(self.monitor)
-                
-                # Short sleep to avoid tight loop
-                await asyncio.sleep(1.0)
-                
-            except KeyboardInterrupt:
-                logger.info("Profiling interrupted by user")
-                self.running = False
-                break
-            except Exception as e:
-                logger.error(f"Error during profiling: {str(e)}", exc_info=True)
+        await self._producer(1.0, deadline=time.monotonic() + duration)
         
         # Generate final profile report
         if self.metrics:
@@ -244,98 +353,248 @@ class HyperionCLI:
         if not self.metrics:
             return
         
-        # Generate the report
-        if format_type == 'json':
-            output = self.metrics.export_json(pretty=pretty)
-        elif format_type == 'prometheus':
-            output = self.metrics.export_prometheus()
+        self._emit_report(format_type, self._build_report(format_type, pretty))
+    
+    async def output_report_async(
+        self,
+        format_type: str,
+        pretty: bool = False,
+        sample: Optional[HistoricalSample] = None
+    ):
+        """
+        Snapshot the metrics, render the report in a worker thread and output it
+        
+        Args:
+            format_type: Report format
+            pretty: Whether to pretty print JSON output
+            sample: Collected sample to report current values from (live values if not provided)
+        """
+        if not self.metrics:
+            return
+        
+        snapshot, render = self._get_formatter(format_type)
+        
+        # The snapshot is taken on the loop, where collection runs; only
+        # serialization and formatting of the copy run off the event loop
+        data = snapshot(sample)
+        loop = asyncio.get_running_loop()
+        output = await loop.run_in_executor(None, render, data, pretty)
+        self._emit_report(format_type, output)
+    
+    def _build_report(self, format_type: str, pretty: bool = False) -> Union[str, bytes]:
+        """Generate a report in the specified format"""
+        snapshot, render = self._get_formatter(format_type)
+        return render(snapshot(None), pretty)
+    
+    def _get_formatter(self, format_type: str) -> Tuple[Callable[[Optional[HistoricalSample]], Any], Callable[[Any, bool], Union[str, bytes]]]:
+        """Look up the (snapshot, render) pair for a report format"""
+        if self._formatters is None:
+            self._formatters = self._build_formatters()
+        return self._formatters.get(format_type, self._formatters['text'])
+    
+    def _build_formatters(self) -> Dict[str, Tuple[Callable[[Optional[HistoricalSample]], Any], Callable[[Any, bool], Union[str, bytes]]]]:
+        """
+        Build the report format dispatch table
+        
+        Each format maps to a (snapshot, render) pair. The snapshot copies the
+        data the report needs, optionally taking current values from a
+        collected sample, and must run on the event loop, which is where
+        metrics are collected; render only reads that copy.
+        """
+        metrics = self.metrics
+        
+        # JSON goes straight to the binary file handle without a str round-trip
+        if self._out_fp:
+            export_json = metrics.export_json_bytes
         else:
-            # Text format
-            output = self.format_text_report()
+            export_json = metrics.export_json
         
-        # Output to file or stdout
-        if self.output_file:
-            with open(self.output_file, 'w') as f:
-                f.write(output)
+        return {
+            'json': (
+                lambda sample: metrics.generate_report(include_history=True),
+                lambda report, pretty: export_json(pretty=pretty, report=report)
+            ),
+            'prometheus': (lambda sample: metrics.export_prometheus(), lambda text, pretty: text),
+            'text': (self._text_snapshot, lambda snapshot, pretty: self.format_text_report(snapshot)),
+        }
+    
+    def _emit_report(self, format_type: str, output: Union[str, bytes]):
+        """Write a generated report to the output file or stdout"""
+        if self._out_fp:
+            if isinstance(output, str):
+                output = output.encode('utf-8')
+            self._write_output_file(output)
         else:
             # For text format, clear screen first
-            if format_type == 'text':
-                os.system('cls' if os.name == 'nt' else 'clear')
-            print(output)
+            if format_type == 'text' and self._is_tty:
+                sys.stdout.write(_CLEAR_SCREEN)
+            sys.stdout.write(output + "\n")
+            sys.stdout.flush()
     
-    def format_text_report(self) -> str:
-        """Format a human-readable text report"""
-        lines = []
-        lines.append("=" * 60)
-        lines.append(f"HYPERION RESOURCE MONITOR - {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("=" * 60)
-        
-        # System information
-        lines.append(f"Environment: {self.monitor.environment}")
-        if self.monitor.cloud_provider:
-            lines.append(f"Cloud Provider: {self.monitor.cloud_provider}")
-        lines.append(f"Container: {'Yes' if self.monitor.is_container else 'No'}")
-        lines.append(f"Laptop: {'Yes' if self.monitor.is_laptop else 'No'}")
+    def _write_output_file(self, data: bytes):
+        """Replace previous report contents without reopening the file"""
+        self._out_fp.seek(0)
+        self._out_fp.truncate()
+        self._out_fp.write(data)
+        self._out_fp.flush()
+    
+    def _text_snapshot(self, sample: Optional[HistoricalSample] = None) -> Dict[str, Any]:
+        """
+        Capture everything shown in the text report
+        
+        Reads the monitor, energy, container and ML components, so it must run
+        on the event loop; format_text_report only formats the result.
+        
+        Args:
+            sample: Collected sample to take the values from (live monitor values if not provided)
+            
+        Returns:
+            Values for format_text_report
+        """
+        if self._report_prefix is None:
+            self._report_prefix = self._build_report_prefix()
+            
+        monitor = self.monitor
+        if sample is not None:
+            snapshot = {
+                'timestamp': self._format_timestamp(sample.timestamp),
+                'state': sample.state,
+                'cpu': sample.cpu,
+                'memory': sample.memory,
+                'workers': sample.workers,
+            }
+        else:
+            snapshot = {
+                'timestamp': self._format_timestamp(),
+                'state': monitor._current_state,
+                'cpu': monitor._current_cpu,
+                'memory': monitor._current_mem,
+                'workers': monitor.current_workers,
+            }
+        snapshot['max_workers'] = monitor.max_workers
+        snapshot['prefix'] = self._report_prefix
+        
+        # Energy information if available
+        snapshot['power_state'] = dict(self.energy.get_power_state()) if self.energy else None
+        
+        # Container information if available
+        container = self.container
+        if container and container.is_container:
+            snapshot['container'] = {
+                'orchestrator': container.orchestrator,
+                'memory_limit': container.memory_limit,
+                'cpu_limit': container.cpu_limit,
+            }
+        else:
+            snapshot['container'] = None
+        
+        # ML recommendations if available
+        if self.ml and self.ml.is_initialized:
+            snapshot['recommendations'] = self.ml.get_ml_recommendations({
+                'cpu': snapshot['cpu'],
+                'memory': snapshot['memory']
+            })
+        else:
+            snapshot['recommendations'] = None
+        
+        return snapshot
+    
+    def format_text_report(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format a human-readable text report
+        
+        Args:
+            snapshot: Values from _text_snapshot (captured now if not provided)
+            
+        Returns:
+            Report text
+        """
+        if snapshot is None:
+            snapshot = self._text_snapshot()
         
-        # Current state
-        lines.append("\nCURRENT STATE:")
-        lines.append(f"  System: {self.monitor._current_state.upper()}")
-        lines.append(f"  CPU Usage: {self.monitor._current_cpu:.1%}")
-        lines.append(f"  Memory Usage: {self.monitor._current_mem:.1%}")
-        lines.append(f"  Workers: {self.monitor.current_workers}/{self.monitor.max_workers} (current/max)")
+        # Header and current state always appear, so build them in one literal
+        lines = [
+            _SEP,
+            f"HYPERION RESOURCE MONITOR - {snapshot['timestamp']}",
+            snapshot['prefix'],
+            "\nCURRENT STATE:",
+            f"  System: {snapshot['state'].upper()}",
+            f"  CPU Usage: {snapshot['cpu']:.1%}",
+            f"  Memory Usage: {snapshot['memory']:.1%}",
+            f"  Workers: {snapshot['workers']}/{snapshot['max_workers']} (current/max)",
+        ]
+        add = lines.append
         
         # Add energy information if available
-        if self.energy:
-            power_state = self.energy.get_power_state()
-            if power_state['supported']:
-                lines.append("\nPOWER STATE:")
-                lines.append(f"  Battery: {'Yes' if power_state['on_battery'] else 'No'}")
-                if power_state['on_battery']:
-                    lines.append(f"  Battery Level: {power_state['battery_percent']:.1f}%")
-                    if power_state['battery_time_left']:
-                        lines.append(f"  Time Remaining: {int(power_state['battery_time_left'])} minutes")
-                lines.append(f"  Power Saver: {'Enabled' if power_state['power_saver_active'] else 'Disabled'}")
+        power_state = snapshot['power_state']
+        if power_state and power_state['supported']:
+            add("\nPOWER STATE:")
+            add(f"  Battery: {'Yes' if power_state['on_battery'] else 'No'}")
+            if power_state['on_battery']:
+                add(f"  Battery Level: {power_state['battery_percent']:.1f}%")
+                if power_state['battery_time_left']:
+                    add(f"  Time Remaining: {int(power_state['battery_time_left'])} minutes")
+            add(f"  Power Saver: {'Enabled' if power_state['power_saver_active'] else 'Disabled'}")
         
         # Add container information if available
-        if self.container and self.container.is_container:
-            lines.append("\nCONTAINER INFO:")
-            lines.append(f"  Orchestrator: {self.container.orchestrator or 'Unknown'}")
-            if self.container.memory_limit:
-                lines.append(f"  Memory Limit: {self.container.memory_limit / (1024*1024):.1f} MB")
-            if self.container.cpu_limit:
-                lines.append(f"  CPU Limit: {self.container.cpu_limit:.1f} cores")
+        container = snapshot['container']
+        if container:
+            add("\nCONTAINER INFO:")
+            add(f"  Orchestrator: {container['orchestrator'] or 'Unknown'}")
+            if container['memory_limit']:
+                add(f"  Memory Limit: {container['memory_limit'] / (1024*1024):.1f} MB")
+            if container['cpu_limit']:
+                add(f"  CPU Limit: {container['cpu_limit']:.1f} cores")
         
         # Add ML recommendations if available
-        if self.ml and self.ml.is_initialized:
-            lines.append("\nML RECOMMENDATIONS:")
-            recommendations = self.ml.get_ml_recommendations({
-                'cpu': self.monitor._current_cpu,
-                'memory': self.monitor._current_mem
-            })
+        recommendations = snapshot['recommendations']
+        if recommendations is not None:
+            add("\nML RECOMMENDATIONS:")
             
             if 'optimal_workers' in recommendations:
-                lines.append(f"  Optimal Workers: {recommendations['optimal_workers']}")
+                add(f"  Optimal Workers: {recommendations['optimal_workers']}")
             
             if 'future_usage' in recommendations:
                 future = recommendations['future_usage']
-                lines.append(f"  Predicted CPU (5m): {future['cpu']:.1%}")
-                lines.append(f"  Predicted Memory (5m): {future['memory']:.1%}")
+                add(f"  Predicted CPU (5m): {future['cpu']:.1%}")
+                add(f"  Predicted Memory (5m): {future['memory']:.1%}")
             
             for key in recommendations:
                 if key.endswith('_warning'):
-                    lines.append(f"  Warning: {recommendations[key]}")
+                    add(f"  Warning: {recommendations[key]}")
                     
             if 'anomalies' in recommendations:
                 for anomaly in recommendations['anomalies']:
-                    lines.append(f"  Anomaly Detected: {anomaly}")
+                    add(f"  Anomaly Detected: {anomaly}")
         
-        lines.append("=" * 60)
+        add(_SEP)
+        return "\n".join(lines)
+    
+    def _format_timestamp(self, timestamp: Optional[float] = None) -> str:
+        """Format a local time (default now), reformatting at most once per second"""
+        sec = int(time.time() if timestamp is None else timestamp)
+        if sec != self._cached_ts_sec:
+            self._cached_ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+            self._cached_ts_sec = sec
+        return self._cached_ts_str
+    
+    def _build_report_prefix(self) -> str:
+        """Build the static system information block of the text report"""
+        lines = [_SEP]
+        lines.append(f"Environment: {self.monitor.environment}")
+        if self.monitor.cloud_provider:
+            lines.append(f"Cloud Provider: {self.monitor.cloud_provider}")
+        lines.append(f"Container: {'Yes' if self.monitor.is_container else 'No'}")
+        lines.append(f"Laptop: {'Yes' if self.monitor.is_laptop else 'No'}")
         return "\n".join(lines)
     
     async def cleanup(self):
         """Clean up resources"""
         if self.monitor:
             await self.monitor.stop()
+        if self._out_fp:
+            self._out_fp.close()
+            self._out_fp = None
         logger.info("Hyperion resources cleaned up")
 
 
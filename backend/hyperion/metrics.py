@@ -6,8 +6,11 @@ Provides metrics collection, trend analysis, and reporting capabilities.
 
 import json
 import logging
+import re
 import time
-from typing import Any, Callable, Dict, List, Optional, Union
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 try:
     import numpy as np
@@ -15,9 +18,335 @@ try:
 except ImportError:
     HAS_NUMPY = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
 
+# Characters not allowed in Prometheus metric names
+_PROMETHEUS_INVALID_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+def _prometheus_prefix(name: str, help_text: str) -> str:
+    """
+    Build the HELP/TYPE header and sample name for a Prometheus gauge
+    
+    Args:
+        name: Metric name; invalid characters are replaced with underscores
+        help_text: Metric description; backslashes and newlines are escaped
+        
+    Returns:
+        Exposition text preceding the sample value
+    """
+    name = _PROMETHEUS_INVALID_NAME_CHARS.sub('_', name)
+    if name[:1].isdigit():
+        name = f"_{name}"
+    help_text = help_text.replace('\\', '\\\\').replace('\n', '\\n')
+    return f"# HELP {name} {help_text}\n# TYPE {name} gauge\n{name} "
+
+
+def _compile_prometheus_exporter(gauges: Sequence[Tuple[str, Dict[str, Any], str]]) -> Callable[[], str]:
+    """
+    Generate a specialized Prometheus exporter for a fixed set of gauges
+    
+    The exporter is a single f-string over the bound metric dicts, so an
+    export does no per-metric dispatch or formatting calls.
+    
+    Args:
+        gauges: (exposition prefix, metric dict, field) for each gauge, in output order
+        
+    Returns:
+        Function returning the exposition text
+    """
+    namespace = {}
+    parts = []
+    for index, (prefix, metric, field) in enumerate(gauges):
+        namespace[f"p{index}"] = prefix
+        namespace[f"m{index}"] = metric
+        parts.append(f"{{p{index}}}{{m{index}[{field!r}]}}\\n")
+    
+    source = f"def _export():\n    return f\"{''.join(parts)}\"\n"
+    exec(compile(source, "<hyperion-prometheus-exporter>", "exec"), namespace)
+    return namespace['_export']
+
+
+# (category, field, exposition prefix) for the built-in gauges
+_PROMETHEUS_CORE_GAUGES = (
+    ('cpu', 'current', _prometheus_prefix('hyperion_cpu_usage', 'CPU utilization ratio')),
+    ('cpu', 'peak', _prometheus_prefix('hyperion_cpu_peak', 'Peak CPU utilization ratio')),
+    ('memory', 'current', _prometheus_prefix('hyperion_memory_usage', 'Memory utilization ratio')),
+    ('memory', 'peak', _prometheus_prefix('hyperion_memory_peak', 'Peak memory utilization ratio')),
+    ('workers', 'current', _prometheus_prefix('hyperion_workers', 'Current worker count')),
+    ('workers', 'peak', _prometheus_prefix('hyperion_workers_peak', 'Peak worker count')),
+)
+
+
+def _dumps_json(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON bytes, using orjson when available
+    
+    Args:
+        obj: Object to serialize
+        pretty: Whether to indent the output
+        
+    Returns:
+        Encoded JSON
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, indent=2 if pretty else None, default=str).encode('utf-8')
+
+
+@dataclass(slots=True)
+class HistoricalSample:
+    """Snapshot of core and custom metric values at one point in time"""
+    timestamp: float
+    cpu: float
+    memory: float
+    workers: int
+    state: str
+    environment: str
+    custom: Tuple[Any, ...] = ()
+    
+    def to_dict(self, custom_keys: Sequence[str] = ()) -> Dict[str, Any]:
+        """
+        Convert to a flat dictionary
+        
+        Args:
+            custom_keys: History keys matching the order of custom values
+            
+        Returns:
+            Dictionary with core metrics and one entry per custom metric
+        """
+        entry = {
+            'timestamp': self.timestamp,
+            'cpu': self.cpu,
+            'memory': self.memory,
+            'workers': self.workers,
+            'state': self.state,
+            'environment': self.environment
+        }
+        entry.update(zip(custom_keys, self.custom))
+        return entry
+
+
+class MetricHistory:
+    """
+    Fixed-size ring buffer of (timestamp, value) samples
+    
+    With NumPy available, timestamps and values live in two preallocated
+    float64 arrays so statistics are single vectorized reductions. Without
+    NumPy it falls back to a bounded deque of tuples.
+    """
+    
+    __slots__ = ('maxlen', '_timestamps', '_values', '_index', '_count', '_samples')
+    
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._index = 0
+        self._count = 0
+        if HAS_NUMPY:
+            self._timestamps = np.empty(maxlen, dtype=np.float64)
+            self._values = np.empty(maxlen, dtype=np.float64)
+            self._samples = None
+        else:
+            self._timestamps = None
+            self._values = None
+            self._samples = deque(maxlen=maxlen)
+    
+    def record(self, timestamp: float, value: Union[float, int]) -> None:
+        """
+        Record a sample, overwriting the oldest one when full
+        
+        Args:
+            timestamp: Sample timestamp
+            value: Sample value
+        """
+        if self._samples is not None:
+            self._samples.append((timestamp, value))
+            return
+            
+        index = self._index
+        self._timestamps[index] = timestamp
+        self._values[index] = value
+        self._index = (index + 1) % self.maxlen
+        if self._count < self.maxlen:
+            self._count += 1
+    
+    def __len__(self) -> int:
+        if self._samples is not None:
+            return len(self._samples)
+        return self._count
+    
+    def __iter__(self):
+        return iter(self.to_list())
+    
+    def _ordered(self):
+        """Return (timestamps, values) arrays in chronological order"""
+        if self._count < self.maxlen:
+            return self._timestamps[:self._count], self._values[:self._count]
+        index = self._index
+        return (
+            np.concatenate((self._timestamps[index:], self._timestamps[:index])),
+            np.concatenate((self._values[index:], self._values[:index]))
+        )
+    
+    def last_value(self) -> Optional[Union[float, int]]:
+        """
+        Get the most recently recorded value
+        
+        Returns:
+            Latest value or None if no samples are stored
+        """
+        if self._samples is not None:
+            return self._samples[-1][1] if self._samples else None
+        if not self._count:
+            return None
+        return self._values[self._index - 1].item()
+    
+    def to_list(self) -> List[tuple]:
+        """
+        Get all samples as a list of (timestamp, value) tuples
+        
+        Returns:
+            Samples ordered from oldest to newest
+        """
+        if self._samples is not None:
+            return list(self._samples)
+        timestamps, values = self._ordered()
+        return list(zip(timestamps.tolist(), values.tolist()))
+    
+    def summary(self) -> Dict[str, float]:
+        """
+        Calculate min, max and average over the stored values
+        
+        Returns:
+            Dictionary with statistics, empty if no samples are stored
+        """
+        if not len(self):
+            return {}
+            
+        if self._samples is not None:
+            values = [value for _, value in self._samples]
+            return {
+                'min': min(values),
+                'max': max(values),
+                'avg': sum(values) / len(values)
+            }
+            
+        values = self._values[:self._count]
+        return {
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'avg': float(values.mean())
+        }
+
+
+class CounterHistory:
+    """
+    Fixed-size ring buffer of cumulative counter samples
+    
+    Each counter gets its own int64 column (structure of arrays) when NumPy is
+    available, so per-interval deltas and their peaks come from a single
+    np.diff over contiguous memory. A counter that goes backwards (reset or
+    wraparound) contributes no increase for that interval.
+    """
+    
+    __slots__ = ('maxlen', 'names', '_timestamps', '_columns', '_index', '_count', '_samples')
+    
+    def __init__(self, maxlen: int, names: Sequence[str]):
+        self.maxlen = maxlen
+        self.names = tuple(names)
+        self._index = 0
+        self._count = 0
+        if HAS_NUMPY:
+            self._timestamps = np.zeros(maxlen, dtype=np.float64)
+            self._columns = [np.zeros(maxlen, dtype=np.int64) for _ in self.names]
+            self._samples = None
+        else:
+            self._timestamps = None
+            self._columns = None
+            self._samples = deque(maxlen=maxlen)
+    
+    def record(self, timestamp: float, *values: int) -> None:
+        """
+        Record one reading of every counter
+        
+        Args:
+            timestamp: Sample timestamp
+            *values: Cumulative counter values, in the order of ``names``
+        """
+        if self._samples is not None:
+            self._samples.append((timestamp,) + values)
+            return
+            
+        index = self._index
+        self._timestamps[index] = timestamp
+        for column, value in zip(self._columns, values):
+            column[index] = value
+        self._index = (index + 1) % self.maxlen
+        if self._count < self.maxlen:
+            self._count += 1
+    
+    def __len__(self) -> int:
+        if self._samples is not None:
+            return len(self._samples)
+        return self._count
+    
+    def __iter__(self):
+        return iter(self.to_list())
+    
+    def _ordered(self, array):
+        """Return a column in chronological order"""
+        if self._count < self.maxlen:
+            return array[:self._count]
+        return np.concatenate((array[self._index:], array[:self._index]))
+    
+    def to_list(self) -> List[tuple]:
+        """
+        Get all samples as a list of (timestamp, *values) tuples
+        
+        Returns:
+            Samples ordered from oldest to newest
+        """
+        if self._samples is not None:
+            return list(self._samples)
+        columns = [self._ordered(self._timestamps).tolist()]
+        columns.extend(self._ordered(column).tolist() for column in self._columns)
+        return list(zip(*columns))
+    
+    def summary(self) -> Dict[str, int]:
+        """
+        Calculate the peak per-interval increase of each counter
+        
+        Returns:
+            Dictionary of ``peak_<name>`` values, empty with fewer than two samples
+        """
+        if len(self) < 2:
+            return {}
+            
+        if self._samples is not None:
+            samples = list(self._samples)
+            return {
+                f"peak_{name}": max(
+                    max(b[i] - a[i], 0) for a, b in zip(samples, samples[1:])
+                )
+                for i, name in enumerate(self.names, start=1)
+            }
+            
+        return {
+            f"peak_{name}": max(int(np.diff(self._ordered(column)).max()), 0)
+            for name, column in zip(self.names, self._columns)
+        }
+
+
 class MetricsCollector:
     """
     Advanced metrics collection and analysis
@@ -35,7 +364,7 @@ class MetricsCollector:
         
         # Metric collections
         self.metrics = {}
-        self.historical_data = []
+        self.historical_data = deque(maxlen=max_history)
         self.custom_collectors = {}
         
         # Reset metrics to initialize structure
@@ -46,16 +375,34 @@ class MetricsCollector:
     def reset_metrics(self):
         """Initialize or reset metrics structure"""
         self.metrics = {
-            'cpu': {'current': 0.0, 'peak': 0.0, 'history': []},
-            'memory': {'current': 0.0, 'peak': 0.0, 'history': []},
-            'network': {'sent': 0, 'recv': 0, 'peak_sent': 0, 'peak_recv': 0, 'history': []},
-            'disk': {'read': 0, 'write': 0, 'peak_read': 0, 'peak_write': 0, 'history': []},
-            'workers': {'current': 0, 'peak': 0, 'history': []},
+            'cpu': {'current': 0.0, 'peak': 0.0, 'history': MetricHistory(self.max_history)},
+            'memory': {'current': 0.0, 'peak': 0.0, 'history': MetricHistory(self.max_history)},
+            # Cumulative I/O counters; peaks are derived from history deltas on export
+            'network': {
+                'sent': 0, 'recv': 0,
+                'history': CounterHistory(self.max_history, ('sent', 'recv'))
+            },
+            'disk': {
+                'read': 0, 'write': 0,
+                'history': CounterHistory(self.max_history, ('read', 'write'))
+            },
+            'workers': {'current': 0, 'peak': 0, 'history': MetricHistory(self.max_history)},
             'gpu': {},  # Placeholder for GPU metrics
             'custom': {}  # Placeholder for custom metrics
         }
+        
+        # (history key, metric) pairs for custom metrics, keys formatted once
+        self._custom_history_fields = []
+        self._prometheus_prefixes = {}
+        self._prometheus_exporter = None
     
-    def register_custom_metric(self, name: str, collector: Callable, description: Optional[str] = None):
+    def register_custom_metric(
+        self,
+        name: str,
+        collector: Callable,
+        description: Optional[str] = None,
+        skip_unchanged: bool = False
+    ):
         """
         Register a custom metric collector function
         
@@ -63,23 +410,47 @@ class MetricsCollector:
             name: Name of the custom metric
             collector: Function that returns the metric value
             description: Optional description of the metric
+            skip_unchanged: Don't record a history sample when the value
+                equals the previous one
         """
         self.custom_collectors[name] = {
             'collector': collector, 
-            'description': description or f"Custom metric: {name}"
+            'description': description or f"Custom metric: {name}",
+            'skip_unchanged': skip_unchanged
         }
         
         # Initialize metric structure
         if name not in self.metrics['custom']:
-            self.metrics['custom'][name] = {
-                'current': 0.0,
-                'peak': 0.0,
-                'history': [],
-                'description': description
-            }
+            self._add_custom_metric(name, description=description)
             
         logger.info(f"Custom metric registered: {name}")
     
+    def _add_custom_metric(self, name: str, **fields) -> Dict[str, Any]:
+        """
+        Create the structure for a custom metric
+        
+        Args:
+            name: Name of the custom metric
+            **fields: Additional fields to store with the metric
+            
+        Returns:
+            The new metric structure
+        """
+        metric = {
+            'current': 0.0,
+            'peak': 0.0,
+            'history': MetricHistory(self.max_history),
+            **fields
+        }
+        self.metrics['custom'][name] = metric
+        self._custom_history_fields.append((f"custom_{name}", metric))
+        self._prometheus_prefixes[name] = _prometheus_prefix(
+            f"hyperion_custom_{name}",
+            fields.get('description') or f"Custom metric: {name}"
+        )
+        self._prometheus_exporter = None
+        return metric
+    
     def update_metric(self, category: str, name: str, value: Union[float, int, Dict]):
         """
         Update a specific metric
@@ -91,13 +462,9 @@ class MetricsCollector:
         """
         # Handle special case for custom metrics
         if category == 'custom':
-            if name not in self.metrics['custom']:
-                self.metrics['custom'][name] = {
-                    'current': 0.0,
-                    'peak': 0.0,
-                    'history': []
-                }
-            target = self.metrics['custom'][name]
+            target = self.metrics['custom'].get(name)
+            if target is None:
+                target = self._add_custom_metric(name)
         else:
             # Standard metrics
             if category not in self.metrics:
@@ -108,6 +475,9 @@ class MetricsCollector:
         
         # Handle different update types
         if isinstance(value, (int, float)):
+            # Unchanged value: current and peak are already up to date
+            if target.get('current') == value:
+                return
             target['current'] = value
             # Update peak if needed
             if 'peak' in target and value > target['peak']:
@@ -117,69 +487,189 @@ class MetricsCollector:
             for k, v in value.items():
                 target[k] = v
     
-    def collect_all_metrics(self, monitor):
+    def collect_all_metrics(self, monitor, timestamp: Optional[float] = None):
         """
         Collect all metrics from various sources
         
         Args:
             monitor: Hyperion monitor instance
+            timestamp: Optional wall-clock time of the sample (defaults to now)
         """
-        timestamp = time.time()
+        if timestamp is None:
+            timestamp = time.time()
+        
+        update_metric = self.update_metric
         
         # Core system metrics
-        self.update_metric('cpu', 'current', monitor._current_cpu)
-        self.update_metric('memory', 'current', monitor._current_mem)
-        self.update_metric('workers', 'current', monitor.current_workers)
+        update_metric('cpu', 'current', monitor._current_cpu)
+        update_metric('memory', 'current', monitor._current_mem)
+        update_metric('workers', 'current', monitor.current_workers)
         
         # Collect custom metrics
         for name, config in self.custom_collectors.items():
             try:
                 value = config['collector']()
-                self.update_metric('custom', name, value)
+                update_metric('custom', name, value)
             except Exception as e:
-                logger.warning(f"Failed to collect custom metric '{name}': {str(e)}")
+                logger.warning("Failed to collect custom metric %r: %s", name, e)
+        
+        # Cumulative network and disk counters gathered by the monitor
+        core_metrics = getattr(monitor, '_metrics', None)
+        if core_metrics:
+            network = core_metrics.get('network')
+            if network:
+                target = self.metrics['network']
+                target['sent'] = network['sent']
+                target['recv'] = network['recv']
+                target['history'].record(timestamp, network['sent'], network['recv'])
+                
+            disk = core_metrics.get('disk')
+            if disk:
+                target = self.metrics['disk']
+                target['read'] = disk['read']
+                target['write'] = disk['write']
+                target['history'].record(timestamp, disk['read'], disk['write'])
         
         # Record historical snapshot
         self._store_historical(timestamp, monitor)
     
     def _store_historical(self, timestamp: float, monitor):
         """Store current metrics in historical data"""
-        # Build historical entry with core metrics
-        historical_entry = {
-            'timestamp': timestamp,
-            'cpu': monitor._current_cpu,
-            'memory': monitor._current_mem,
-            'workers': monitor.current_workers,
-            'state': monitor._current_state,
-            'environment': monitor.environment
-        }
+        metrics = self.metrics
+        cpu = monitor._current_cpu
+        memory = monitor._current_mem
+        workers = monitor.current_workers
         
-        # Add all custom metrics
-        for name, metric in self.metrics['custom'].items():
-            historical_entry[f"custom_{name}"] = metric['current']
-        
-        # Store the entry
-        self.historical_data.append(historical_entry)
+        # Store a snapshot of core metrics plus custom values in registration order
+        self.historical_data.append(HistoricalSample(
+            timestamp,
+            cpu,
+            memory,
+            workers,
+            monitor._current_state,
+            monitor.environment,
+            tuple([metric['current'] for _, metric in self._custom_history_fields])
+        ))
         
         # Also update the individual metric histories
-        self.metrics['cpu']['history'].append((timestamp, monitor._current_cpu))
-        self.metrics['memory']['history'].append((timestamp, monitor._current_mem))
-        self.metrics['workers']['history'].append((timestamp, monitor.current_workers))
+        metrics['cpu']['history'].record(timestamp, cpu)
+        metrics['memory']['history'].record(timestamp, memory)
+        metrics['workers']['history'].record(timestamp, workers)
         
         # Update custom metric histories
-        for name, metric in self.metrics['custom'].items():
-            metric['history'].append((timestamp, metric['current']))
+        custom_collectors = self.custom_collectors
+        for name, metric in metrics['custom'].items():
+            history = metric['history']
+            value = metric['current']
+            config = custom_collectors.get(name)
+            if (
+                config is not None and config['skip_unchanged']
+                and len(history) and history.last_value() == value
+            ):
+                continue
+            history.record(timestamp, value)
+    
+    def generate_report(self, include_history: bool = True) -> Dict[str, Any]:
+        """
+        Generate a report of all collected metrics
+        
+        Args:
+            include_history: Whether to include metric histories
+            
+        Returns:
+            Dictionary with current metrics and optional history
+        """
+        now = time.time()
+        report = {
+            'timestamp': now,
+            'uptime': now - self.start_time,
+            'metrics': {}
+        }
         
-        # Trim histories if needed
-        if len(self.historical_data) > self.max_history:
-            self.historical_data = self.historical_data[-self.max_history:]
+        for category, data in self.metrics.items():
+            if category == 'custom':
+                report['metrics']['custom'] = {
+                    name: self._export_metric(metric, include_history)
+                    for name, metric in data.items()
+                }
+            else:
+                report['metrics'][category] = self._export_metric(data, include_history)
+        
+        if include_history:
+            custom_keys = [key for key, _ in self._custom_history_fields]
+            report['history'] = [
+                sample.to_dict(custom_keys) for sample in self.historical_data
+            ]
             
-        # Trim individual metric histories
-        for category in ['cpu', 'memory', 'workers']:
-            if len(self.metrics[category]['history']) > self.max_history:
-                self.metrics[category]['history'] = self.metrics[category]['history'][-self.max_history:]
-                
-        # Trim custom metric histories
-        for name, metric in self.metrics['custom'].items():
-            if len(metric['history']) > self.max_history:
-                metric['history'] = metric['history
\ No newline at end of file
+        return report
+    
+    @staticmethod
+    def _export_metric(metric: Dict[str, Any], include_history: bool) -> Dict[str, Any]:
+        """Copy a metric structure, summarizing and converting its history buffer"""
+        exported = {}
+        for key, value in metric.items():
+            if key == 'history':
+                stats = value.summary()
+                if stats:
+                    exported['stats'] = stats
+                if include_history:
+                    exported[key] = value.to_list()
+            else:
+                exported[key] = value
+        return exported
+    
+    def export_json(self, pretty: bool = False, report: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Export metrics as JSON
+        
+        Args:
+            pretty: Whether to indent the output
+            report: Previously generated report to serialize (generated now if not provided)
+            
+        Returns:
+            JSON string
+        """
+        return self.export_json_bytes(pretty=pretty, report=report).decode('utf-8')
+    
+    def export_json_bytes(self, pretty: bool = False, report: Optional[Dict[str, Any]] = None) -> bytes:
+        """
+        Export metrics as UTF-8 encoded JSON
+        
+        generate_report reads the live metric buffers, so it must run on the
+        thread that collects metrics. Passing its result in as ``report`` lets
+        the serialization itself run in another thread.
+        
+        Args:
+            pretty: Whether to indent the output
+            report: Previously generated report to serialize (generated now if not provided)
+            
+        Returns:
+            JSON bytes, suitable for writing to binary streams directly
+        """
+        if report is None:
+            report = self.generate_report(include_history=True)
+        return _dumps_json(report, pretty=pretty)
+    
+    def export_prometheus(self) -> str:
+        """
+        Export current metrics in Prometheus exposition format
+        
+        Returns:
+            Prometheus metrics text
+        """
+        exporter = self._prometheus_exporter
+        if exporter is None:
+            # Specialize once per set of registered metrics
+            metrics = self.metrics
+            prefixes = self._prometheus_prefixes
+            gauges = [
+                (prefix, metrics[category], field)
+                for category, field, prefix in _PROMETHEUS_CORE_GAUGES
+            ]
+            gauges.extend(
+                (prefixes[name], metric, 'current')
+                for name, metric in metrics['custom'].items()
+            )
+            exporter = self._prometheus_exporter = _compile_prometheus_exporter(gauges)
+        
+        return exporter()
@@ -4,9 +4,12 @@ Hyperion Resource Monitor - Machine Learning Integration Module
 Provides machine learning capabilities for predictive resource management.
 """
 
+import functools
+import itertools
 import logging
+import os
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +21,139 @@ except ImportError:
     HAS_NUMPY = False
 
 try:
-    from sklearn.linear_model import LinearRegression
-    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.ensemble import HistGradientBoostingRegressor
     HAS_SKLEARN = True
 except ImportError:
     HAS_SKLEARN = False
 
+try:
+    import joblib
+    HAS_JOBLIB = True
+except ImportError:
+    HAS_JOBLIB = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Per-sample fields extracted from historical data for training
+_SAMPLE_FIELDS = ('timestamp', 'cpu', 'memory', 'workers')
+
+# Worker predictor input features, in column order
+_WORKER_FEATURES = ('cpu', 'memory', 'cpu_memory_product', 'cpu_squared')
+
+# Metrics scored against anomaly thresholds, in result order
+_ANOMALY_METRICS = ('cpu', 'memory')
+
+
+def _percent(usage: Optional[float]) -> Optional[int]:
+    """Quantize a 0-1 usage value to whole percent, passing None through"""
+    return None if usage is None else round(usage * 100)
+
+
+def _anomaly_score(value: float, mean: float, inv_3sigma: float, upper: float, lower: float) -> Tuple[bool, float]:
+    """
+    Score a metric value against its anomaly thresholds
+    
+    Args:
+        value: Current metric value
+        mean: Historical mean
+        inv_3sigma: Reciprocal of three historical standard deviations
+        upper: Upper anomaly threshold
+        lower: Lower anomaly threshold
+        
+    Returns:
+        Tuple of (is_anomaly, severity on a 0-1 scale)
+    """
+    is_anomaly = value > upper or value < lower
+    severity = 0.0
+    if is_anomaly:
+        severity = min(1.0, abs(value - mean) * inv_3sigma)
+    return is_anomaly, severity
+
+
+def _trend_from_sums(sums: Dict[str, float], origin: float) -> Dict[str, float]:
+    """
+    Least-squares linear trend from running sums over time offsets
+    
+    Args:
+        sums: Sample count n and sums st, sy, stt, sty, syy of the time
+            offsets t and values y
+        origin: Timestamp the offsets are measured from
+        
+    Returns:
+        Dictionary with slope and intercept (in absolute time), mean and std
+    """
+    n = sums['n']
+    st = sums['st']
+    sy = sums['sy']
+    
+    denominator = n * sums['stt'] - st * st
+    slope = (n * sums['sty'] - st * sy) / denominator if denominator > 0 else 0.0
+    mean = sy / n
+    
+    return {
+        'slope': slope,
+        'intercept': (sy - slope * st) / n - slope * origin,
+        'mean': mean,
+        'std': max(sums['syy'] / n - mean * mean, 0.0) ** 0.5
+    }
+
+
+def _mean_std_welford(values: "np.ndarray") -> Tuple[int, float, float]:
+    """
+    Count, mean and population standard deviation of the non-NaN values
+    
+    Single pass (Welford's algorithm), used when numba can compile it.
+    
+    Args:
+        values: float64 array, NaN marking missing samples
+        
+    Returns:
+        Tuple of (count, mean, std); mean and std are 0.0 when count is 0
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in values:
+        if value != value:  # NaN
+            continue
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    if count == 0:
+        return 0, 0.0, 0.0
+    return count, mean, (m2 / count) ** 0.5
+
+
+def _mean_std_numpy(values: "np.ndarray") -> Tuple[int, float, float]:
+    """
+    Count, mean and population standard deviation of the non-NaN values
+    
+    Args:
+        values: float64 array, NaN marking missing samples
+        
+    Returns:
+        Tuple of (count, mean, std); mean and std are 0.0 when count is 0
+    """
+    missing = np.isnan(values)
+    if missing.any():
+        values = values[~missing]
+    if not values.size:
+        return 0, 0.0, 0.0
+    return values.size, float(values.mean()), float(values.std())
+
+
+if HAS_NUMBA:
+    # Compiled once per argument types and cached on disk across runs
+    _anomaly_score = njit(cache=True)(_anomaly_score)
+    _mean_std = njit(cache=True)(_mean_std_welford)
+else:
+    _mean_std = _mean_std_numpy
+
 
 class MLIntegration:
     """
@@ -36,13 +166,39 @@ class MLIntegration:
     - Adaptive timeout calculation
     """
     
-    def __init__(self, min_samples: int = 100):
+    __slots__ = (
+        'min_samples', 'model_path', 'anomaly_thresholds', 'is_initialized', 'supported',
+        'worker_model', 'cpu_predictor', 'memory_predictor',
+        '_wp_predict', '_cpu_trend', '_memory_trend',
+        '_ready_workers', '_ready_cpu', '_ready_mem', '_usage_recommendations'
+    )
+    
+    def __init__(self, min_samples: int = 100, model_path: Optional[str] = None):
         self.min_samples = min_samples
-        self.models = {}
+        self.model_path = model_path
         self.anomaly_thresholds = {}
         self.is_initialized = False
         self.supported = HAS_NUMPY and HAS_SKLEARN
         
+        # Trained models: worker regressor and CPU/memory trend state
+        self.worker_model = None
+        self.cpu_predictor = None
+        self.memory_predictor = None
+        
+        # Hot-path references into the models and readiness flags, refreshed
+        # by _bind_models() once models are trained or loaded
+        self._wp_predict = None
+        self._cpu_trend = None
+        self._memory_trend = None
+        self._ready_workers = False
+        self._ready_cpu = False
+        self._ready_mem = False
+        
+        # Usage-dependent recommendations keyed by whole-percent cpu/memory
+        self._usage_recommendations = functools.lru_cache(maxsize=256)(
+            self._compute_usage_recommendations
+        )
+        
         logger.info(f"ML integration initialized: supported={self.supported}")
         
         if not self.supported:
@@ -51,10 +207,28 @@ class MLIntegration:
                 "pip install numpy scikit-learn"
             )
     
+    @property
+    def models(self) -> Dict[str, Dict[str, Any]]:
+        """Trained models keyed by name (read-only view)"""
+        models = {}
+        if self.worker_model is not None:
+            models['worker_predictor'] = {
+                'model': self.worker_model,
+                'feature_names': list(_WORKER_FEATURES)
+            }
+        if self.cpu_predictor is not None:
+            models['cpu_predictor'] = self.cpu_predictor
+        if self.memory_predictor is not None:
+            models['memory_predictor'] = self.memory_predictor
+        return models
+    
     def initialize(self, historical_data: List[Dict[str, Any]]):
         """
         Initialize ML models with historical data
         
+        If model_path is set and the saved models are newer than the last
+        min_samples data points, they are loaded instead of retraining.
+        
         Args:
             historical_data: List of historical metric points
         """
@@ -65,143 +239,307 @@ class MLIntegration:
             )
             return False
         
+        if self._saved_models_current(historical_data) and self.load(self.model_path):
+            return True
+        
         try:
-            self._train_worker_predictor(historical_data)
-            self._train_resource_predictor(historical_data)
-            self._calculate_anomaly_thresholds(historical_data)
+            columns = self._extract_columns(historical_data)
+            self._train_worker_predictor(columns)
+            self._train_resource_predictor(columns)
+            self._calculate_anomaly_thresholds(columns)
+            self._bind_models()
+            self._usage_recommendations.cache_clear()
             self.is_initialized = True
             logger.info("ML models initialized successfully")
+            
+            if self.model_path and HAS_JOBLIB:
+                self.save(self.model_path)
             return True
         except Exception as e:
             logger.error(f"Failed to initialize ML models: {str(e)}", exc_info=True)
             return False
     
-    def _train_worker_predictor(self, historical_data: List[Dict[str, Any]]):
+    def _saved_models_current(self, historical_data: List[Dict[str, Any]]) -> bool:
         """
-        Train model to predict optimal worker count
+        Check whether saved models were written after the last min_samples points
         
         Args:
             historical_data: List of historical metric points
+            
+        Returns:
+            True if the models at model_path can be reused
         """
-        if not HAS_SKLEARN:
-            return
+        if not self.model_path or not HAS_JOBLIB:
+            return False
         
-        # Extract features and target
-        X = []  # Features: cpu, memory, maybe custom metrics
-        y = []  # Target: worker count
+        try:
+            saved_at = os.path.getmtime(self.model_path)
+        except OSError:
+            return False
         
-        for entry in historical_data:
-            # Skip entries with missing data
-            if not all(k in entry for k in ['cpu', 'memory', 'workers']):
-                continue
-                
-            # Build feature vector
-            features = [entry['cpu'], entry['memory']]
+        cutoff = historical_data[-self.min_samples].get('timestamp')
+        return cutoff is not None and saved_at >= cutoff
+    
+    def save(self, path: str) -> bool:
+        """
+        Save trained models and anomaly thresholds
+        
+        The file is written uncompressed so load() can memory-map the model
+        arrays instead of copying them into each process.
+        
+        Args:
+            path: File to write
+            
+        Returns:
+            True if saved successfully
+        """
+        if not HAS_JOBLIB:
+            logger.warning("Cannot save ML models: joblib not available")
+            return False
+        
+        try:
+            joblib.dump({'models': self.models, 'thresholds': self.anomaly_thresholds}, path)
+            logger.info(f"ML models saved to {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save ML models: {str(e)}")
+            return False
+    
+    def load(self, path: str) -> bool:
+        """
+        Load models and anomaly thresholds written by save()
+        
+        Args:
+            path: File to read
+            
+        Returns:
+            True if loaded successfully
+        """
+        if not self.supported or not HAS_JOBLIB:
+            return False
+        
+        try:
+            state = joblib.load(path, mmap_mode='r')
+            models = state['models']
+            self.worker_model = models.get('worker_predictor', {}).get('model')
+            self.cpu_predictor = models.get('cpu_predictor')
+            self.memory_predictor = models.get('memory_predictor')
+            self.anomaly_thresholds = state['thresholds']
+            self._bind_models()
+            self._usage_recommendations.cache_clear()
+            self.is_initialized = True
+            logger.info(f"ML models loaded from {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to load ML models: {str(e)}")
+            return False
+    
+    def _bind_models(self):
+        """Cache the predict callable, trend coefficients and readiness flags used on every prediction"""
+        worker_model = self.worker_model
+        predict = worker_model.predict if worker_model is not None else None
+        
+        # Predictions may run in executor threads; publish the callable in a
+        # single assignment so they never see a half-updated binding
+        self._wp_predict = predict
+        self._ready_workers = predict is not None
+        self._bind_trends()
+    
+    def _bind_trends(self):
+        """Cache the trend coefficients and readiness flags for the resource predictors"""
+        cpu_predictor = self.cpu_predictor
+        memory_predictor = self.memory_predictor
+        if cpu_predictor and memory_predictor:
+            self._cpu_trend = (cpu_predictor['slope'], cpu_predictor['intercept'])
+            self._memory_trend = (memory_predictor['slope'], memory_predictor['intercept'])
+        else:
+            self._cpu_trend = self._memory_trend = None
+        
+        self._ready_cpu = cpu_predictor is not None
+        self._ready_mem = memory_predictor is not None
+    
+    def update(self, entry: Dict[str, Any]) -> bool:
+        """
+        Fold a new data point into the resource usage trends
+        
+        Runs in constant time using the running sums kept by the trend
+        models, so the forecast follows new data without a full retrain.
+        
+        Args:
+            entry: Metric point with timestamp, cpu and memory
             
-            # Add some derived features
-            features.append(entry['cpu'] * entry['memory'])  # Interaction
-            features.append(entry['cpu'] ** 2)  # Squared term
+        Returns:
+            True if the trends were updated
+        """
+        if not (self._ready_cpu and self._ready_mem):
+            return False
+        
+        if 'timestamp' not in entry or 'cpu' not in entry or 'memory' not in entry:
+            return False
+        
+        for model, key in ((self.cpu_predictor, 'cpu'), (self.memory_predictor, 'memory')):
+            sums = model['sums']
+            offset = entry['timestamp'] - model['origin']
+            value = entry[key]
             
-            X.append(features)
-            y.append(entry['workers'])
+            sums['n'] += 1
+            sums['st'] += offset
+            sums['sy'] += value
+            sums['stt'] += offset * offset
+            sums['sty'] += offset * value
+            sums['syy'] += value * value
+            model.update(_trend_from_sums(sums, model['origin']))
+        
+        self._bind_trends()
+        return True
+    
+    @staticmethod
+    def _extract_columns(historical_data: List[Dict[str, Any]]) -> Dict[str, "np.ndarray"]:
+        """
+        Extract training columns from historical data in a single pass
+        
+        Args:
+            historical_data: List of historical metric points
+            
+        Returns:
+            float64 array per field in _SAMPLE_FIELDS; missing values are NaN
+        """
+        nan = float('nan')
+        width = len(_SAMPLE_FIELDS)
+        
+        # Stream values straight into an array of known size; no per-row tuples
+        # or list growth
+        values = itertools.chain.from_iterable(
+            (
+                entry.get('timestamp', nan),
+                entry.get('cpu', nan),
+                entry.get('memory', nan),
+                entry.get('workers', nan)
+            )
+            for entry in historical_data
+        )
+        table = np.fromiter(
+            values, dtype=np.float64, count=len(historical_data) * width
+        ).reshape(-1, width)
+        
+        return {name: table[:, index] for index, name in enumerate(_SAMPLE_FIELDS)}
+    
+    @staticmethod
+    def _complete_rows(columns: Dict[str, "np.ndarray"], *names: str) -> "np.ndarray":
+        """Boolean mask of samples that have a value for every named column"""
+        mask = ~np.isnan(columns[names[0]])
+        for name in names[1:]:
+            mask &= ~np.isnan(columns[name])
+        return mask
+    
+    def _train_worker_predictor(self, columns: Dict[str, "np.ndarray"]):
+        """
+        Train model to predict optimal worker count
+        
+        Args:
+            columns: Training columns from _extract_columns
+        """
+        if not HAS_SKLEARN:
+            return
+        
+        # Skip entries with missing data
+        mask = self._complete_rows(columns, 'cpu', 'memory', 'workers')
+        cpu = columns['cpu'][mask]
         
-        if len(X) < self.min_samples / 2:
-            logger.warning(f"Insufficient samples for worker predictor: {len(X)}")
+        if len(cpu) < self.min_samples / 2:
+            logger.warning(f"Insufficient samples for worker predictor: {len(cpu)}")
             return
         
-        # Train random forest for worker prediction
-        model = RandomForestRegressor(n_estimators=50, random_state=42)
+        # Features: cpu, memory, interaction and squared term; target: worker count.
+        # Written straight into one float64 matrix (the dtype the estimator fits
+        # on) so neither the derived columns nor the stack need temporaries
+        X = np.empty((len(cpu), 4), dtype=np.float64)
+        X[:, 0] = cpu
+        memory = X[:, 1]
+        memory[:] = columns['memory'][mask]
+        np.multiply(cpu, memory, out=X[:, 2])
+        np.multiply(cpu, cpu, out=X[:, 3])
+        y = columns['workers'][mask]
+        
+        # Train histogram gradient boosting for worker prediction; features are
+        # binned into at most 64 levels, keeping the model small and predict fast
+        model = HistGradientBoostingRegressor(max_iter=100, max_bins=64, random_state=42)
         model.fit(X, y)
         
         # Store model
-        self.models['worker_predictor'] = {
-            'model': model,
-            'feature_names': ['cpu', 'memory', 'cpu_memory_product', 'cpu_squared']
-        }
+        self.worker_model = model
     
-    def _train_resource_predictor(self, historical_data: List[Dict[str, Any]]):
+    def _train_resource_predictor(self, columns: Dict[str, "np.ndarray"]):
         """
         Train model to predict future resource usage
         
         Args:
-            historical_data: List of historical metric points
+            columns: Training columns from _extract_columns
         """
-        if not HAS_SKLEARN or len(historical_data) < 20:
+        if len(columns['timestamp']) < 20:
             return
         
         # Prepare time series data for CPU and memory
-        timestamps = []
-        cpu_values = []
-        memory_values = []
-        
-        for entry in historical_data:
-            if 'timestamp' in entry and 'cpu' in entry and 'memory' in entry:
-                timestamps.append(entry['timestamp'])
-                cpu_values.append(entry['cpu'])
-                memory_values.append(entry['memory'])
+        mask = self._complete_rows(columns, 'timestamp', 'cpu', 'memory')
+        timestamps = columns['timestamp'][mask]
         
         if len(timestamps) < 20:
             logger.warning("Insufficient time series data for resource prediction")
             return
         
-        # Convert to numpy arrays
-        timestamps = np.array(timestamps).reshape(-1, 1)
-        cpu_values = np.array(cpu_values)
-        memory_values = np.array(memory_values)
-        
-        # Train linear regression models
-        cpu_model = LinearRegression()
-        cpu_model.fit(timestamps, cpu_values)
-        
-        memory_model = LinearRegression()
-        memory_model.fit(timestamps, memory_values)
-        
-        # Store models
-        self.models['cpu_predictor'] = {
-            'model': cpu_model,
-            'mean': np.mean(cpu_values),
-            'std': np.std(cpu_values)
-        }
+        cpu_values = columns['cpu'][mask]
+        memory_values = columns['memory'][mask]
+        
+        # Fit linear trends over time with closed-form least squares, kept as
+        # running sums over time offsets from the mean timestamp so update()
+        # can extend them one sample at a time
+        origin = float(timestamps.mean())
+        offsets = timestamps - origin
+        
+        trends = []
+        for values in (cpu_values, memory_values):
+            sums = {
+                'n': len(offsets),
+                'st': float(offsets.sum()),
+                'sy': float(values.sum()),
+                'stt': float(np.dot(offsets, offsets)),
+                'sty': float(np.dot(offsets, values)),
+                'syy': float(np.dot(values, values))
+            }
+            
+            trends.append({'origin': origin, 'sums': sums, **_trend_from_sums(sums, origin)})
         
-        self.models['memory_predictor'] = {
-            'model': memory_model,
-            'mean': np.mean(memory_values),
-            'std': np.std(memory_values)
-        }
+        # Store trends
+        self.cpu_predictor, self.memory_predictor = trends
     
-    def _calculate_anomaly_thresholds(self, historical_data: List[Dict[str, Any]]):
+    def _calculate_anomaly_thresholds(self, columns: Dict[str, "np.ndarray"]):
         """
         Calculate thresholds for anomaly detection
         
         Args:
-            historical_data: List of historical metric points
+            columns: Training columns from _extract_columns
         """
         if not HAS_NUMPY:
             return
         
-        # Extract metrics
-        cpu_values = [entry.get('cpu', 0) for entry in historical_data if 'cpu' in entry]
-        memory_values = [entry.get('memory', 0) for entry in historical_data if 'memory' in entry]
-        
-        # Calculate statistics
-        if cpu_values:
-            cpu_mean = np.mean(cpu_values)
-            cpu_std = np.std(cpu_values)
-            self.anomaly_thresholds['cpu'] = {
-                'mean': float(cpu_mean),
-                'std': float(cpu_std),
-                'upper': float(cpu_mean + 2.5 * cpu_std),  # 2.5 sigma
-                'lower': float(max(0, cpu_mean - 2.5 * cpu_std))
-            }
-        
-        if memory_values:
-            memory_mean = np.mean(memory_values)
-            memory_std = np.std(memory_values)
-            self.anomaly_thresholds['memory'] = {
-                'mean': float(memory_mean),
-                'std': float(memory_std),
-                'upper': float(memory_mean + 2.5 * memory_std),
-                'lower': float(max(0, memory_mean - 2.5 * memory_std))
+        for name in _ANOMALY_METRICS:
+            # Calculate statistics over the samples that have the metric
+            count, mean, std = _mean_std(columns[name])
+            if not count:
+                continue
+            
+            if std == 0.0:
+                # A constant history gives no scale to measure deviations against
+                self.anomaly_thresholds.pop(name, None)
+                continue
+            
+            band = 2.5 * std  # 2.5 sigma
+            self.anomaly_thresholds[name] = {
+                'mean': mean,
+                'std': std,
+                'inv_3sigma': 1.0 / (3.0 * std),
+                'upper': mean + band,
+                'lower': max(mean - band, 0.0)
             }
     
     def predict_optimal_workers(self, cpu_usage: float, memory_usage: float) -> Optional[int]:
@@ -215,24 +553,21 @@ class MLIntegration:
         Returns:
             Predicted optimal worker count or None if prediction not available
         """
-        if not self.supported or not self.is_initialized:
-            return None
-            
-        if 'worker_predictor' not in self.models:
+        predict = self._wp_predict
+        if predict is None:
             return None
             
         try:
-            # Prepare feature vector
-            features = [
-                cpu_usage, 
-                memory_usage, 
+            # Built per call: report rendering can predict from several threads
+            features = np.array([[
+                cpu_usage,
+                memory_usage,
                 cpu_usage * memory_usage,  # Interaction
-                cpu_usage ** 2  # Squared term
-            ]
+                cpu_usage * cpu_usage  # Squared term
+            ]])
             
             # Make prediction
-            model_info = self.models['worker_predictor']
-            prediction = model_info['model'].predict([features])[0]
+            prediction = predict(features)[0]
             
             # Round to nearest integer and ensure at least 1
             return max(1, int(round(prediction)))
@@ -240,6 +575,38 @@ class MLIntegration:
             logger.warning(f"Worker prediction failed: {str(e)}")
             return None
     
+    def predict_optimal_workers_batch(
+        self,
+        cpu_usage: Sequence[float],
+        memory_usage: Sequence[float]
+    ) -> Optional[List[int]]:
+        """
+        Predict optimal worker counts for many samples with one model call
+        
+        Args:
+            cpu_usage: CPU usage (0-1) per sample
+            memory_usage: Memory usage (0-1) per sample, aligned with cpu_usage
+            
+        Returns:
+            Predicted optimal worker count per sample or None if prediction not available
+        """
+        if not self._ready_workers:
+            return None
+            
+        predict = self._wp_predict
+        try:
+            cpu = np.asarray(cpu_usage, dtype=np.float64)
+            memory = np.asarray(memory_usage, dtype=np.float64)
+            features = np.column_stack((cpu, memory, cpu * memory, cpu * cpu))
+            
+            predictions = predict(features)
+            
+            # Round to nearest integer and ensure at least 1
+            return np.maximum(np.rint(predictions), 1).astype(int).tolist()
+        except Exception as e:
+            logger.warning(f"Batch worker prediction failed: {str(e)}")
+            return None
+    
     def predict_future_usage(self, minutes_ahead: int = 5) -> Dict[str, float]:
         """
         Predict future resource usage
@@ -250,21 +617,17 @@ class MLIntegration:
         Returns:
             Dictionary with predicted values
         """
-        if not self.supported or not self.is_initialized:
-            return {}
-            
-        if 'cpu_predictor' not in self.models or 'memory_predictor' not in self.models:
+        if not (self._ready_cpu and self._ready_mem):
             return {}
             
+        cpu_trend = self._cpu_trend
+        memory_trend = self._memory_trend
         future_time = time.time() + (minutes_ahead * 60)
         
         try:
             # Make predictions
-            cpu_model = self.models['cpu_predictor']['model']
-            memory_model = self.models['memory_predictor']['model']
-            
-            cpu_prediction = float(cpu_model.predict([[future_time]])[0])
-            memory_prediction = float(memory_model.predict([[future_time]])[0])
+            cpu_prediction = cpu_trend[0] * future_time + cpu_trend[1]
+            memory_prediction = memory_trend[0] * future_time + memory_trend[1]
             
             # Ensure predictions are in valid range
             cpu_prediction = max(0.0, min(1.0, cpu_prediction))
@@ -289,7 +652,8 @@ class MLIntegration:
         Returns:
             Dictionary with anomaly detection results
         """
-        if not self.supported or not self.anomaly_thresholds:
+        anomaly_thresholds = self.anomaly_thresholds
+        if not self.supported or not anomaly_thresholds:
             return {}
             
         results = {
@@ -297,54 +661,28 @@ class MLIntegration:
             'details': {}
         }
         
-        # Check CPU usage anomaly
-        if 'cpu' in metrics and 'cpu' in self.anomaly_thresholds:
-            cpu_value = metrics['cpu']
-            thresholds = self.anomaly_thresholds['cpu']
-            
-            is_anomaly = cpu_value > thresholds['upper'] or cpu_value < thresholds['lower']
-            severity = 0
-            
-            if is_anomaly:
-                # Calculate severity (0-1 scale)
-                if cpu_value > thresholds['upper']:
-                    deviation = cpu_value - thresholds['mean']
-                    severity = min(1.0, deviation / (3 * thresholds['std']))
-                else:
-                    deviation = thresholds['mean'] - cpu_value
-                    severity = min(1.0, deviation / (3 * thresholds['std']))
-                
-                results['anomalies'].append('cpu')
+        details = results['details']
+        for name in _ANOMALY_METRICS:
+            if name not in metrics or name not in anomaly_thresholds:
+                continue
                 
-            results['details']['cpu'] = {
-                'is_anomaly': is_anomaly,
-                'value': cpu_value,
-                'severity': severity,
-                'thresholds': thresholds
-            }
-        
-        # Check memory usage anomaly
-        if 'memory' in metrics and 'memory' in self.anomaly_thresholds:
-            memory_value = metrics['memory']
-            thresholds = self.anomaly_thresholds['memory']
+            value = metrics[name]
+            thresholds = anomaly_thresholds[name]
             
-            is_anomaly = memory_value > thresholds['upper'] or memory_value < thresholds['lower']
-            severity = 0
+            is_anomaly, severity = _anomaly_score(
+                value,
+                thresholds['mean'],
+                thresholds['inv_3sigma'],
+                thresholds['upper'],
+                thresholds['lower']
+            )
             
             if is_anomaly:
-                # Calculate severity (0-1 scale)
-                if memory_value > thresholds['upper']:
-                    deviation = memory_value - thresholds['mean']
-                    severity = min(1.0, deviation / (3 * thresholds['std']))
-                else:
-                    deviation = thresholds['mean'] - memory_value
-                    severity = min(1.0, deviation / (3 * thresholds['std']))
-                
-                results['anomalies'].append('memory')
+                results['anomalies'].append(name)
                 
-            results['details']['memory'] = {
+            details[name] = {
                 'is_anomaly': is_anomaly,
-                'value': memory_value,
+                'value': value,
                 'severity': severity,
                 'thresholds': thresholds
             }
@@ -355,28 +693,109 @@ class MLIntegration:
         """
         Get ML-based recommendations for resource optimization
         
+        Worker and anomaly recommendations are cached per whole-percent CPU and
+        memory usage, so repeated calls under a stable load skip model inference.
+        
         Args:
             current_metrics: Dictionary of current metrics
             
         Returns:
             Dictionary with recommendations
         """
-        if not self.supported or not self.is_initialized:
+        if not self.is_initialized:
             return {}
             
-        recommendations = {}
+        worker_recommendations, anomaly_recommendations = self._usage_recommendations(
+            _percent(current_metrics.get('cpu')),
+            _percent(current_metrics.get('memory'))
+        )
         
         # Optimal worker count
-        if 'cpu' in current_metrics and 'memory' in current_metrics:
-            worker_prediction = self.predict_optimal_workers(
-                current_metrics['cpu'], 
-                current_metrics['memory']
+        recommendations = dict(worker_recommendations)
+        
+        # Future resource usage
+        recommendations.update(self._future_usage_recommendations())
+        
+        # Anomaly detection
+        recommendations.update(anomaly_recommendations)
+        if 'anomalies' in recommendations:
+            recommendations['anomalies'] = list(recommendations['anomalies'])
+        
+        return recommendations
+    
+    def get_ml_recommendations_batch(self, metrics_list: List[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """
+        Get ML-based recommendations for several metric snapshots at once
+        
+        Worker counts for all snapshots come from a single batched model
+        prediction, and the future usage forecast is computed once and shared.
+        Usage is quantized to whole percent as in get_ml_recommendations, so
+        both return the same recommendations for the same snapshot.
+        
+        Args:
+            metrics_list: Current metrics for each host or time step
+            
+        Returns:
+            Recommendations for each entry of metrics_list, in order
+        """
+        if not self.is_initialized:
+            return [{} for _ in metrics_list]
+        
+        # Usage in whole percent, mapped back to 0-1, as the single-sample path sees it
+        quantized_list = []
+        for metrics in metrics_list:
+            quantized = {}
+            for name in _ANOMALY_METRICS:
+                percent = _percent(metrics.get(name))
+                if percent is not None:
+                    quantized[name] = percent / 100
+            quantized_list.append(quantized)
+        
+        # Optimal worker count for every snapshot with cpu and memory
+        indices = [
+            index for index, metrics in enumerate(quantized_list)
+            if 'cpu' in metrics and 'memory' in metrics
+        ]
+        worker_predictions = {}
+        if indices:
+            predictions = self.predict_optimal_workers_batch(
+                [quantized_list[index]['cpu'] for index in indices],
+                [quantized_list[index]['memory'] for index in indices]
             )
+            if predictions is not None:
+                worker_predictions = dict(zip(indices, predictions))
+        
+        # Future resource usage does not depend on the current metrics
+        future_recommendations = self._future_usage_recommendations()
+        
+        results = []
+        for index, metrics in enumerate(quantized_list):
+            recommendations = {}
+            if index in worker_predictions:
+                recommendations['optimal_workers'] = worker_predictions[index]
             
-            if worker_prediction is not None:
-                recommendations['optimal_workers'] = worker_prediction
+            recommendations.update(future_recommendations)
+            if 'future_usage' in recommendations:
+                recommendations['future_usage'] = dict(recommendations['future_usage'])
+            
+            anomaly_recommendations = self._anomaly_recommendations(self.detect_anomalies(metrics))
+            if 'anomalies' in anomaly_recommendations:
+                anomaly_recommendations['anomalies'] = list(anomaly_recommendations['anomalies'])
+            recommendations.update(anomaly_recommendations)
+            
+            results.append(recommendations)
+        
+        return results
+    
+    def _future_usage_recommendations(self) -> Dict[str, Any]:
+        """
+        Build recommendations from the predicted resource usage in 5 minutes
+        
+        Returns:
+            Dictionary with the forecast and any usage warnings
+        """
+        recommendations = {}
         
-        # Future resource usage
         future_usage = self.predict_future_usage(minutes_ahead=5)
         if future_usage:
             recommendations['future_usage'] = future_usage
@@ -388,10 +807,23 @@ class MLIntegration:
                 if future_usage['memory'] > 0.8:
                     recommendations['memory_warning'] = "Memory usage predicted to exceed 80% in 5 minutes"
         
-        # Anomaly detection
-        anomalies = self.detect_anomalies(current_metrics)
+        return recommendations
+    
+    @staticmethod
+    def _anomaly_recommendations(anomalies: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build recommendations from anomaly detection results
+        
+        Args:
+            anomalies: Result of detect_anomalies
+            
+        Returns:
+            Dictionary with the anomalous metrics (as a tuple) and actions
+        """
+        recommendations = {}
+        
         if anomalies and anomalies.get('anomalies'):
-            recommendations['anomalies'] = anomalies['anomalies']
+            recommendations['anomalies'] = tuple(anomalies['anomalies'])
             
             # Add anomaly-specific recommendations
             if 'cpu' in anomalies['anomalies']:
@@ -411,3 +843,41 @@ class MLIntegration:
                     recommendations['memory_anomaly'] = "Moderate memory usage anomaly detected"
         
         return recommendations
+    
+    def _compute_usage_recommendations(
+        self,
+        cpu_percent: Optional[int],
+        memory_percent: Optional[int]
+    ) -> Tuple[Tuple[Tuple[str, Any], ...], Tuple[Tuple[str, Any], ...]]:
+        """
+        Compute worker and anomaly recommendations for quantized usage
+        
+        Args:
+            cpu_percent: CPU usage in whole percent, or None if unknown
+            memory_percent: Memory usage in whole percent, or None if unknown
+            
+        Returns:
+            Immutable (worker, anomaly) recommendation items, safe to cache
+        """
+        current_metrics = {}
+        if cpu_percent is not None:
+            current_metrics['cpu'] = cpu_percent / 100
+        if memory_percent is not None:
+            current_metrics['memory'] = memory_percent / 100
+            
+        worker_recommendations = {}
+        
+        # Optimal worker count
+        if 'cpu' in current_metrics and 'memory' in current_metrics:
+            worker_prediction = self.predict_optimal_workers(
+                current_metrics['cpu'], 
+                current_metrics['memory']
+            )
+            
+            if worker_prediction is not None:
+                worker_recommendations['optimal_workers'] = worker_prediction
+        
+        # Anomaly detection
+        anomaly_recommendations = self._anomaly_recommendations(self.detect_anomalies(current_metrics))
+        
+        return tuple(worker_recommendations.items()), tuple(anomaly_recommendations.items())
@@ -6,24 +6,51 @@ structured logging, and error context tracking.
 """
 
 import asyncio
+import collections
 import contextvars
 import inspect
+import itertools
 import json
 import logging
 import os
+import random
 import time
 import traceback
-import uuid
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from types import MappingProxyType, TracebackType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
+if HAS_ORJSON:
+    def _dumps(obj: Any) -> str:
+        """Serialize a log entry to a JSON string"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+else:
+    _dumps = json.dumps
+
 # Context variables for distributed tracing
 current_trace = contextvars.ContextVar("hyperion_current_trace", default=None)
 current_span = contextvars.ContextVar("hyperion_current_span", default=None)
 
 
+def _new_id() -> str:
+    """Generate a random 128-bit ID as 32 hex characters (trace and error IDs)"""
+    return os.urandom(16).hex()
+
+
+def _new_span_id() -> str:
+    """Generate a random 64-bit span ID as 16 hex characters"""
+    # The module-level generator is reseeded in forked children
+    return f"{random.getrandbits(64):016x}"
+
+
 class Trace:
     """
     Distributed trace for request tracking
@@ -32,6 +59,11 @@ class Trace:
     multiple components and services.
     """
     
+    __slots__ = (
+        'trace_id', 'root_span_id', 'parent_span_id', 'name', 'start_ns',
+        'end_ns', 'wall_time_ns', 'metadata', 'spans', 'error'
+    )
+    
     def __init__(
         self,
         trace_id: Optional[str] = None,
@@ -46,16 +78,18 @@ class Trace:
             parent_span_id: Optional parent span ID for nested traces
             name: Optional name for the trace
         """
-        self.trace_id = trace_id or str(uuid.uuid4())
-        self.root_span_id = str(uuid.uuid4())
+        self.trace_id = trace_id or _new_id()
+        self.root_span_id = _new_span_id()
         self.parent_span_id = parent_span_id
         self.name = name or "unnamed_trace"
-        self.start_time = time.time()
-        self.end_time = None
-        self.metadata = {}
-        self.spans = {}  # span_id -> Span
-        self.active_spans = set()
-        self.error = None
+        # Durations use the monotonic clock; the wall clock is read once as an anchor
+        self.start_ns = time.perf_counter_ns()
+        self.wall_time_ns = time.time_ns()
+        self.end_ns = None
+        # Containers are allocated on first write; most traces never need them
+        self.metadata = None
+        self.spans = None  # span_id -> Span
+        self.error = None  # Error message, set when the trace ends
         
     def add_metadata(self, key: str, value: Any) -> None:
         """
@@ -65,7 +99,37 @@ class Trace:
             key: Metadata key
             value: Metadata value
         """
+        if self.metadata is None:
+            self.metadata = {}
         self.metadata[key] = value
+    
+    @property
+    def wall_offset_ns(self) -> int:
+        """Offset that maps this trace's monotonic timestamps to wall-clock ns"""
+        return self.wall_time_ns - self.start_ns
+    
+    @property
+    def start_time(self) -> float:
+        """Wall-clock start time in seconds since the epoch"""
+        return self.wall_time_ns / 1e9
+    
+    @property
+    def end_time(self) -> Optional[float]:
+        """Wall-clock end time in seconds since the epoch, or None if running"""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns + self.wall_offset_ns) / 1e9
+    
+    def add_span(self, span: "Span") -> None:
+        """
+        Register a span with this trace
+        
+        Args:
+            span: Span to track
+        """
+        if self.spans is None:
+            self.spans = {}
+        self.spans[span.span_id] = span
         
     def create_span(
         self,
@@ -84,13 +148,13 @@ class Trace:
         """
         span = Span(
             trace_id=self.trace_id,
-            span_id=str(uuid.uuid4()),
+            span_id=_new_span_id(),
             parent_span_id=parent_span_id or self.root_span_id,
-            name=name
+            name=name,
+            wall_offset_ns=self.wall_offset_ns
         )
         
-        self.spans[span.span_id] = span
-        self.active_spans.add(span.span_id)
+        self.add_span(span)
         
         return span
         
@@ -101,13 +165,20 @@ class Trace:
         Args:
             error: Optional error that occurred
         """
-        self.end_time = time.time()
-        self.error = error
+        self.end_ns = time.perf_counter_ns()
+        # Keep only the message so the exception's traceback frames can be freed
+        self.error = None if error is None else str(error)
+        
+        # End any spans still running; spans ended by their own context
+        # (including the root span) keep their timing and error
+        if self.spans:
+            for span in self.spans.values():
+                if span.end_ns is None:
+                    span.end()
         
-        # End any active spans
-        for span_id in list(self.active_spans):
-            self.spans[span_id].end()
-            self.active_spans.remove(span_id)
+        # Hand the finished spans to the background exporter, if any
+        if _export_queue is not None and self.spans:
+            _export_queue.enqueue(self.spans.values())
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -116,15 +187,17 @@ class Trace:
         Returns:
             Dictionary representation of trace
         """
+        duration_ns = None if self.end_ns is None else self.end_ns - self.start_ns
         return {
             "trace_id": self.trace_id,
             "name": self.name,
             "start_time": self.start_time,
             "end_time": self.end_time,
-            "duration": (self.end_time - self.start_time) if self.end_time else None,
-            "metadata": self.metadata,
-            "spans": [span.to_dict() for span in self.spans.values()],
-            "error": str(self.error) if self.error else None
+            "duration": None if duration_ns is None else duration_ns / 1e9,
+            "duration_ns": duration_ns,
+            "metadata": self.metadata or {},
+            "spans": [span.to_dict() for span in self.spans.values()] if self.spans else [],
+            "error": self.error
         }
 
 
@@ -135,12 +208,18 @@ class Span:
     Represents a single operation within a trace, with timing and metadata.
     """
     
+    __slots__ = (
+        'trace_id', 'span_id', 'parent_span_id', 'name', 'start_ns',
+        'end_ns', 'wall_offset_ns', 'metadata', 'events', 'error', '_dict'
+    )
+    
     def __init__(
         self,
         trace_id: str,
         span_id: str,
         parent_span_id: Optional[str],
-        name: str
+        name: str,
+        wall_offset_ns: Optional[int] = None
     ):
         """
         Initialize a new span
@@ -150,16 +229,23 @@ class Span:
             span_id: Unique span ID
             parent_span_id: Parent span ID
             name: Span name
+            wall_offset_ns: Monotonic-to-wall-clock offset of the owning trace
+                (read from the clocks if not provided)
         """
         self.trace_id = trace_id
         self.span_id = span_id
         self.parent_span_id = parent_span_id
         self.name = name
-        self.start_time = time.time()
-        self.end_time = None
-        self.metadata = {}
-        self.events = []
-        self.error = None
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        if wall_offset_ns is None:
+            wall_offset_ns = time.time_ns() - self.start_ns
+        self.wall_offset_ns = wall_offset_ns
+        # Containers are allocated on first write; most spans never need them
+        self.metadata = None
+        self.events = None
+        self.error = None  # Error message, set when the span ends
+        self._dict = None  # Serialized form, cached once the span has ended
         
     def add_metadata(self, key: str, value: Any) -> None:
         """
@@ -169,7 +255,22 @@ class Span:
             key: Metadata key
             value: Metadata value
         """
+        if self.metadata is None:
+            self.metadata = {}
         self.metadata[key] = value
+        self._dict = None
+    
+    @property
+    def start_time(self) -> float:
+        """Wall-clock start time in seconds since the epoch"""
+        return (self.start_ns + self.wall_offset_ns) / 1e9
+    
+    @property
+    def end_time(self) -> Optional[float]:
+        """Wall-clock end time in seconds since the epoch, or None if running"""
+        if self.end_ns is None:
+            return None
+        return (self.end_ns + self.wall_offset_ns) / 1e9
         
     def add_event(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -179,11 +280,11 @@ class Span:
             name: Event name
             metadata: Optional event metadata
         """
-        self.events.append({
-            "name": name,
-            "time": time.time(),
-            "metadata": metadata or {}
-        })
+        if self.events is None:
+            self.events = []
+        # Stored as (name, monotonic ns, metadata); converted in to_dict()
+        self.events.append((name, time.perf_counter_ns(), metadata))
+        self._dict = None
         
     def end(self, error: Optional[Exception] = None) -> None:
         """
@@ -192,28 +293,119 @@ class Span:
         Args:
             error: Optional error that occurred
         """
-        self.end_time = time.time()
-        self.error = error
+        self.end_ns = time.perf_counter_ns()
+        # Keep only the message so the exception's traceback frames can be freed
+        self.error = None if error is None else str(error)
+        self._dict = None
         
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert span to dictionary for serialization
         
+        The result for an ended span is cached and shared between calls, so
+        callers must not modify it.
+        
         Returns:
             Dictionary representation of span
         """
-        return {
+        if self._dict is not None:
+            return self._dict
+        offset = self.wall_offset_ns
+        duration_ns = None if self.end_ns is None else self.end_ns - self.start_ns
+        span_dict = {
             "trace_id": self.trace_id,
             "span_id": self.span_id,
             "parent_span_id": self.parent_span_id,
             "name": self.name,
-            "start_time": self.start_time,
-            "end_time": self.end_time,
-            "duration": (self.end_time - self.start_time) if self.end_time else None,
-            "metadata": self.metadata,
-            "events": self.events,
-            "error": str(self.error) if self.error else None
+            "start_time": (self.start_ns + offset) / 1e9,
+            "end_time": None if self.end_ns is None else (self.end_ns + offset) / 1e9,
+            "duration": None if duration_ns is None else duration_ns / 1e9,
+            "duration_ns": duration_ns,
+            "metadata": self.metadata or {},
+            "events": [
+                {"name": name, "time": (ns + offset) / 1e9, "metadata": metadata or {}}
+                for name, ns, metadata in self.events
+            ] if self.events else [],
+            "error": self.error
         }
+        if self.end_ns is not None:
+            self._dict = span_dict
+        return span_dict
+
+
+class _NoopTrace(Trace):
+    """
+    Trace stand-in for unsampled or disabled tracing
+    
+    Falsy and inert, so trace lookups treat it as "no trace" and recording
+    calls cost nothing.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self):
+        self.trace_id = None
+        self.root_span_id = None
+        self.parent_span_id = None
+        self.name = "noop_trace"
+        self.start_ns = 0
+        self.end_ns = None
+        self.wall_time_ns = 0
+        self.metadata = None
+        self.spans = None
+        self.error = None
+    
+    def __bool__(self) -> bool:
+        return False
+    
+    def add_metadata(self, key: str, value: Any) -> None:
+        pass
+    
+    def add_span(self, span: "Span") -> None:
+        pass
+    
+    def create_span(self, name: str, parent_span_id: Optional[str] = None) -> "Span":
+        return NOOP_SPAN
+    
+    def end(self, error: Optional[Exception] = None) -> None:
+        pass
+
+
+class _NoopSpan(Span):
+    """Span stand-in for unsampled or disabled tracing; falsy and inert"""
+    
+    __slots__ = ()
+    _noop = True
+    
+    def __init__(self):
+        self.trace_id = None
+        self.span_id = None
+        self.parent_span_id = None
+        self.name = "noop_span"
+        self.start_ns = 0
+        self.end_ns = None
+        self.wall_offset_ns = 0
+        self.metadata = None
+        self.events = None
+        self.error = None
+        self._dict = None
+    
+    def __bool__(self) -> bool:
+        return False
+    
+    def add_metadata(self, key: str, value: Any) -> None:
+        pass
+    
+    def add_event(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        pass
+    
+    def end(self, error: Optional[Exception] = None) -> None:
+        pass
+
+
+# Shared no-op singletons returned by TraceContext when a trace is not recorded
+NOOP_TRACE = _NoopTrace()
+NOOP_SPAN = _NoopSpan()
 
 
 class TraceContext:
@@ -223,6 +415,10 @@ class TraceContext:
     Manages trace and span lifecycle with context manager support.
     """
     
+    __slots__ = (
+        'name', 'trace_id', 'parent_span_id', 'trace', 'span', 'trace_token', 'span_token'
+    )
+    
     def __init__(
         self,
         name: str,
@@ -245,9 +441,9 @@ class TraceContext:
         self.trace_token = None
         self.span_token = None
         
-    async def __aenter__(self) -> Tuple[Trace, Span]:
+    def _enter(self) -> Tuple[Trace, Span]:
         """
-        Enter async context manager
+        Start the trace or span (shared by sync and async entry)
         
         Returns:
             Tuple of (trace, span)
@@ -255,10 +451,25 @@ class TraceContext:
         # Check if we're continuing an existing trace
         existing_trace = current_trace.get()
         
+        # Fast path: record nothing when tracing is off or this trace is unsampled
+        if existing_trace is NOOP_TRACE and not self.trace_id:
+            self.trace = NOOP_TRACE
+            self.span = NOOP_SPAN
+            return self.trace, self.span
+        
+        if not existing_trace and not ObservabilityManager.sampled(self.name):
+            self.trace = NOOP_TRACE
+            self.span = NOOP_SPAN
+            if ObservabilityManager.tracing_enabled:
+                # Keep nested calls in the unsampled trace unsampled too
+                self.trace_token = current_trace.set(NOOP_TRACE)
+            return self.trace, self.span
+        
         if existing_trace and not self.trace_id:
             # Create a new span in the existing trace
             self.trace = existing_trace
-            parent_id = self.parent_span_id or current_span.get().span_id if current_span.get() else None
+            parent_span = current_span.get()
+            parent_id = self.parent_span_id or (parent_span.span_id if parent_span else None)
             self.span = self.trace.create_span(self.name, parent_id)
             
             # Update context vars
@@ -276,12 +487,12 @@ class TraceContext:
                 trace_id=self.trace.trace_id,
                 span_id=self.trace.root_span_id,
                 parent_span_id=None,
-                name=self.name
+                name=self.name,
+                wall_offset_ns=self.trace.wall_offset_ns
             )
             
             # Add the root span to the trace
-            self.trace.spans[self.span.span_id] = self.span
-            self.trace.active_spans.add(self.span.span_id)
+            self.trace.add_span(self.span)
             
             # Update context vars
             self.trace_token = current_trace.set(self.trace)
@@ -289,20 +500,26 @@ class TraceContext:
         
         return self.trace, self.span
     
-    async def __aexit__(
+    def _exit(
         self,
         exc_type: Optional[Type[BaseException]],
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType]
     ) -> None:
         """
-        Exit async context manager
+        End the span, and the trace if this context started it (shared by
+        sync and async exit)
         
         Args:
             exc_type: Exception type if an exception was raised
             exc_val: Exception value if an exception was raised
             exc_tb: Exception traceback if an exception was raised
         """
+        if self.span is NOOP_SPAN:
+            if self.trace_token:
+                current_trace.reset(self.trace_token)
+            return
+        
         # End the span
         if self.span:
             self.span.end(error=exc_val)
@@ -318,78 +535,62 @@ class TraceContext:
         if self.trace_token:
             current_trace.reset(self.trace_token)
     
-    def __enter__(self) -> Tuple[Trace, Span]:
+    __enter__ = _enter
+    __exit__ = _exit
+    
+    async def __aenter__(self) -> Tuple[Trace, Span]:
         """
-        Enter synchronous context manager
+        Enter async context manager
         
         Returns:
             Tuple of (trace, span)
         """
-        # Check if we're continuing an existing trace
-        existing_trace = current_trace.get()
-        
-        if existing_trace and not self.trace_id:
-            # Create a new span in the existing trace
-            self.trace = existing_trace
-            parent_id = self.parent_span_id or current_span.get().span_id if current_span.get() else None
-            self.span = self.trace.create_span(self.name, parent_id)
-            
-            # Update context vars
-            self.span_token = current_span.set(self.span)
-        else:
-            # Create a new trace
-            self.trace = Trace(
-                trace_id=self.trace_id,
-                parent_span_id=self.parent_span_id,
-                name=self.name
-            )
-            
-            # Create the root span
-            self.span = Span(
-                trace_id=self.trace.trace_id,
-                span_id=self.trace.root_span_id,
-                parent_span_id=None,
-                name=self.name
-            )
-            
-            # Add the root span to the trace
-            self.trace.spans[self.span.span_id] = self.span
-            self.trace.active_spans.add(self.span.span_id)
-            
-            # Update context vars
-            self.trace_token = current_trace.set(self.trace)
-            self.span_token = current_span.set(self.span)
-        
-        return self.trace, self.span
+        return self._enter()
     
-    def __exit__(
+    async def __aexit__(
         self,
         exc_type: Optional[Type[BaseException]],
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType]
     ) -> None:
         """
-        Exit synchronous context manager
+        Exit async context manager
         
         Args:
             exc_type: Exception type if an exception was raised
             exc_val: Exception value if an exception was raised
             exc_tb: Exception traceback if an exception was raised
         """
-        # End the span
-        if self.span:
-            self.span.end(error=exc_val)
-            
-        # If this is the root trace, end it too
-        if self.trace_token and self.trace:
-            self.trace.end(error=exc_val)
-            
-        # Reset context vars
-        if self.span_token:
-            current_span.reset(self.span_token)
+        self._exit(exc_type, exc_val, exc_tb)
+
+
+# Argument names whose values are masked in span metadata
+_SENSITIVE_ARGUMENTS = frozenset(('password', 'token', 'secret'))
+
+# Values of these types are always JSON serializable
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _is_serializable(value: Any) -> bool:
+    """
+    Check whether a value can be serialized to JSON
+    
+    Containers are probed with the standard json module even when orjson is
+    installed, so the same arguments are recorded with either backend.
+    
+    Args:
+        value: Value to check
         
-        if self.trace_token:
-            current_trace.reset(self.trace_token)
+    Returns:
+        True if the value is JSON serializable
+    """
+    if isinstance(value, _JSON_SCALARS):
+        return True
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, OverflowError, ValueError):
+        return False
 
 
 def trace(name: Optional[str] = None):
@@ -403,71 +604,67 @@ def trace(name: Optional[str] = None):
         Decorated function
     """
     def decorator(func):
+        # Use function name if trace name not provided
+        trace_name = name or func.__name__
+        
+        # Resolve the signature once; per call we only bind arguments
+        try:
+            sig = inspect.signature(func)
+        except (TypeError, ValueError):
+            sig = None
+        param_names = frozenset(sig.parameters) if sig else frozenset()
+        skipped = param_names & {'self', 'cls'}
+        masked = frozenset(
+            param for param in param_names if param.lower() in _SENSITIVE_ARGUMENTS
+        )
+        
+        def add_arguments(span: Span, args: tuple, kwargs: dict) -> None:
+            """Add function arguments to the span as metadata"""
+            if sig is None:
+                return
+            try:
+                bound_args = sig.bind(*args, **kwargs)
+                
+                for arg_name, value in bound_args.arguments.items():
+                    # Filter out self/cls for methods
+                    if arg_name in skipped:
+                        continue
+                    # Skip large or sensitive arguments
+                    if arg_name in masked:
+                        span.add_metadata(arg_name, '***')
+                    elif _is_serializable(value):
+                        span.add_metadata(arg_name, value)
+                    else:
+                        # If not serializable, just add the type
+                        span.add_metadata(arg_name, f"<{type(value).__name__}>")
+            except Exception:
+                # Don't fail if we can't extract arguments
+                pass
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            # Use function name if trace name not provided
-            trace_name = name or func.__name__
+            # Untraced callers in follow-only mode skip tracing entirely
+            if ObservabilityManager.follow_only and not current_trace.get():
+                return await func(*args, **kwargs)
             
             async with TraceContext(trace_name) as (trace, span):
-                # Add function arguments as metadata
-                try:
-                    # Get function signature
-                    sig = inspect.signature(func)
-                    bound_args = sig.bind(*args, **kwargs)
-                    
-                    # Filter out self/cls for methods
-                    if 'self' in bound_args.arguments:
-                        del bound_args.arguments['self']
-                    if 'cls' in bound_args.arguments:
-                        del bound_args.arguments['cls']
-                    
-                    # Add arguments as metadata
-                    for name, value in bound_args.arguments.items():
-                        # Skip large or sensitive arguments
-                        if name.lower() in ('password', 'token', 'secret'):
-                            span.add_metadata(name, '***')
-                        else:
-                            try:
-                                # Try to convert to JSON to ensure it's serializable
-                                json.dumps(value)
-                                span.add_metadata(name, value)
-                            except (TypeError, OverflowError):
-                                # If not serializable, just add the type
-                                span.add_metadata(name, f"<{type(value).__name__}>")
-                except Exception:
-                    # Don't fail if we can't extract arguments
-                    pass
+                # Unrecorded spans would discard the metadata anyway
+                if span is not NOOP_SPAN:
+                    add_arguments(span, args, kwargs)
                 
                 # Call the function
                 return await func(*args, **kwargs)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            # Use function name if trace name not provided
-            trace_name = name or func.__name__
+            # Untraced callers in follow-only mode skip tracing entirely
+            if ObservabilityManager.follow_only and not current_trace.get():
+                return func(*args, **kwargs)
             
             with TraceContext(trace_name) as (trace, span):
-                # Add function arguments as metadata (same as above)
-                try:
-                    sig = inspect.signature(func)
-                    bound_args = sig.bind(*args, **kwargs)
-                    
-                    if 'self' in bound_args.arguments:
-                        del bound_args.arguments['self']
-                    if 'cls' in bound_args.arguments:
-                        del bound_args.arguments['cls']
-                    
-                    for name, value in bound_args.arguments.items():
-                        if name.lower() in ('password', 'token', 'secret'):
-                            span.add_metadata(name, '***')
-                        else:
-                            try:
-                                json.dumps(value)
-                                span.add_metadata(name, value)
-                            except (TypeError, OverflowError):
-                                span.add_metadata(name, f"<{type(value).__name__}>")
-                except Exception:
-                    pass
+                # Unrecorded spans would discard the metadata anyway
+                if span is not NOOP_SPAN:
+                    add_arguments(span, args, kwargs)
                 
                 # Call the function
                 return func(*args, **kwargs)
@@ -491,8 +688,10 @@ class ErrorContext:
     
     def __init__(self):
         """Initialize error context tracker"""
-        self.errors = []  # List of captured errors
         self.max_errors = 1000  # Maximum number of errors to keep
+        # Ring buffer of captured errors, oldest first, plus an index by error ID
+        self.errors = collections.deque(maxlen=self.max_errors)
+        self._index: Dict[str, Dict[str, Any]] = {}
     
     def capture_exception(
         self, 
@@ -509,7 +708,7 @@ class ErrorContext:
         Returns:
             Error ID for reference
         """
-        error_id = str(uuid.uuid4())
+        error_id = _new_id()
         
         # Get trace information if available
         trace_data = {}
@@ -530,15 +729,19 @@ class ErrorContext:
             'timestamp': time.time(),
             'exception_type': type(exception).__name__,
             'exception_message': str(exception),
-            'traceback': traceback.format_exc(),
+            # Formatted on first read; most captured errors are never read back
+            '_traceback': traceback.TracebackException.from_exception(
+                exception, lookup_lines=False
+            ),
             'trace': trace_data,
             'metadata': metadata or {}
         }
         
-        # Add to errors list, truncating if needed
+        # Add to the ring buffer, dropping the evicted record from the index
+        if len(self.errors) == self.errors.maxlen:
+            self._index.pop(self.errors[0]['error_id'], None)
         self.errors.append(error_record)
-        if len(self.errors) > self.max_errors:
-            self.errors = self.errors[-self.max_errors:]
+        self._index[error_id] = error_record
         
         # Log the error
         logger.error(
@@ -562,10 +765,8 @@ class ErrorContext:
         Returns:
             Error details or None if not found
         """
-        for error in self.errors:
-            if error['error_id'] == error_id:
-                return error
-        return None
+        error = self._index.get(error_id)
+        return self._format_traceback(error) if error is not None else None
     
     def get_recent_errors(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -577,11 +778,33 @@ class ErrorContext:
         Returns:
             List of recent errors
         """
-        return self.errors[-limit:]
+        start = max(0, len(self.errors) - limit)
+        return [
+            self._format_traceback(error)
+            for error in itertools.islice(self.errors, start, None)
+        ]
+    
+    @staticmethod
+    def _format_traceback(error: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace a record's captured traceback with its formatted text
+        
+        Args:
+            error: Error record
+            
+        Returns:
+            The same record, with a 'traceback' string
+        """
+        captured = error.get('_traceback')
+        if captured is not None:
+            error['traceback'] = ''.join(captured.format())
+            error.pop('_traceback', None)
+        return error
     
     def clear_errors(self) -> None:
         """Clear all captured errors"""
-        self.errors = []
+        self.errors.clear()
+        self._index.clear()
 
 
 class StructuredLogger:
@@ -592,15 +815,19 @@ class StructuredLogger:
     additional context information.
     """
     
-    def __init__(self, name: str = 'hyperion'):
+    def __init__(self, name: str = 'hyperion', error_context: Optional[ErrorContext] = None):
         """
         Initialize structured logger
         
         Args:
             name: Logger name
+            error_context: Error tracker for exceptions passed to error() and
+                critical() (a private one is created if not provided)
         """
         self.logger = logging.getLogger(name)
-        self.default_fields = {}
+        # Replaced, never mutated, so concurrent log calls read a consistent snapshot
+        self._fields: Dict[str, Any] = {}
+        self.error_context = error_context if error_context is not None else ErrorContext()
     
     def add_default_field(self, key: str, value: Any) -> None:
         """
@@ -610,7 +837,14 @@ class StructuredLogger:
             key: Field name
             value: Field value
         """
-        self.default_fields[key] = value
+        fields = dict(self._fields)
+        fields[key] = value
+        self._fields = fields
+    
+    @property
+    def default_fields(self) -> MappingProxyType:
+        """Read-only view of the fields included in all log entries"""
+        return MappingProxyType(self._fields)
     
     def _format_message(
         self,
@@ -637,7 +871,7 @@ class StructuredLogger:
         }
         
         # Add default fields
-        log_entry.update(self.default_fields)
+        log_entry.update(self._fields)
         
         # Add trace context if available
         trace = current_trace.get()
@@ -670,7 +904,7 @@ class StructuredLogger:
         """
         if self.logger.isEnabledFor(logging.DEBUG):
             log_entry = self._format_message('DEBUG', message, fields)
-            self.logger.debug(json.dumps(log_entry))
+            self.logger.debug(_dumps(log_entry))
     
     def info(
         self,
@@ -686,7 +920,7 @@ class StructuredLogger:
         """
         if self.logger.isEnabledFor(logging.INFO):
             log_entry = self._format_message('INFO', message, fields)
-            self.logger.info(json.dumps(log_entry))
+            self.logger.info(_dumps(log_entry))
     
     def warning(
         self,
@@ -702,7 +936,7 @@ class StructuredLogger:
         """
         if self.logger.isEnabledFor(logging.WARNING):
             log_entry = self._format_message('WARNING', message, fields)
-            self.logger.warning(json.dumps(log_entry))
+            self.logger.warning(_dumps(log_entry))
     
     def error(
         self,
@@ -726,13 +960,12 @@ class StructuredLogger:
             
             # Capture exception if provided
             if exception:
-                error_context = ErrorContext()
-                error_id = error_context.capture_exception(exception, fields)
+                error_id = self.error_context.capture_exception(exception, fields)
                 log_entry['error_id'] = error_id
-                self.logger.error(json.dumps(log_entry), exc_info=exception)
+                self.logger.error(_dumps(log_entry), exc_info=exception)
                 return error_id
             else:
-                self.logger.error(json.dumps(log_entry))
+                self.logger.error(_dumps(log_entry))
                 
         return None
     
@@ -758,17 +991,131 @@ class StructuredLogger:
             
             # Capture exception if provided
             if exception:
-                error_context = ErrorContext()
-                error_id = error_context.capture_exception(exception, fields)
+                error_id = self.error_context.capture_exception(exception, fields)
                 log_entry['error_id'] = error_id
-                self.logger.critical(json.dumps(log_entry), exc_info=exception)
+                self.logger.critical(_dumps(log_entry), exc_info=exception)
                 return error_id
             else:
-                self.logger.critical(json.dumps(log_entry))
+                self.logger.critical(_dumps(log_entry))
                 
         return None
 
 
+class SpanExportQueue:
+    """
+    Background batch exporter for finished spans
+    
+    Ended traces enqueue their spans without blocking; a single asyncio task
+    drains the queue in batches, when a batch fills up or the flush interval
+    elapses, so export I/O stays off the request path.
+    """
+    
+    def __init__(
+        self,
+        exporter: Callable[[List[Span]], Any],
+        batch_size: int = 512,
+        flush_interval: float = 5.0,
+        max_queue_size: int = 2048
+    ):
+        """
+        Initialize span export queue
+        
+        Args:
+            exporter: Callable (sync or async) that receives a list of spans
+            batch_size: Maximum number of spans per export call
+            flush_interval: Maximum seconds between exports
+            max_queue_size: Spans kept while the exporter falls behind
+                (the oldest are dropped beyond this)
+        """
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = collections.deque(maxlen=max_queue_size)
+        self._event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+    
+    def enqueue(self, spans: Iterable[Span]) -> None:
+        """
+        Queue finished spans for export
+        
+        Args:
+            spans: Spans to export
+        """
+        queue = self._queue
+        queue.extend(spans)
+        if len(queue) >= self.batch_size and self._loop is not None:
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if running_loop is self._loop:
+                self._event.set()
+            else:
+                self._loop.call_soon_threadsafe(self._event.set)
+    
+    async def start(self) -> None:
+        """Start the background export task"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._task = asyncio.create_task(self._export_loop())
+    
+    async def stop(self) -> None:
+        """
+        Stop the background export task and flush queued spans
+        
+        The task is asked to exit rather than cancelled, so a batch that is
+        being exported when stop is called is not lost.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._event.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+            self._loop = None
+            self._stopping = False
+        await self.flush()
+    
+    async def flush(self) -> None:
+        """Export all queued spans"""
+        while self._queue:
+            await self._export_batch()
+    
+    async def _export_loop(self) -> None:
+        """Drain the queue whenever a batch is full or the interval elapses"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._event.clear()
+            await self.flush()
+    
+    async def _export_batch(self) -> None:
+        """Export one batch of queued spans"""
+        queue = self._queue
+        popleft = queue.popleft
+        batch = [popleft() for _ in range(min(len(queue), self.batch_size))]
+        try:
+            result = self.exporter(batch)
+            if inspect.isawaitable(result):
+                await result
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Span export failed, dropped {len(batch)} spans: {str(e)}")
+
+
+# Export queue fed by ended traces; set up by ObservabilityManager
+_export_queue: Optional[SpanExportQueue] = None
+
+
 class ObservabilityManager:
     """
     Centralized observability management
@@ -776,6 +1123,13 @@ class ObservabilityManager:
     Provides unified access to tracing, logging, and error tracking.
     """
     
+    # Process-wide trace sampling, consulted when a new root trace starts
+    tracing_enabled = True
+    sampling_rate = 1.0
+    # In 'follow_only' mode, @trace functions only record spans inside an
+    # existing trace instead of starting new root traces ('always')
+    follow_only = os.environ.get('HYPERION_TRACE_MODE', 'always') == 'follow_only'
+    
     def __init__(self, app_name: str = 'hyperion'):
         """
         Initialize observability manager
@@ -785,12 +1139,58 @@ class ObservabilityManager:
         """
         self.app_name = app_name
         self.error_context = ErrorContext()
-        self.logger = StructuredLogger(app_name)
+        self.logger = StructuredLogger(app_name, error_context=self.error_context)
         
         # Add default fields to logger
         self.logger.add_default_field('app', app_name)
         self.logger.add_default_field('hostname', os.environ.get('HOSTNAME', 'unknown'))
     
+    @classmethod
+    def configure_tracing(
+        cls,
+        enabled: Optional[bool] = None,
+        sampling_rate: Optional[float] = None,
+        mode: Optional[str] = None
+    ) -> None:
+        """
+        Configure trace recording for the process
+        
+        Unsampled traces get shared no-op trace and span objects, so they
+        allocate nothing and set no context variables.
+        
+        Args:
+            enabled: Whether tracing is enabled at all
+            sampling_rate: Fraction of new root traces to record (0-1)
+            mode: 'always' or 'follow_only' (initially read from HYPERION_TRACE_MODE)
+            
+        Raises:
+            ValueError: If mode is not recognized
+        """
+        if enabled is not None:
+            cls.tracing_enabled = enabled
+        if sampling_rate is not None:
+            cls.sampling_rate = min(1.0, max(0.0, sampling_rate))
+        if mode is not None:
+            if mode not in ('always', 'follow_only'):
+                raise ValueError(f"Unknown trace mode: {mode}")
+            cls.follow_only = mode == 'follow_only'
+    
+    @classmethod
+    def sampled(cls, name: str) -> bool:
+        """
+        Decide whether a new root trace should be recorded
+        
+        Args:
+            name: Trace name
+            
+        Returns:
+            True if the trace should be recorded
+        """
+        if not cls.tracing_enabled:
+            return False
+        rate = cls.sampling_rate
+        return rate >= 1.0 or random.random() < rate
+    
     def trace_context(
         self,
         name: str,
@@ -848,17 +1248,41 @@ class ObservabilityManager:
         return span.span_id if span else None
     
     @trace("init_opentelemetry_export")
-    async def init_opentelemetry_export(self) -> bool:
+    async def init_opentelemetry_export(
+        self,
+        exporter: Optional[Callable[[List[Span]], Any]] = None,
+        batch_size: int = 512,
+        flush_interval: float = 5.0
+    ) -> bool:
         """
         Initialize OpenTelemetry export
         
+        Args:
+            exporter: Optional callable (sync or async) that receives batches
+                of finished spans
+            batch_size: Maximum number of spans per export call
+            flush_interval: Maximum seconds between exports
+            
         Returns:
             True if successful, False otherwise
         """
+        global _export_queue
         try:
             # This is a placeholder - would integrate with actual OpenTelemetry SDK
+            if exporter is not None:
+                await self.shutdown_export()
+                queue = SpanExportQueue(exporter, batch_size, flush_interval)
+                await queue.start()
+                _export_queue = queue
             logger.info("OpenTelemetry export initialized")
             return True
         except Exception as e:
             logger.error(f"Failed to initialize OpenTelemetry: {str(e)}", exc_info=True)
             return False
+    
+    async def shutdown_export(self) -> None:
+        """Stop span export, flushing any queued spans"""
+        global _export_queue
+        queue, _export_queue = _export_queue, None
+        if queue is not None:
+            await queue.stop()
@@ -6,13 +6,36 @@ and adaptive backoff strategies for robust operation.
 """
 
 import asyncio
+import collections
+import itertools
 import logging
+import math
+import os
 import random
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 logger = logging.getLogger(__name__)
 
+# Heartbeat batches at least this large are reduced with NumPy
+_NUMPY_MIN_BATCH = 64
+
+# Jitter source shared by all backoff strategies; 32 random bits scaled by
+# 2**-32 give a uniform float in [0, 1) more cheaply than random()
+_JITTER_RNG = random.Random()
+_jitter_bits = _JITTER_RNG.getrandbits
+_INV_2_32 = 2.0 ** -32
+
+# Reseed in forked workers so they do not retry in lockstep
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_JITTER_RNG.seed)
+
 
 # Custom exceptions for resilience patterns
 class CircuitOpenError(Exception):
@@ -30,12 +53,22 @@ class TransientError(Exception):
     pass
 
 
+class _OpState:
+    """Per-operation retry state tracked by AdaptiveBackoff"""
+    
+    __slots__ = ('attempts', 'prev_delay')
+    
+    def __init__(self, initial: float):
+        self.attempts = 0
+        self.prev_delay = initial  # Last delay, for decorrelated jitter
+
+
 class AdaptiveBackoff:
     """
     Smart exponential backoff with jitter for retry operations
     
     Provides adaptive retry logic with exponential backoff and jitter to prevent
-    thundering herd problems. Tracks backoff times per operation for more intelligent
+    thundering herd problems. Tracks retry attempts per operation for more intelligent
     retry management.
     """
     
@@ -44,7 +77,9 @@ class AdaptiveBackoff:
         initial: float = 0.1, 
         maximum: float = 30.0, 
         factor: float = 2.0,
-        max_attempts: int = 10
+        max_attempts: int = 10,
+        jitter: str = 'decorrelated',
+        max_tracked: int = 1024
     ):
         """
         Initialize the backoff strategy
@@ -52,17 +87,48 @@ class AdaptiveBackoff:
         Args:
             initial: Initial backoff delay in seconds
             maximum: Maximum backoff delay in seconds
-            factor: Multiplicative factor for backoff increase
+            factor: Multiplicative factor for backoff increase (not used by
+                decorrelated jitter)
             max_attempts: Maximum number of retry attempts
+            jitter: How retry delays are randomized: 'decorrelated' (between
+                initial and three times the previous delay), or below the
+                exponential ceiling with 'full' (0 to ceiling), 'equal' (half
+                to full ceiling) or 'none'
+            max_tracked: Maximum number of operations with retry state kept
+                (least recently used operations are forgotten first)
+            
+        Raises:
+            ValueError: If jitter is not a supported mode
         """
+        if jitter not in ('decorrelated', 'none', 'full', 'equal'):
+            raise ValueError(f"Unknown jitter mode: {jitter}")
+        
         self.initial = initial
         self.maximum = maximum
         self.factor = factor
         self.max_attempts = max_attempts
-        
-        # State tracking
-        self.backoff_times = {}  # per-operation backoff times
-        self.attempt_counts = {}  # per-operation attempt counts
+        self.jitter = jitter
+        self._rand_bits = _jitter_bits
+        
+        # Backoff ceiling before each retry, fixed by the parameters above
+        schedule = []
+        backoff = min(initial, maximum)
+        for attempt in range(max_attempts + 1):
+            if backoff >= maximum:
+                # Clamped from here on; also keeps ldexp from overflowing
+                schedule.extend([maximum] * (max_attempts + 1 - attempt))
+                break
+            schedule.append(backoff)
+            if factor == 2.0:
+                # Doubling is an exact exponent bump
+                backoff = min(math.ldexp(initial, attempt + 1), maximum)
+            else:
+                backoff = min(backoff * factor, maximum)
+        self._schedule = tuple(schedule)
+        
+        # State tracking: operation ID -> attempt count, in LRU order
+        self.max_tracked = max_tracked
+        self._ops: "collections.OrderedDict[str, _OpState]" = collections.OrderedDict()
     
     async def execute_with_backoff(
         self, 
@@ -93,45 +159,61 @@ class AdaptiveBackoff:
             operation_id = f"{func.__name__}_{id(func)}"
         
         # Initialize tracking for this operation if not seen before
-        if operation_id not in self.backoff_times:
-            self.backoff_times[operation_id] = self.initial
-            self.attempt_counts[operation_id] = 0
+        ops = self._ops
+        state = ops.get(operation_id)
+        if state is None:
+            state = ops[operation_id] = _OpState(self.initial)
+            if len(ops) > self.max_tracked:
+                ops.popitem(last=False)
+        else:
+            ops.move_to_end(operation_id)
         
         # Execute with retry logic
         while True:
             try:
                 # Increment attempt counter
-                self.attempt_counts[operation_id] += 1
-                current_attempt = self.attempt_counts[operation_id]
+                state.attempts += 1
+                current_attempt = state.attempts
                 
                 # Check if max attempts exceeded
                 if current_attempt > self.max_attempts:
                     logger.error(
-                        f"Operation {operation_id} failed after {current_attempt-1} attempts"
+                        "Operation %s failed after %d attempts",
+                        operation_id, current_attempt - 1
                     )
                     raise Exception(
                         f"Max retry attempts ({self.max_attempts}) exceeded for operation"
                     )
                 
                 # Execute function
-                return await func(*args, **kwargs)
+                result = await func(*args, **kwargs)
+                
+                # Success: forget the operation's retry state
+                self._ops.pop(operation_id, None)
+                return result
                 
             except retry_exceptions as e:
                 # Calculate delay with jitter
-                current_backoff = self.backoff_times[operation_id]
-                jitter = random.random() * 0.2  # +/- 20% jitter
-                delay = min(current_backoff * (1.0 + jitter), self.maximum)
+                if self.jitter == 'decorrelated':
+                    # Random between initial and 3x the previous delay, capped
+                    low = self.initial
+                    delay = low + (state.prev_delay * 3.0 - low) * (self._rand_bits(32) * _INV_2_32)
+                    if delay > self.maximum:
+                        delay = self.maximum
+                    state.prev_delay = delay
+                elif self.jitter == 'full':
+                    capped = self._schedule[current_attempt - 1]
+                    delay = self._rand_bits(32) * _INV_2_32 * capped
+                elif self.jitter == 'equal':
+                    capped = self._schedule[current_attempt - 1]
+                    delay = capped * 0.5 * (1.0 + self._rand_bits(32) * _INV_2_32)
+                else:
+                    delay = self._schedule[current_attempt - 1]
                 
-                # Log retry information
+                # Log retry information (formatted only if the level is enabled)
                 logger.warning(
-                    f"Operation {operation_id} failed with error '{str(e)}', "
-                    f"retry {current_attempt}/{self.max_attempts} in {delay:.2f}s"
-                )
-                
-                # Increase backoff for next attempt
-                self.backoff_times[operation_id] = min(
-                    current_backoff * self.factor,
-                    self.maximum
+                    "Operation %s failed with error '%s', retry %d/%d in %.2fs",
+                    operation_id, e, current_attempt, self.max_attempts, delay
                 )
                 
                 # Wait before retry
@@ -140,7 +222,7 @@ class AdaptiveBackoff:
             except Exception as e:
                 # Non-retryable error, reset counters and re-raise
                 logger.error(
-                    f"Operation {operation_id} failed with non-retryable error: {str(e)}"
+                    "Operation %s failed with non-retryable error: %s", operation_id, e
                 )
                 self.reset(operation_id)
                 raise
@@ -152,9 +234,7 @@ class AdaptiveBackoff:
         Args:
             operation_id: Identifier for the operation to reset
         """
-        if operation_id in self.backoff_times:
-            self.backoff_times[operation_id] = self.initial
-            self.attempt_counts[operation_id] = 0
+        self._ops.pop(operation_id, None)
 
 
 class CircuitBreaker:
@@ -170,7 +250,9 @@ class CircuitBreaker:
         name: str,
         failure_threshold: int = 5,
         reset_timeout: float = 60.0,
-        half_open_max_calls: int = 1
+        half_open_max_calls: int = 1,
+        max_concurrent: Optional[int] = None,
+        success_threshold: int = 1
     ):
         """
         Initialize the circuit breaker
@@ -180,11 +262,18 @@ class CircuitBreaker:
             failure_threshold: Number of failures before opening circuit
             reset_timeout: Seconds before attempting recovery (half-open)
             half_open_max_calls: Maximum calls allowed in half-open state
+            max_concurrent: Maximum in-flight calls while closed (unbounded
+                if not provided)
+            success_threshold: Successful half-open calls needed to close
+                the circuit; may exceed half_open_max_calls, which only
+                bounds concurrent probes
         """
         self.name = name
         self.failure_threshold = failure_threshold
         self.reset_timeout = reset_timeout
         self.half_open_max_calls = half_open_max_calls
+        self.max_concurrent = max_concurrent
+        self.success_threshold = success_threshold
         
         # State tracking
         self.failure_count = 0
@@ -192,9 +281,18 @@ class CircuitBreaker:
         self.last_failure_time = 0
         self.success_count = 0
         self.half_open_calls = 0
+        # Bumped on every state change so status snapshots can be reused
+        self._version = 0
+        # True while closed; lets execute() skip the open/half-open checks
+        self._fast_closed = True
+        # Bulkhead limiting in-flight calls; swapped on state transitions
+        self._bulkhead = self._closed_bulkhead()
+        
+        # Monotonic clock, so reset timeouts are immune to wall-clock jumps
+        self._now = time.monotonic
         
-        # Thread safety
-        self.lock = asyncio.Lock()
+        # No lock: state is only touched between awaits, which is atomic as
+        # long as the breaker is used from a single event loop
         
         logger.info(
             f"Circuit breaker '{name}' initialized: "
@@ -217,73 +315,128 @@ class CircuitBreaker:
             CircuitOpenError: If circuit is open
             Exception: Any exception raised by the function
         """
-        # Check if circuit is open
-        async with self.lock:
-            if self.state == "open":
-                # Check if reset timeout has elapsed
-                if time.time() - self.last_failure_time > self.reset_timeout:
-                    logger.info(f"Circuit '{self.name}' half-open, allowing test request")
-                    self.state = "half-open"
-                    self.half_open_calls = 0
-                    self.success_count = 0
+        # State updates below never await, so they are atomic within the
+        # event loop; only the call itself yields
+        
+        # Fast path: a closed circuit only has to count the outcome
+        if self._fast_closed:
+            bulkhead = self._bulkhead
+            try:
+                if bulkhead is None:
+                    result = await func(*args, **kwargs)
                 else:
-                    raise CircuitOpenError(
-                        f"Circuit '{self.name}' is open until "
-                        f"{time.time() - self.last_failure_time:.1f}s/"
-                        f"{self.reset_timeout}s timeout elapses"
-                    )
+                    async with bulkhead:
+                        result = await func(*args, **kwargs)
+            except Exception:
+                self._record_failure()
+                raise
             
-            # Check if we can make a call in half-open state
-            if self.state == "half-open":
-                if self.half_open_calls >= self.half_open_max_calls:
-                    raise CircuitOpenError(
-                        f"Circuit '{self.name}' is half-open with max calls exceeded"
-                    )
-                self.half_open_calls += 1
+            if self.state == "closed" and self.failure_count:
+                self.failure_count -= 1
+                self._version += 1
+            return result
+        
+        # Check if circuit is open
+        if self.state == "open":
+            # Check if reset timeout has elapsed
+            if self._now() - self.last_failure_time > self.reset_timeout:
+                logger.info("Circuit '%s' half-open, allowing test request", self.name)
+                self.state = "half-open"
+                self.half_open_calls = 0
+                self.success_count = 0
+                self._version += 1
+                # Only the probe calls may reach the recovering resource
+                self._bulkhead = asyncio.Semaphore(self.half_open_max_calls)
+            else:
+                raise CircuitOpenError(
+                    f"Circuit '{self.name}' is open until "
+                    f"{self._now() - self.last_failure_time:.1f}s/"
+                    f"{self.reset_timeout}s timeout elapses"
+                )
+        
+        # Check if we can make a call in half-open state; half_open_max_calls
+        # bounds the probes in flight, so several sequential probes can reach
+        # success_threshold
+        probe = self.state == "half-open"
+        if probe:
+            if self.half_open_calls >= self.half_open_max_calls:
+                raise CircuitOpenError(
+                    f"Circuit '{self.name}' is half-open with max calls exceeded"
+                )
+            self.half_open_calls += 1
+            self._version += 1
+        
+        bulkhead = self._bulkhead
         
         # Execute function
         try:
-            result = await func(*args, **kwargs)
-            
-            # Handle success
-            async with self.lock:
-                if self.state == "half-open":
-                    self.success_count += 1
-                    # Reset circuit after sufficient successful calls
-                    if self.success_count >= self.failure_threshold:
-                        logger.info(
-                            f"Circuit '{self.name}' reset to closed after "
-                            f"{self.success_count} successful executions"
-                        )
-                        self.state = "closed"
-                        self.failure_count = 0
-                        self.success_count = 0
-                elif self.state == "closed":
-                    # Reset failure count after successful execution
-                    self.failure_count = max(0, self.failure_count - 1)
-            
-            return result
-            
-        except Exception as e:
-            # Handle failure
-            async with self.lock:
-                self.failure_count += 1
-                self.last_failure_time = time.time()
-                
-                if self.state == "closed" and self.failure_count >= self.failure_threshold:
-                    logger.warning(
-                        f"Circuit '{self.name}' opened after {self.failure_count} failures"
-                    )
-                    self.state = "open"
-                    
-                if self.state == "half-open":
-                    logger.warning(
-                        f"Circuit '{self.name}' reopened after failure in half-open state"
-                    )
-                    self.state = "open"
-            
-            # Re-raise the exception
+            if bulkhead is None:
+                result = await func(*args, **kwargs)
+            else:
+                async with bulkhead:
+                    result = await func(*args, **kwargs)
+        except Exception:
+            # Handle failure, then re-raise the exception
+            self._record_failure()
             raise
+        finally:
+            # Release the probe slot unless a new half-open period began since
+            if probe and self._bulkhead is bulkhead:
+                self.half_open_calls -= 1
+        
+        # Handle success
+        self._version += 1
+        if self.state == "half-open":
+            self.success_count += 1
+            # Reset circuit after sufficient successful calls
+            if self.success_count >= self.success_threshold:
+                logger.info(
+                    "Circuit '%s' reset to closed after %d successful executions",
+                    self.name, self.success_count
+                )
+                self.state = "closed"
+                self._fast_closed = True
+                self._bulkhead = self._closed_bulkhead()
+                self.failure_count = 0
+                self.success_count = 0
+        elif self.state == "closed":
+            # Reset failure count after successful execution
+            if self.failure_count:
+                self.failure_count -= 1
+        
+        return result
+    
+    def _closed_bulkhead(self) -> Optional[asyncio.Semaphore]:
+        """
+        Create the bulkhead used while the circuit is closed
+        
+        Returns:
+            Semaphore sized to max_concurrent, or None if unbounded
+        """
+        if self.max_concurrent is None:
+            return None
+        return asyncio.Semaphore(self.max_concurrent)
+    
+    def _record_failure(self) -> None:
+        """
+        Count a failed call and open the circuit if needed
+        """
+        self.failure_count += 1
+        self.last_failure_time = self._now()
+        self._version += 1
+        
+        if self.state == "closed" and self.failure_count >= self.failure_threshold:
+            logger.warning(
+                "Circuit '%s' opened after %d failures", self.name, self.failure_count
+            )
+            self.state = "open"
+            self._fast_closed = False
+            
+        if self.state == "half-open":
+            logger.warning(
+                "Circuit '%s' reopened after failure in half-open state", self.name
+            )
+            self.state = "open"
     
     def get_state(self) -> Dict[str, Any]:
         """
@@ -301,7 +454,7 @@ class CircuitBreaker:
         
         if self.state == "open":
             # Add time until reset
-            time_since_failure = time.time() - self.last_failure_time
+            time_since_failure = self._now() - self.last_failure_time
             time_until_reset = max(0, self.reset_timeout - time_since_failure)
             state_info["time_until_reset"] = time_until_reset
             
@@ -314,19 +467,17 @@ class CircuitBreaker:
     def reset(self) -> None:
         """
         Manually reset the circuit to closed state
+        
+        Takes effect immediately and works with or without a running event loop.
         """
-        asyncio.create_task(self._reset())
-    
-    async def _reset(self) -> None:
-        """
-        Internal async reset implementation
-        """
-        async with self.lock:
-            self.state = "closed"
-            self.failure_count = 0
-            self.success_count = 0
-            self.half_open_calls = 0
-            logger.info(f"Circuit '{self.name}' manually reset to closed state")
+        self.state = "closed"
+        self._fast_closed = True
+        self._bulkhead = self._closed_bulkhead()
+        self.failure_count = 0
+        self.success_count = 0
+        self.half_open_calls = 0
+        self._version += 1
+        logger.info(f"Circuit '{self.name}' manually reset to closed state")
 
 
 class RateLimiter:
@@ -360,10 +511,7 @@ class RateLimiter:
         
         # Token bucket state
         self.tokens = burst
-        self.last_refill = time.time()
-        
-        # Thread safety
-        self.lock = asyncio.Lock()
+        self.last_refill = time.monotonic()
         
         logger.info(
             f"Rate limiter '{name}' initialized: "
@@ -383,42 +531,46 @@ class RateLimiter:
         Raises:
             RateLimitError: If tokens not available and wait=False
         """
-        start_time = time.time()
+        # The bucket update below never awaits, so it is atomic within the
+        # event loop and needs no lock; only the sleep yields
+        now = start_time = time.monotonic()
         
-        async with self.lock:
-            # Refill tokens
-            now = time.time()
-            elapsed = now - self.last_refill
-            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
-            self.last_refill = now
-            
-            # Check if we have enough tokens
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return 0.0
-            
-            # If not waiting, raise error
-            if not self.wait:
-                raise RateLimitError(
-                    f"Rate limit exceeded for '{self.name}': "
-                    f"needed {tokens}, available {self.tokens:.2f}"
-                )
-            
-            # Calculate wait time
-            tokens_needed = tokens - self.tokens
-            wait_time = tokens_needed / self.rate
-            
-            # Update state
-            self.tokens = 0
-            self.last_refill = now + wait_time
+        # Refill tokens, capped at the burst size
+        available = self.tokens + (now - self.last_refill) * self.rate
+        if available > self.burst:
+            available = self.burst
+        self.last_refill = now
+        
+        # Take the tokens if enough are available
+        remaining = available - tokens
+        if remaining >= 0:
+            self.tokens = remaining
+            return 0.0
+        self.tokens = available
+        
+        # If not waiting, raise error
+        if not self.wait:
+            raise RateLimitError(
+                f"Rate limit exceeded for '{self.name}': "
+                f"needed {tokens}, available {self.tokens:.2f}"
+            )
+        
+        # Calculate wait time
+        tokens_needed = tokens - self.tokens
+        wait_time = tokens_needed / self.rate
+        
+        # Update state
+        self.tokens = 0
+        self.last_refill = now + wait_time
         
         # Wait for tokens to become available
-        logger.debug(
-            f"Rate limiter '{self.name}' waiting {wait_time:.2f}s for tokens"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Rate limiter '%s' waiting %.2fs for tokens", self.name, wait_time
+            )
         await asyncio.sleep(wait_time)
         
-        return time.time() - start_time
+        return time.monotonic() - start_time
     
     async def execute(self, func: Callable, *args, tokens: int = 1, **kwargs) -> Any:
         """
@@ -473,10 +625,18 @@ class FailureDetector:
         self.min_samples = min_samples
         
         # Sample state
-        self.samples = []
+        self.samples = collections.deque(maxlen=window_size)
         self.last_sample_time = 0
         self.last_phi = 0.0
         
+        # Running sums over the window, resynced once per window of evictions
+        # to stop floating-point drift
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._evictions = 0
+        # Monotonic time of the cached last_phi (None when stale)
+        self._phi_time: Optional[float] = None
+        
         logger.info(
             f"Failure detector '{name}' initialized: "
             f"threshold={threshold}, window={window_size}"
@@ -486,21 +646,91 @@ class FailureDetector:
         """
         Record a successful heartbeat from the monitored system
         """
-        now = time.time()
+        now = time.monotonic()
         
         if self.last_sample_time > 0:
             # Calculate interval
             interval = now - self.last_sample_time
             
-            # Add to samples
-            self.samples.append(interval)
+            # Add to samples; the oldest sample drops out once the window is full
+            samples = self.samples
+            if len(samples) == samples.maxlen:
+                oldest = samples[0]
+                self._sum -= oldest
+                self._sum_sq -= oldest * oldest
+                self._evictions += 1
+            samples.append(interval)
+            self._sum += interval
+            self._sum_sq += interval * interval
             
-            # Trim window if needed
-            if len(self.samples) > self.window_size:
-                self.samples = self.samples[-self.window_size:]
+            if self._evictions >= self.window_size:
+                self._resync_sums()
+        
+        self._phi_time = None
         
         self.last_sample_time = now
     
+    def record_heartbeats(self, timestamps: Sequence[float]) -> None:
+        """
+        Record a batch of heartbeats in one pass
+        
+        Args:
+            timestamps: Heartbeat times in ascending order, from the
+                time.monotonic() clock
+        """
+        if len(timestamps) == 0:
+            return
+        
+        window = self.window_size
+        if HAS_NUMPY and len(timestamps) >= _NUMPY_MIN_BATCH:
+            times = np.asarray(timestamps, dtype=np.float64)
+            if self.last_sample_time > 0:
+                intervals = np.diff(times, prepend=self.last_sample_time)
+            else:
+                intervals = np.diff(times)
+            # Anything older would be evicted by the batch itself
+            intervals = intervals[-window:]
+            values = intervals.tolist()
+            batch_sum = float(intervals.sum())
+            batch_sum_sq = float(np.dot(intervals, intervals))
+        else:
+            previous = self.last_sample_time
+            values = []
+            for timestamp in timestamps:
+                if previous > 0:
+                    values.append(timestamp - previous)
+                previous = timestamp
+            values = values[-window:]
+            batch_sum = sum(values)
+            batch_sum_sq = sum(v * v for v in values)
+        
+        # Take the samples the batch will evict out of the running sums
+        samples = self.samples
+        overflow = len(samples) + len(values) - window
+        if overflow > 0:
+            evicted = list(itertools.islice(samples, overflow))
+            self._sum -= sum(evicted)
+            self._sum_sq -= sum(e * e for e in evicted)
+            self._evictions += overflow
+        
+        samples.extend(values)
+        self._sum += batch_sum
+        self._sum_sq += batch_sum_sq
+        if self._evictions >= window:
+            self._resync_sums()
+        
+        self._phi_time = None
+        self.last_sample_time = timestamps[-1]
+    
+    def _resync_sums(self) -> None:
+        """
+        Recompute the running sums exactly from the sample window
+        """
+        samples = self.samples
+        self._sum = sum(samples)
+        self._sum_sq = sum(s * s for s in samples)
+        self._evictions = 0
+    
     def phi_value(self) -> float:
         """
         Calculate the current phi value based on heartbeat history
@@ -508,24 +738,34 @@ class FailureDetector:
         Returns:
             Current phi value (0.0-1.0)
         """
-        if len(self.samples) < self.min_samples:
+        n = len(self.samples)
+        if n < self.min_samples:
             return 0.0
             
-        now = time.time()
+        now = time.monotonic()
+        
+        # Back-to-back calls within a millisecond reuse the last value
+        if self._phi_time is not None and now - self._phi_time < 0.001:
+            return self.last_phi
+        
         elapsed = now - self.last_sample_time
         
-        # Calculate mean and variance
-        mean = sum(self.samples) / len(self.samples)
-        variance = sum((s - mean) ** 2 for s in self.samples) / len(self.samples)
+        # Mean and variance from the running sums (clamped against rounding)
+        mean = self._sum / n
+        variance = self._sum_sq / n - mean * mean
+        if variance < 0.0:
+            variance = 0.0
         
         # Calculate phi using cumulative distribution function approximation
         if variance == 0:
             return 1.0 if elapsed > mean else 0.0
             
         diff = elapsed - mean
-        phi = min(1.0, max(0.0, diff / (mean + variance)))
+        phi = diff / (mean + variance)
+        phi = 0.0 if phi < 0.0 else 1.0 if phi > 1.0 else phi
         
         self.last_phi = phi
+        self._phi_time = now
         return phi
     
     def is_available(self) -> bool:
@@ -551,8 +791,8 @@ class FailureDetector:
             "phi": phi,
             "threshold": self.threshold,
             "samples": len(self.samples),
-            "mean_interval": sum(self.samples) / len(self.samples) if self.samples else 0,
-            "last_heartbeat_age": time.time() - self.last_sample_time if self.last_sample_time else 0
+            "mean_interval": self._sum / len(self.samples) if self.samples else 0,
+            "last_heartbeat_age": time.monotonic() - self.last_sample_time if self.last_sample_time else 0
         }
 
 
@@ -570,6 +810,13 @@ class ResilienceManager:
         self.rate_limiters = {}
         self.failure_detectors = {}
         self.backoff_strategies = {}
+        
+        # get_status() snapshot, reused for a short TTL unless a circuit
+        # breaker changes state or a component is registered
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_time = 0.0
+        self._status_versions: Tuple[int, ...] = ()
+        self._status_ttl = 0.25
     
     def create_circuit_breaker(self, name: str, **kwargs) -> CircuitBreaker:
         """
@@ -588,6 +835,7 @@ class ResilienceManager:
             
         circuit_breaker = CircuitBreaker(name, **kwargs)
         self.circuit_breakers[name] = circuit_breaker
+        self._status_cache = None
         return circuit_breaker
     
     def create_rate_limiter(self, name: str, **kwargs) -> RateLimiter:
@@ -607,6 +855,7 @@ class ResilienceManager:
             
         rate_limiter = RateLimiter(name, **kwargs)
         self.rate_limiters[name] = rate_limiter
+        self._status_cache = None
         return rate_limiter
     
     def create_failure_detector(self, name: str, **kwargs) -> FailureDetector:
@@ -626,6 +875,7 @@ class ResilienceManager:
             
         failure_detector = FailureDetector(name, **kwargs)
         self.failure_detectors[name] = failure_detector
+        self._status_cache = None
         return failure_detector
     
     def create_backoff_strategy(self, name: str, **kwargs) -> AdaptiveBackoff:
@@ -699,9 +949,21 @@ class ResilienceManager:
         """
         Get status of all resilience components
         
+        Snapshots are reused for up to 0.25s while no circuit breaker changes
+        state; callers must not modify the returned dictionary.
+        
         Returns:
             Dictionary with status information for all components
         """
+        now = time.monotonic()
+        versions = tuple(cb._version for cb in self.circuit_breakers.values())
+        if (
+            self._status_cache is not None
+            and now - self._status_time < self._status_ttl
+            and versions == self._status_versions
+        ):
+            return self._status_cache
+        
         status = {
             "circuit_breakers": {},
             "rate_limiters": {},
@@ -724,5 +986,8 @@ class ResilienceManager:
                 "burst": rl.burst,
                 "wait": rl.wait
             }
-            
+        
+        self._status_cache = status
+        self._status_time = now
+        self._status_versions = versions
         return status
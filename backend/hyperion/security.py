@@ -10,17 +10,52 @@ import base64
 import contextlib
 import hashlib
 import hmac
+import itertools
 import json
 import logging
 import os
+import re
 import secrets
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
+try:
+    from argon2 import PasswordHasher, Type as Argon2Type
+    from argon2.exceptions import InvalidHashError, VerificationError
+    HAS_ARGON2 = True
+except ImportError:
+    HAS_ARGON2 = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Prefix of Argon2 encoded hashes; older entries are hex PBKDF2 digests
+_ARGON2_PREFIX = "$argon2"
+
+# Format of message signatures: hex-encoded HMAC-SHA256, as sign_message emits
+_SIGNATURE_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+if HAS_ORJSON:
+    def _dump_config(config: Dict[str, Any]) -> bytes:
+        """Serialize the security configuration to indented UTF-8 JSON"""
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    
+    _load_config_bytes = orjson.loads
+else:
+    def _dump_config(config: Dict[str, Any]) -> bytes:
+        """Serialize the security configuration to indented UTF-8 JSON"""
+        return json.dumps(config, indent=2).encode('utf-8')
+    
+    _load_config_bytes = json.loads
+
 
 class Permission(Enum):
     """Permissions for authorization"""
@@ -58,10 +93,13 @@ class User:
             
         return permission in self.permissions
     
-    def generate_api_key(self, name: str, expires_in: Optional[int] = None) -> str:
+    def _generate_api_key(self, name: str, expires_in: Optional[int] = None) -> str:
         """
         Generate a new API key for this user
         
+        Keys are only found by SecurityManager.authenticate_with_key once
+        indexed, so use SecurityManager.generate_api_key instead.
+        
         Args:
             name: Key name for reference
             expires_in: Optional expiration time in seconds
@@ -142,9 +180,26 @@ class SecurityManager:
         """
         self.users = {}  # username -> User
         self.config_path = config_path
-        self.token_cache = {}  # token -> (username, expiry)
+        self.token_cache: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()  # token -> (username, expiry), LRU order
+        self._token_cache_max = 100_000
+        self._token_sweep_interval = 60.0
+        self._token_sweep_task: Optional[asyncio.Task] = None
         self.key_strength = 16  # For key generation
         
+        # Keyed-hash API key index: HMAC(api_key) -> username
+        self._index_key = secrets.token_bytes(32)
+        self._api_key_index: Dict[bytes, str] = {}
+        
+        # Argon2id hasher (OWASP parameters); PBKDF2 is used without argon2-cffi
+        self._password_hasher = None
+        if HAS_ARGON2:
+            self._password_hasher = PasswordHasher(
+                time_cost=3,
+                memory_cost=46 * 1024,
+                parallelism=max(1, (os.cpu_count() or 2) // 2),
+                type=Argon2Type.ID
+            )
+        
         # Default admin credentials for initial setup - should be changed
         self._create_default_admin()
         
@@ -175,8 +230,8 @@ class SecurityManager:
     def _load_config(self) -> None:
         """Load security configuration from file"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                config = _load_config_bytes(f.read())
                 
             # Load users
             for user_data in config.get("users", []):
@@ -195,6 +250,8 @@ class SecurityManager:
                 )
                 
                 self.users[username] = user
+            
+            self._rebuild_api_key_index()
                 
             logger.info(f"Loaded {len(self.users)} users from configuration")
             
@@ -228,11 +285,11 @@ class SecurityManager:
             
             # Save to file (atomic write)
             temp_path = f"{self.config_path}.tmp"
-            with open(temp_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            with open(temp_path, 'wb') as f:
+                f.write(_dump_config(config))
                 
-            # Rename to actual path (atomic operation)
-            os.rename(temp_path, self.config_path)
+            # Replace actual path (atomic, also when the target exists on Windows)
+            os.replace(temp_path, self.config_path)
             
             logger.info(f"Saved security configuration with {len(self.users)} users")
             
@@ -243,6 +300,10 @@ class SecurityManager:
         """
         Hash a password with a salt
         
+        New hashes use Argon2id when argon2-cffi is installed; the salt is then
+        embedded in the encoded hash and the returned salt is empty. Passing a
+        salt always computes the legacy PBKDF2 hash, for verifying old entries.
+        
         Args:
             password: Plain text password
             salt: Optional salt (generated if not provided)
@@ -250,6 +311,9 @@ class SecurityManager:
         Returns:
             Tuple of (password_hash, salt)
         """
+        if salt is None and self._password_hasher is not None:
+            return self._password_hasher.hash(password), ""
+        
         # Generate salt if not provided
         if salt is None:
             salt = secrets.token_hex(16)
@@ -327,32 +391,154 @@ class SecurityManager:
             
         user = self.users[username]
         
-        # Hash the provided password with the user's salt
-        password_hash, _ = self._hash_password(password, user.salt)
+        if user.password_hash.startswith(_ARGON2_PREFIX):
+            authenticated = self._verify_argon2(user, password)
+        else:
+            # Legacy PBKDF2 entry: hash the provided password with the user's salt
+            password_hash, _ = self._hash_password(password, user.salt)
+            authenticated = hmac.compare_digest(password_hash, user.password_hash)
+            
+            # Migrate to Argon2id now that the plain password is at hand
+            if authenticated and self._password_hasher is not None:
+                user.password_hash, user.salt = self._hash_password(password)
+                self._save_config()
         
-        # Compare with stored hash
-        if password_hash == user.password_hash:
+        if authenticated:
             logger.info(f"User '{username}' authenticated successfully")
             return True
         
         logger.warning(f"Authentication failed for user '{username}': Invalid password")
         return False
     
+    def _verify_argon2(self, user: User, password: str) -> bool:
+        """
+        Verify a password against a user's Argon2 hash
+        
+        Re-hashes the password if the stored hash uses outdated parameters.
+        
+        Args:
+            user: User with an Argon2 password hash
+            password: Plain text password
+            
+        Returns:
+            True if the password matches, False otherwise
+        """
+        hasher = self._password_hasher
+        if hasher is None:
+            logger.error(
+                f"Cannot verify Argon2 password hash for user '{user.username}': "
+                f"argon2-cffi is not installed"
+            )
+            return False
+        
+        try:
+            hasher.verify(user.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        
+        if hasher.check_needs_rehash(user.password_hash):
+            user.password_hash = hasher.hash(password)
+            self._save_config()
+        
+        return True
+    
+    def _api_key_digest(self, api_key: str) -> bytes:
+        """
+        Compute the index key for an API key
+        
+        Args:
+            api_key: API key
+            
+        Returns:
+            HMAC-SHA256 digest of the key under the per-process index key
+        """
+        return hmac.digest(self._index_key, api_key.encode(), 'sha256')
+    
+    def _rebuild_api_key_index(self) -> None:
+        """Rebuild the API key index from all users' unexpired keys"""
+        digest = self._api_key_digest
+        now = int(time.time())
+        self._api_key_index = {
+            digest(api_key): username
+            for username, user in self.users.items()
+            for api_key, key_info in user.api_keys.items()
+            if not key_info.get("expires_at") or key_info["expires_at"] >= now
+        }
+    
+    def generate_api_key(
+        self,
+        username: str,
+        name: str,
+        expires_in: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Generate a new API key for a user and index it
+        
+        Args:
+            username: Username
+            name: Key name for reference
+            expires_in: Optional expiration time in seconds
+            
+        Returns:
+            The generated API key or None if user not found
+        """
+        user = self.users.get(username)
+        if user is None:
+            logger.warning(f"API key generation failed: User '{username}' not found")
+            return None
+        
+        api_key = user._generate_api_key(name, expires_in)
+        self._api_key_index[self._api_key_digest(api_key)] = username
+        
+        self._save_config()
+        
+        logger.info(f"Generated API key '{name}' for user '{username}'")
+        
+        return api_key
+    
+    def revoke_api_key(self, api_key: str) -> bool:
+        """
+        Revoke an API key and remove it from the index
+        
+        Args:
+            api_key: API key to revoke
+            
+        Returns:
+            True if key was revoked, False if not found
+        """
+        username = self._api_key_index.pop(self._api_key_digest(api_key), None)
+        user = self.users.get(username) if username is not None else None
+        if user is None or not user.revoke_api_key(api_key):
+            return False
+        
+        self._save_config()
+        
+        logger.info(f"Revoked API key for user '{username}'")
+        
+        return True
+    
     def authenticate_with_key(self, api_key: str) -> Optional[str]:
         """
         Authenticate using an API key
         
+        Keys are looked up through the keyed-hash index. Index entries for
+        keys that have expired or no longer belong to the user are dropped.
+        
         Args:
             api_key: API key
             
         Returns:
             Username if authenticated, None otherwise
         """
-        # Check all users for matching API key
-        for username, user in self.users.items():
-            if user.is_api_key_valid(api_key):
+        digest = self._api_key_digest(api_key)
+        username = self._api_key_index.get(digest)
+        
+        if username is not None:
+            user = self.users.get(username)
+            if user is not None and user.is_api_key_valid(api_key):
                 logger.info(f"User '{username}' authenticated with API key")
                 return username
+            del self._api_key_index[digest]
                 
         logger.warning("API key authentication failed: Invalid key")
         return None
@@ -377,8 +563,12 @@ class SecurityManager:
         token = secrets.token_urlsafe(32)
         expiry = int(time.time()) + expires_in
         
-        # Store in token cache
-        self.token_cache[token] = (username, expiry)
+        # Store in token cache, evicting the least recently used token when full
+        token_cache = self.token_cache
+        token_cache[token] = (username, expiry)
+        if len(token_cache) > self._token_cache_max:
+            token_cache.popitem(last=False)
+        self._start_token_sweep()
         
         logger.info(f"Generated token for user '{username}', valid for {expires_in}s")
         
@@ -395,16 +585,19 @@ class SecurityManager:
             Username if token is valid, None otherwise
         """
         # Check if token exists in cache
-        if token not in self.token_cache:
+        entry = self.token_cache.get(token)
+        if entry is None:
             return None
             
-        username, expiry = self.token_cache[token]
+        username, expiry = entry
         
         # Check if token has expired
         if expiry < int(time.time()):
             # Remove expired token
             del self.token_cache[token]
             return None
+        
+        self.token_cache.move_to_end(token)
             
         return username
     
@@ -512,8 +705,67 @@ class SecurityManager:
             # Log end of elevation
             logger.info("Permission elevation ended")
     
+    def sweep_expired_tokens(self, fraction: float = 0.01) -> int:
+        """
+        Drop expired tokens from the least recently used end of the cache
+        
+        Args:
+            fraction: Fraction of the cache to scan
+            
+        Returns:
+            Number of tokens removed
+        """
+        token_cache = self.token_cache
+        count = int(len(token_cache) * fraction) + 1
+        now = int(time.time())
+        
+        expired = [
+            token for token, (_, expiry) in itertools.islice(token_cache.items(), count)
+            if expiry < now
+        ]
+        for token in expired:
+            del token_cache[token]
+            
+        if expired:
+            logger.debug("Swept %d expired tokens", len(expired))
+            
+        return len(expired)
+    
+    def _start_token_sweep(self) -> None:
+        """Start the background token sweep if an event loop is running"""
+        task = self._token_sweep_task
+        if task is not None and not task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to sweep on; the LRU bound still caps the cache
+            return
+        self._token_sweep_task = loop.create_task(self._token_sweep_loop())
+    
+    async def _token_sweep_loop(self) -> None:
+        """Periodically sweep expired tokens"""
+        while True:
+            await asyncio.sleep(self._token_sweep_interval)
+            self.sweep_expired_tokens()
+    
+    async def stop_token_sweep(self) -> None:
+        """Stop the background token sweep task"""
+        task = self._token_sweep_task
+        if task is None:
+            return
+        self._token_sweep_task = None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
     async def rotate_keys(self) -> None:
         """Rotate security keys periodically"""
+        # Start the token expiry sweep alongside key rotation
+        self._start_token_sweep()
+            
         # In a real implementation, this would rotate encryption keys
         logger.info("Security keys rotated")
 
@@ -688,6 +940,28 @@ class SecureCommunication:
         """
         self.secret_key = secret_key or secrets.token_hex(32)
     
+    @property
+    def secret_key(self) -> str:
+        """Secret key for HMAC"""
+        return self._secret_key
+    
+    @secret_key.setter
+    def secret_key(self, value: str) -> None:
+        self._secret_key = value
+        self._secret_key_bytes = value.encode('utf-8')
+    
+    def _digest(self, message: str) -> bytes:
+        """
+        Compute the raw HMAC-SHA256 digest of a message
+        
+        Args:
+            message: Message to sign
+            
+        Returns:
+            Digest bytes
+        """
+        return hmac.digest(self._secret_key_bytes, message.encode('utf-8'), 'sha256')
+    
     def sign_message(self, message: str) -> str:
         """
         Sign a message with HMAC
@@ -698,13 +972,7 @@ class SecureCommunication:
         Returns:
             Signature as a hex string
         """
-        signature = hmac.new(
-            self.secret_key.encode('utf-8'),
-            message.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        
-        return signature
+        return self._digest(message).hex()
     
     def verify_signature(self, message: str, signature: str) -> bool:
         """
@@ -717,8 +985,11 @@ class SecureCommunication:
         Returns:
             True if signature is valid, False otherwise
         """
-        expected_signature = self.sign_message(message)
-        return hmac.compare_digest(expected_signature, signature)
+        # bytes.fromhex alone would also accept whitespace and uppercase
+        if not isinstance(signature, str) or not _SIGNATURE_PATTERN.fullmatch(signature):
+            return False
+            
+        return hmac.compare_digest(self._digest(message), bytes.fromhex(signature))
     
     def secure_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,129 @@
+"""
+Tests for the integration module
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import types
+import unittest
+from unittest import mock
+
+from hyperion import integration
+from hyperion.integration import CustomIntegration, IntegrationManager
+
+
+class _FakeRequests:
+    """Stand-in for the requests module that records each call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, data=None, headers=None, auth=None):
+        self.calls.append({
+            'url': url,
+            'data': data,
+            'headers': headers,
+            'thread': threading.current_thread().name
+        })
+        return types.SimpleNamespace(status_code=200, text='')
+
+    put = post
+
+
+def _custom(**config):
+    """Create a custom integration with a logs endpoint"""
+    config.setdefault('logs_url', 'http://collector.invalid/logs')
+    with mock.patch.object(integration, 'HAS_REQUESTS', True):
+        return CustomIntegration('custom', config)
+
+
+class TestPayloadEncoding(unittest.TestCase):
+    """Test cases for custom endpoint payload encoding"""
+
+    payload = {'timestamp': 1, 'logs': [{'message': 'x' * 100}] * 10}
+
+    def test_uncompressed(self):
+        """Test that payloads are plain JSON without compression"""
+        body = _custom()._encode_body(self.payload)
+        self.assertEqual(json.loads(body), self.payload)
+
+    def test_gzip(self):
+        """Test that gzip payloads round-trip"""
+        body = _custom(compression='gzip')._encode_body(self.payload)
+        self.assertEqual(json.loads(gzip.decompress(body)), self.payload)
+
+    @unittest.skipUnless(integration.HAS_ZSTD, "zstandard is required")
+    def test_zstd(self):
+        """Test that zstd payloads round-trip"""
+        body = _custom(compression='zstd')._encode_body(self.payload)
+        decoded = integration.zstandard.ZstdDecompressor().decompress(body)
+        self.assertEqual(json.loads(decoded), self.payload)
+
+    def test_unsupported_compression(self):
+        """Test that an unknown compression falls back to plain JSON"""
+        custom = _custom(compression='brotli')
+        self.assertIsNone(custom.compression)
+        self.assertEqual(json.loads(custom._encode_body(self.payload)), self.payload)
+
+
+@mock.patch.object(integration, 'HAS_REQUESTS', True)
+class TestLogOffload(unittest.TestCase):
+    """Test cases for sending large log batches from the encoder thread"""
+
+    def setUp(self):
+        self.requests = _FakeRequests()
+        patcher = mock.patch.object(integration, 'requests', self.requests, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_small_batch_sent_inline(self):
+        """Test that small batches are sent without the encoder thread"""
+        custom = _custom(encode_offload_threshold=10)
+
+        self.assertTrue(asyncio.run(custom.send_logs([{'message': 'a'}])))
+
+        self.assertIsNone(custom._encoder_pool)
+        self.assertEqual(self.requests.calls[0]['thread'], threading.current_thread().name)
+
+    def test_large_batch_sent_from_encoder_thread(self):
+        """Test that encoding and sending a large batch share the encoder thread"""
+        custom = _custom(encode_offload_threshold=1, compression='gzip')
+        logs = [{'message': 'a'}, {'message': 'b'}]
+
+        self.assertTrue(asyncio.run(custom.send_logs(logs)))
+        custom.shutdown()
+
+        call = self.requests.calls[0]
+        self.assertTrue(call['thread'].startswith('custom-encoder'))
+        self.assertEqual(call['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(call['data']))['logs'], logs)
+
+    def test_unsupported_method(self):
+        """Test that an unsupported method fails without sending"""
+        custom = _custom(method='PATCH')
+
+        self.assertFalse(asyncio.run(custom.send_logs([{'message': 'a'}])))
+        self.assertEqual(self.requests.calls, [])
+
+    def test_shutdown_all_waits_for_encoder(self):
+        """Test that shutting down the manager releases the encoder thread"""
+        manager = IntegrationManager()
+        custom = manager.integrations['custom'] = _custom(encode_offload_threshold=0)
+
+        async def run():
+            await custom.send_logs([{'message': 'a'}])
+            pool = custom._encoder_pool
+            await manager.shutdown_all()
+            return pool
+
+        pool = asyncio.run(run())
+
+        self.assertIsNone(custom._encoder_pool)
+        self.assertTrue(pool._shutdown)
+        self.assertFalse(any(thread.is_alive() for thread in pool._threads))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for the lifecycle module
+"""
+
+import asyncio
+import unittest
+
+from hyperion.lifecycle import ShutdownManager, StartupManager
+
+
+async def _initialize():
+    """Component initializer that always succeeds"""
+    return True
+
+
+async def _fail():
+    """Component initializer or shutdown handler that always fails"""
+    raise RuntimeError("boom")
+
+
+async def _hang():
+    """Component initializer or shutdown handler that never finishes in time"""
+    await asyncio.sleep(10)
+
+
+class TestStartupDependencyCycles(unittest.TestCase):
+    """Test cases for circular dependency detection in StartupManager"""
+
+    def _manager(self, graph):
+        """Create a startup manager with one component per graph entry"""
+        manager = StartupManager()
+        for name, dependencies in graph.items():
+            manager.register_component(name, _initialize, dependencies=dependencies)
+        return manager
+
+    def test_cycle_closing_through_finished_component(self):
+        """Test a cycle that is only closed through an already visited component"""
+        manager = self._manager({
+            'A': ['B'],
+            'B': ['C', 'D'],
+            'C': ['A'],
+            'D': ['C'],
+        })
+
+        self.assertEqual(manager._find_circular_dependencies(), {'A', 'B', 'C', 'D'})
+        self.assertTrue(manager._has_circular_dependency('D'))
+
+    def test_dependents_of_cycle(self):
+        """Test that components depending on a cycle are reported, others are not"""
+        manager = self._manager({
+            'A': ['B'],
+            'B': ['A'],
+            'E': ['A'],
+            'F': ['G'],
+            'G': [],
+        })
+
+        self.assertEqual(manager._find_circular_dependencies(), {'A', 'B', 'E'})
+        self.assertFalse(manager._has_circular_dependency('F'))
+        self.assertLess(manager._topo_order.index('G'), manager._topo_order.index('F'))
+
+    def test_self_dependency(self):
+        """Test that a component depending on itself is reported"""
+        manager = self._manager({'A': ['A'], 'B': []})
+
+        self.assertEqual(manager._find_circular_dependencies(), {'A'})
+
+    def test_initialize_all_logs_cycle(self):
+        """Test that startup reports every component blocked by a cycle"""
+        manager = self._manager({
+            'A': ['B'],
+            'B': ['C', 'D'],
+            'C': ['A'],
+            'D': ['C'],
+            'E': [],
+        })
+
+        with self.assertLogs('hyperion.lifecycle', level='ERROR') as logs:
+            result = asyncio.run(manager.initialize_all())
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['initialized'], ['E'])
+        for name in 'ABCD':
+            self.assertTrue(
+                any(f"component '{name}'" in line for line in logs.output),
+                f"no circular dependency error for {name}"
+            )
+
+
+class TestResultShapes(unittest.TestCase):
+    """Test cases for the result dictionaries reported by the managers"""
+
+    def test_startup_results(self):
+        """Test that each startup status reports only its own keys"""
+        manager = StartupManager()
+        manager.register_component('ok', _initialize)
+        manager.register_component('failing', _fail, required=False)
+        manager.register_component('slow', _hang, required=False, timeout=0.01)
+        manager.register_component('orphan', _initialize, dependencies=['missing'], required=False)
+
+        async def run():
+            results = (await manager.initialize_all())['results']
+            # Components with unknown dependencies are only reached directly
+            await manager._initialize_component('orphan')
+            results['orphan'] = manager.startup_results['orphan'].to_dict()
+            return results
+
+        results = asyncio.run(run())
+
+        self.assertEqual(results['ok'], {'status': 'success', 'elapsed': results['ok']['elapsed'], 'result': True})
+        self.assertEqual(results['slow'], {'status': 'timeout', 'timeout': 0.01})
+        self.assertEqual(results['orphan'], {'status': 'error', 'error': "Missing dependency 'missing'"})
+        self.assertEqual(set(results['failing']), {'status', 'error', 'traceback'})
+        self.assertEqual(results['failing']['error'], 'boom')
+        self.assertIn('RuntimeError: boom', results['failing']['traceback'])
+
+    def test_shutdown_results(self):
+        """Test that each shutdown status reports only its own keys"""
+        async def run():
+            manager = ShutdownManager()
+            manager.register(_initialize, priority=3, name='ok')
+            manager.register(_fail, priority=2, name='failing')
+            manager.register(_hang, priority=1, name='slow', timeout=0.01)
+            return await manager.execute_shutdown()
+
+        results = {result['name']: result for result in asyncio.run(run())['results']}
+
+        self.assertEqual(set(results['ok']), {'name', 'status', 'elapsed'})
+        self.assertEqual(results['ok']['status'], 'success')
+        self.assertEqual(results['slow'], {'name': 'slow', 'status': 'timeout', 'timeout': 0.01})
+        self.assertEqual(set(results['failing']), {'name', 'status', 'error', 'traceback'})
+        self.assertIn('RuntimeError: boom', results['failing']['traceback'])
+
+
+if __name__ == '__main__':
+    unittest.main()
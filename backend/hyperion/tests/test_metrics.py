@@ -0,0 +1,168 @@
+"""
+Tests for the metrics module
+"""
+
+import json
+import types
+import unittest
+from unittest import mock
+
+from hyperion import metrics
+from hyperion.metrics import CounterHistory, MetricHistory, MetricsCollector, _prometheus_prefix
+
+
+def _monitor(cpu=0.5, memory=0.25, workers=4, network=None):
+    """Create a minimal monitor exposing the attributes the collector reads"""
+    return types.SimpleNamespace(
+        _current_cpu=cpu,
+        _current_mem=memory,
+        current_workers=workers,
+        _current_state='normal',
+        environment='server',
+        _metrics={'network': network} if network else {}
+    )
+
+
+class _RingBufferTests:
+    """Ring buffer test cases run against each storage backend"""
+
+    use_numpy = True
+
+    def setUp(self):
+        patcher = mock.patch.object(metrics, 'HAS_NUMPY', self.use_numpy and metrics.HAS_NUMPY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_metric_history_wraps(self):
+        """Test that a full buffer keeps the newest samples in order"""
+        history = MetricHistory(3)
+        for i in range(5):
+            history.record(float(i), i * 10)
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.to_list(), [(2.0, 20), (3.0, 30), (4.0, 40)])
+        self.assertEqual(history.last_value(), 40)
+        self.assertEqual(history.summary(), {'min': 20, 'max': 40, 'avg': 30})
+
+    def test_metric_history_empty(self):
+        """Test an empty buffer"""
+        history = MetricHistory(3)
+
+        self.assertIsNone(history.last_value())
+        self.assertEqual(history.summary(), {})
+
+    def test_counter_history_peaks(self):
+        """Test the peak per-interval increase of each counter"""
+        history = CounterHistory(3, ('sent', 'recv'))
+        history.record(0.0, 100, 10)
+        self.assertEqual(history.summary(), {})
+
+        for i, (sent, recv) in enumerate([(150, 20), (160, 60), (300, 70)], start=1):
+            history.record(float(i), sent, recv)
+
+        self.assertEqual(history.to_list(), [(1.0, 150, 20), (2.0, 160, 60), (3.0, 300, 70)])
+        self.assertEqual(history.summary(), {'peak_sent': 140, 'peak_recv': 40})
+
+    def test_counter_reset(self):
+        """Test that a counter going backwards adds no increase"""
+        history = CounterHistory(4, ('sent', 'recv'))
+        history.record(0.0, 5000, 5000)
+        history.record(1.0, 5100, 5000)
+        history.record(2.0, 20, 10)
+        history.record(3.0, 50, 10)
+
+        self.assertEqual(history.summary(), {'peak_sent': 100, 'peak_recv': 0})
+
+
+@unittest.skipUnless(metrics.HAS_NUMPY, "numpy is required")
+class TestRingBuffersNumpy(_RingBufferTests, unittest.TestCase):
+    """Ring buffer test cases for the NumPy backend"""
+
+
+class TestRingBuffersFallback(_RingBufferTests, unittest.TestCase):
+    """Ring buffer test cases for the deque backend"""
+
+    use_numpy = False
+
+
+class TestPrometheusExport(unittest.TestCase):
+    """Test cases for the generated Prometheus exporter"""
+
+    def test_core_and_custom_gauges(self):
+        """Test that the exporter reports current values and new metrics"""
+        collector = MetricsCollector(max_history=10)
+        collector.collect_all_metrics(_monitor(cpu=0.5, workers=4), timestamp=1.0)
+
+        text = collector.export_prometheus()
+        self.assertIn('# TYPE hyperion_cpu_usage gauge\nhyperion_cpu_usage 0.5\n', text)
+        self.assertIn('\nhyperion_workers 4\n', text)
+
+        # Values are read live by the same exporter
+        exporter = collector._prometheus_exporter
+        collector.update_metric('cpu', 'current', 0.75)
+        self.assertIn('\nhyperion_cpu_usage 0.75\n', collector.export_prometheus())
+        self.assertIs(collector._prometheus_exporter, exporter)
+
+        # Registering a metric regenerates the exporter
+        collector.register_custom_metric('queue depth', lambda: 7, description='Jobs\nwaiting')
+        collector.collect_all_metrics(_monitor(), timestamp=2.0)
+        text = collector.export_prometheus()
+        self.assertIsNot(collector._prometheus_exporter, exporter)
+        self.assertIn('# HELP hyperion_custom_queue_depth Jobs\\nwaiting\n', text)
+        self.assertIn('\nhyperion_custom_queue_depth 7\n', text)
+
+    def test_prefix_sanitizing(self):
+        """Test metric name sanitizing and HELP escaping"""
+        self.assertEqual(
+            _prometheus_prefix('9req/s.total', 'C:\\path\nnext'),
+            '# HELP _9req_s_total C:\\\\path\\nnext\n'
+            '# TYPE _9req_s_total gauge\n'
+            '_9req_s_total '
+        )
+        self.assertTrue(_prometheus_prefix('ns:name_1', '').endswith('\nns:name_1 '))
+
+
+class TestJsonExport(unittest.TestCase):
+    """Test cases for JSON export"""
+
+    def setUp(self):
+        self.collector = MetricsCollector(max_history=10)
+        self.collector.register_custom_metric('jobs', lambda: 3)
+        self.collector.collect_all_metrics(
+            _monitor(network={'sent': 100, 'recv': 50}), timestamp=1.0
+        )
+        self.collector.collect_all_metrics(
+            _monitor(network={'sent': 400, 'recv': 60}), timestamp=2.0
+        )
+
+    def test_export_json(self):
+        """Test that the export contains current values, stats and history"""
+        data = json.loads(self.collector.export_json())
+
+        self.assertEqual(data['metrics']['cpu']['current'], 0.5)
+        self.assertEqual(data['metrics']['network']['stats'], {'peak_sent': 300, 'peak_recv': 10})
+        self.assertEqual(data['metrics']['custom']['jobs']['current'], 3)
+        self.assertEqual(len(data['history']), 2)
+        self.assertEqual(data['history'][-1]['custom_jobs'], 3)
+        self.assertEqual(data['history'][-1]['timestamp'], 2.0)
+
+    def test_export_given_report(self):
+        """Test that a previously generated report is serialized as is"""
+        report = self.collector.generate_report(include_history=False)
+        self.collector.update_metric('cpu', 'current', 0.9)
+
+        data = json.loads(self.collector.export_json_bytes(report=report))
+
+        self.assertEqual(data['metrics']['cpu']['current'], 0.5)
+        self.assertNotIn('history', data)
+
+    def test_pretty(self):
+        """Test indented output"""
+        text = self.collector.export_json(pretty=True)
+
+        self.assertIn('\n  "timestamp"', text)
+        self.assertEqual(json.loads(text)['metrics']['cpu']['current'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
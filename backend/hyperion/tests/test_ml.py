@@ -0,0 +1,59 @@
+"""
+Tests for the ml module
+"""
+
+import random
+import time
+import unittest
+
+from hyperion.ml import HAS_NUMPY, HAS_SKLEARN, MLIntegration
+
+
+def _historical_data(count=300):
+    """Generate reproducible historical metric points"""
+    rng = random.Random(1)
+    start = time.time() - count * 3
+    return [
+        {
+            'timestamp': start + i * 3,
+            'cpu': 0.3 + 0.2 * rng.random(),
+            'memory': 0.4 + 0.1 * rng.random(),
+            'workers': rng.randint(2, 8),
+            'state': 'normal',
+            'environment': 'server'
+        }
+        for i in range(count)
+    ]
+
+
+@unittest.skipUnless(HAS_NUMPY and HAS_SKLEARN, "numpy and scikit-learn are required")
+class TestMLRecommendations(unittest.TestCase):
+    """Test cases for single and batched ML recommendations"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Train the models once for all tests"""
+        cls.ml = MLIntegration()
+        cls.ml.initialize(_historical_data())
+
+    def test_batch_matches_single(self):
+        """Test that batched recommendations equal the single-sample ones"""
+        rng = random.Random(2)
+        snapshots = [
+            {'cpu': rng.random(), 'memory': rng.random()}
+            for _ in range(200)
+        ]
+        snapshots.extend([{'cpu': 0.4449}, {'memory': 0.9951}, {}])
+
+        batch = self.ml.get_ml_recommendations_batch(snapshots)
+        single = [self.ml.get_ml_recommendations(snapshot) for snapshot in snapshots]
+
+        for batched, expected in zip(batch, single):
+            # The forecast depends on the time of the call
+            batched.pop('future_usage', None)
+            expected.pop('future_usage', None)
+            self.assertEqual(batched, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,264 @@
+"""
+Tests for the observability module
+"""
+
+import asyncio
+import dataclasses
+import datetime
+import unittest
+import uuid
+
+from hyperion import observability
+from hyperion.observability import (
+    NOOP_SPAN, NOOP_TRACE, ObservabilityManager, SpanExportQueue, TraceContext,
+    _is_serializable, current_span, current_trace, trace
+)
+
+
+@dataclasses.dataclass
+class _Point:
+    x: int
+    y: int
+
+
+class _TracingConfigMixin:
+    """Restore the process-wide tracing configuration after each test"""
+
+    def setUp(self):
+        saved = (
+            ObservabilityManager.tracing_enabled,
+            ObservabilityManager.sampling_rate,
+            ObservabilityManager.follow_only
+        )
+
+        def restore():
+            (
+                ObservabilityManager.tracing_enabled,
+                ObservabilityManager.sampling_rate,
+                ObservabilityManager.follow_only
+            ) = saved
+
+        self.addCleanup(restore)
+
+
+class TestNoopTracing(_TracingConfigMixin, unittest.TestCase):
+    """Test cases for the no-op fast path of unrecorded traces"""
+
+    def test_unsampled_trace(self):
+        """Test that an unsampled trace and everything nested in it is a no-op"""
+        ObservabilityManager.configure_tracing(sampling_rate=0.0)
+
+        with TraceContext('request') as (trace_obj, span):
+            self.assertIs(trace_obj, NOOP_TRACE)
+            self.assertIs(span, NOOP_SPAN)
+            self.assertFalse(trace_obj)
+            self.assertFalse(span)
+            self.assertIs(current_trace.get(), NOOP_TRACE)
+
+            # Nested contexts stay unsampled even if sampling is turned back on
+            ObservabilityManager.configure_tracing(sampling_rate=1.0)
+            with TraceContext('child') as (_, child):
+                self.assertIs(child, NOOP_SPAN)
+            span.add_metadata('key', 'value')
+            span.add_event('event')
+
+        self.assertIsNone(current_trace.get())
+        self.assertIsNone(NOOP_SPAN.metadata)
+        self.assertIsNone(NOOP_SPAN.events)
+
+    def test_tracing_disabled(self):
+        """Test that disabled tracing sets no trace context"""
+        ObservabilityManager.configure_tracing(enabled=False)
+
+        with TraceContext('request') as (trace_obj, span):
+            self.assertIs(span, NOOP_SPAN)
+            self.assertIsNone(current_trace.get())
+
+    def test_sampled_trace(self):
+        """Test that a sampled trace records real spans"""
+        ObservabilityManager.configure_tracing(enabled=True, sampling_rate=1.0)
+
+        with TraceContext('request') as (trace_obj, span):
+            with TraceContext('child') as (_, child):
+                pass
+
+        self.assertTrue(span)
+        self.assertEqual(child.parent_span_id, span.span_id)
+        self.assertEqual(trace_obj.to_dict()['spans'][1]['name'], 'child')
+        self.assertIsNone(current_trace.get())
+
+
+class TestSpanExportQueue(unittest.TestCase):
+    """Test cases for the background span export queue"""
+
+    def test_batches_when_full(self):
+        """Test that a full batch is exported without waiting for the interval"""
+        batches = []
+
+        async def run():
+            queue = SpanExportQueue(batches.append, batch_size=2, flush_interval=60)
+            await queue.start()
+            queue.enqueue(['a', 'b', 'c'])
+            await asyncio.sleep(0.01)
+            exported = list(batches)
+            await queue.stop()
+            return exported
+
+        self.assertEqual(asyncio.run(run()), [['a', 'b'], ['c']])
+
+    def test_flush_interval(self):
+        """Test that a partial batch is exported once the interval elapses"""
+        batches = []
+
+        async def run():
+            queue = SpanExportQueue(batches.append, batch_size=10, flush_interval=0.01)
+            await queue.start()
+            queue.enqueue(['a'])
+            await asyncio.sleep(0.05)
+            exported = list(batches)
+            await queue.stop()
+            return exported
+
+        self.assertEqual(asyncio.run(run()), [['a']])
+
+    def test_stop_finishes_batch_in_flight(self):
+        """Test that stopping during an export neither loses nor repeats spans"""
+        exported = []
+
+        async def run():
+            started = asyncio.Event()
+            release = asyncio.Event()
+
+            async def exporter(batch):
+                started.set()
+                await release.wait()
+                exported.extend(batch)
+
+            queue = SpanExportQueue(exporter, batch_size=2, flush_interval=60)
+            await queue.start()
+            queue.enqueue(['a', 'b', 'c'])
+            await started.wait()
+
+            stop = asyncio.create_task(queue.stop())
+            await asyncio.sleep(0.01)
+            self.assertFalse(stop.done())
+            release.set()
+            await stop
+
+        asyncio.run(run())
+        self.assertEqual(exported, ['a', 'b', 'c'])
+
+    def test_exporter_error_drops_batch(self):
+        """Test that a failing export is logged and later batches still go out"""
+        batches = []
+
+        def exporter(batch):
+            if batch == ['a']:
+                raise ConnectionError("collector down")
+            batches.append(batch)
+
+        async def run():
+            queue = SpanExportQueue(exporter, batch_size=1, flush_interval=60)
+            await queue.start()
+            queue.enqueue(['a'])
+            await asyncio.sleep(0.01)
+            queue.enqueue(['b'])
+            await queue.stop()
+
+        with self.assertLogs('hyperion.observability', level='ERROR'):
+            asyncio.run(run())
+        self.assertEqual(batches, [['b']])
+
+    def test_ended_traces_are_exported(self):
+        """Test that ending a trace queues its spans for the exporter"""
+        batches = []
+        manager = ObservabilityManager('test')
+
+        async def run():
+            await manager.init_opentelemetry_export(batches.append, batch_size=100)
+            with TraceContext('request'):
+                with TraceContext('child'):
+                    pass
+            await manager.shutdown_export()
+
+        asyncio.run(run())
+        self.assertIsNone(observability._export_queue)
+        names = [span.name for batch in batches for span in batch]
+        self.assertIn('request', names)
+        self.assertIn('child', names)
+
+
+class TestArgumentCapture(unittest.TestCase):
+    """Test cases for recording @trace arguments as span metadata"""
+
+    def test_is_serializable(self):
+        """Test that only values the json module accepts are serializable"""
+        for value in ('text', 3, 2.5, True, None, [1, 'a'], {'a': [1, {'b': None}]}):
+            self.assertTrue(_is_serializable(value), value)
+        for value in (
+            _Point(1, 2), datetime.datetime(2024, 1, 1), uuid.UUID(int=1),
+            {1, 2}, b'bytes', [object()], {(1, 2): 'tuple key'}
+        ):
+            self.assertFalse(_is_serializable(value), value)
+
+    def test_span_metadata(self):
+        """Test that unserializable and sensitive arguments are not recorded as is"""
+        @trace("capture")
+        def capture(count, point, when, password):
+            return current_span.get().metadata
+
+        metadata = capture(3, _Point(1, 2), datetime.date(2024, 1, 1), password='hunter2')
+
+        self.assertEqual(metadata, {
+            'count': 3,
+            'point': '<_Point>',
+            'when': '<date>',
+            'password': '***'
+        })
+
+
+class TestFollowOnlyTracing(_TracingConfigMixin, unittest.TestCase):
+    """Test cases for the follow-only trace mode"""
+
+    def setUp(self):
+        super().setUp()
+        ObservabilityManager.configure_tracing(enabled=True, sampling_rate=1.0, mode='follow_only')
+
+    def test_untraced_caller(self):
+        """Test that @trace starts no trace outside an existing one"""
+        @trace("work")
+        def work():
+            return current_trace.get(), current_span.get()
+
+        self.assertEqual(work(), (None, None))
+
+    def test_untraced_async_caller(self):
+        """Test that async @trace functions start no trace outside an existing one"""
+        @trace("work")
+        async def work():
+            return current_trace.get()
+
+        self.assertIsNone(asyncio.run(work()))
+
+    def test_follows_existing_trace(self):
+        """Test that @trace records a child span inside an existing trace"""
+        @trace("work")
+        def work(size):
+            return current_span.get()
+
+        with TraceContext('request') as (trace_obj, root):
+            span = work(5)
+
+        self.assertEqual(span.trace_id, trace_obj.trace_id)
+        self.assertEqual(span.parent_span_id, root.span_id)
+        self.assertEqual(span.metadata, {'size': 5})
+
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected"""
+        with self.assertRaises(ValueError):
+            ObservabilityManager.configure_tracing(mode='sometimes')
+        self.assertTrue(ObservabilityManager.follow_only)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,386 @@
+"""
+Tests for the resilience module
+"""
+
+import asyncio
+import math
+import random
+import unittest
+from unittest import mock
+
+from hyperion import resilience
+from hyperion.resilience import (
+    AdaptiveBackoff, CircuitBreaker, CircuitOpenError, FailureDetector, RateLimiter,
+    RateLimitError, TransientError
+)
+
+# Unpatched sleep, for yielding to other tasks while retry sleeps are patched
+_sleep = asyncio.sleep
+
+
+def _flaky(failures, exc=TransientError):
+    """Create an async function that fails a number of times, then succeeds"""
+    calls = []
+
+    async def func():
+        calls.append(None)
+        if len(calls) <= failures:
+            raise exc("temporary")
+        return len(calls)
+
+    return func, calls
+
+
+class TestAdaptiveBackoff(unittest.TestCase):
+    """Test cases for retry delays and per-operation state"""
+
+    def setUp(self):
+        self.delays = []
+
+        async def sleep(delay):
+            self.delays.append(delay)
+
+        patcher = mock.patch.object(resilience.asyncio, 'sleep', sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_decorrelated_jitter(self):
+        """Test that each delay lies between initial and three times the last one"""
+        backoff = AdaptiveBackoff(initial=0.1, maximum=2.0, max_attempts=50)
+        func, _ = _flaky(40)
+
+        self.assertEqual(asyncio.run(backoff.execute_with_backoff(func)), 41)
+
+        previous = 0.1
+        for delay in self.delays:
+            self.assertGreaterEqual(delay, 0.1)
+            self.assertLessEqual(delay, min(previous * 3.0, 2.0))
+            previous = delay
+        self.assertEqual(len(self.delays), 40)
+        self.assertEqual(backoff._ops, {})
+
+    def test_schedule_without_jitter(self):
+        """Test the doubling schedule, clamped at the maximum"""
+        backoff = AdaptiveBackoff(initial=0.5, maximum=3.0, max_attempts=6, jitter='none')
+        func, _ = _flaky(5)
+
+        asyncio.run(backoff.execute_with_backoff(func))
+
+        self.assertEqual(self.delays, [0.5, 1.0, 2.0, 3.0, 3.0])
+
+    def test_full_and_equal_jitter(self):
+        """Test that jittered delays stay under the schedule ceiling"""
+        for jitter, lower in (('full', 0.0), ('equal', 0.5)):
+            self.delays.clear()
+            backoff = AdaptiveBackoff(initial=1.0, maximum=4.0, factor=3.0, jitter=jitter)
+            func, _ = _flaky(4)
+
+            asyncio.run(backoff.execute_with_backoff(func))
+
+            for delay, ceiling in zip(self.delays, (1.0, 3.0, 4.0, 4.0)):
+                self.assertGreaterEqual(delay, ceiling * lower)
+                self.assertLessEqual(delay, ceiling)
+
+    def test_max_attempts(self):
+        """Test that retries stop after max_attempts and state is cleared"""
+        backoff = AdaptiveBackoff(max_attempts=3)
+        func, calls = _flaky(10)
+
+        with self.assertRaisesRegex(Exception, "Max retry attempts"):
+            asyncio.run(backoff.execute_with_backoff(func, operation_id='op'))
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(backoff._ops, {})
+
+    def test_non_retryable_error(self):
+        """Test that other exceptions are raised without retrying"""
+        backoff = AdaptiveBackoff()
+        func, calls = _flaky(1, exc=KeyError)
+
+        with self.assertRaises(KeyError):
+            asyncio.run(backoff.execute_with_backoff(func))
+        self.assertEqual(len(calls), 1)
+
+    def test_unknown_jitter(self):
+        """Test that an unknown jitter mode is rejected"""
+        with self.assertRaises(ValueError):
+            AdaptiveBackoff(jitter='random')
+
+    def test_tracked_operations_lru(self):
+        """Test that retry state is kept for at most max_tracked operations"""
+        backoff = AdaptiveBackoff(max_tracked=2)
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def sleep(delay):
+                await gate.wait()
+
+            with mock.patch.object(resilience.asyncio, 'sleep', sleep):
+                tasks = []
+                for name in ('a', 'b', 'c'):
+                    func, _ = _flaky(1)
+                    tasks.append(asyncio.ensure_future(
+                        backoff.execute_with_backoff(func, operation_id=name)
+                    ))
+                    await _sleep(0)
+                tracked = list(backoff._ops)
+                gate.set()
+                await asyncio.gather(*tasks)
+            return tracked
+
+        self.assertEqual(asyncio.run(run()), ['b', 'c'])
+        self.assertEqual(backoff._ops, {})
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for circuit breaker state transitions and bulkheads"""
+
+    def setUp(self):
+        self.clock = 0.0
+
+    def _breaker(self, **kwargs):
+        """Create a circuit breaker on the test clock"""
+        breaker = CircuitBreaker('test', **kwargs)
+        breaker._now = lambda: self.clock
+        return breaker
+
+    @staticmethod
+    async def _succeed():
+        return 'ok'
+
+    @staticmethod
+    async def _fail():
+        raise ConnectionError("down")
+
+    def test_open_half_open_close(self):
+        """Test that the circuit opens, probes and closes after enough successes"""
+        breaker = self._breaker(failure_threshold=2, reset_timeout=10, success_threshold=2)
+
+        async def run():
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    await breaker.execute(self._fail)
+            self.assertEqual(breaker.state, 'open')
+            with self.assertRaises(CircuitOpenError):
+                await breaker.execute(self._succeed)
+
+            self.clock = 11.0
+            self.assertEqual(await breaker.execute(self._succeed), 'ok')
+            self.assertEqual(breaker.state, 'half-open')
+            self.assertEqual(await breaker.execute(self._succeed), 'ok')
+            self.assertEqual(breaker.state, 'closed')
+            self.assertTrue(breaker._fast_closed)
+            self.assertEqual(breaker.failure_count, 0)
+
+        asyncio.run(run())
+
+    def test_half_open_failure_reopens(self):
+        """Test that a failed probe opens the circuit again"""
+        breaker = self._breaker(failure_threshold=1, reset_timeout=10)
+
+        async def run():
+            with self.assertRaises(ConnectionError):
+                await breaker.execute(self._fail)
+            self.clock = 11.0
+            with self.assertRaises(ConnectionError):
+                await breaker.execute(self._fail)
+            self.assertEqual(breaker.state, 'open')
+            self.assertEqual(breaker.get_state()['time_until_reset'], 10)
+
+        asyncio.run(run())
+
+    def test_half_open_probe_limit(self):
+        """Test that only half_open_max_calls probes run at once"""
+        breaker = self._breaker(failure_threshold=1, reset_timeout=10, half_open_max_calls=1)
+
+        async def run():
+            with self.assertRaises(ConnectionError):
+                await breaker.execute(self._fail)
+            self.clock = 11.0
+
+            release = asyncio.Event()
+
+            async def slow():
+                await release.wait()
+                return 'slow'
+
+            probe = asyncio.ensure_future(breaker.execute(slow))
+            await asyncio.sleep(0)
+            self.assertEqual(breaker.get_state()['calls_allowed'], 0)
+            with self.assertRaises(CircuitOpenError):
+                await breaker.execute(self._succeed)
+
+            release.set()
+            self.assertEqual(await probe, 'slow')
+            self.assertEqual(breaker.state, 'closed')
+
+        asyncio.run(run())
+
+    def test_bulkhead(self):
+        """Test that max_concurrent bounds calls in flight while closed"""
+        breaker = self._breaker(max_concurrent=2)
+        in_flight = []
+        peak = []
+
+        async def call():
+            in_flight.append(None)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.001)
+            in_flight.pop()
+
+        async def run():
+            await asyncio.gather(*(breaker.execute(call) for _ in range(6)))
+
+        asyncio.run(run())
+        self.assertEqual(max(peak), 2)
+
+    def test_failure_count_decays(self):
+        """Test that successes while closed pay down earlier failures"""
+        breaker = self._breaker(failure_threshold=3)
+
+        async def run():
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    await breaker.execute(self._fail)
+            await breaker.execute(self._succeed)
+            self.assertEqual(breaker.failure_count, 1)
+            with self.assertRaises(ConnectionError):
+                await breaker.execute(self._fail)
+            self.assertEqual(breaker.state, 'closed')
+
+        asyncio.run(run())
+
+    def test_reset(self):
+        """Test that reset closes the circuit without an event loop"""
+        breaker = self._breaker(failure_threshold=1)
+        with self.assertRaises(ConnectionError):
+            asyncio.run(breaker.execute(self._fail))
+
+        breaker.reset()
+
+        self.assertEqual(breaker.get_state(), {
+            'name': 'test', 'state': 'closed', 'failure_count': 0, 'failure_threshold': 1
+        })
+        self.assertEqual(asyncio.run(breaker.execute(self._succeed)), 'ok')
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the token bucket rate limiter"""
+
+    def test_burst_then_reject(self):
+        """Test that the burst is available at once and then exhausted"""
+        limiter = RateLimiter('test', rate=1.0, burst=3, wait=False)
+
+        async def run():
+            for _ in range(3):
+                self.assertEqual(await limiter.acquire(), 0.0)
+            with self.assertRaises(RateLimitError):
+                await limiter.acquire()
+
+            # A second's worth of refill covers one more token
+            limiter.last_refill -= 1.0
+            self.assertEqual(await limiter.acquire(), 0.0)
+
+        asyncio.run(run())
+
+    def test_refill_capped_at_burst(self):
+        """Test that idle time does not accumulate more than the burst"""
+        limiter = RateLimiter('test', rate=10.0, burst=2, wait=False)
+        limiter.last_refill -= 100.0
+
+        async def run():
+            await limiter.acquire(2)
+            with self.assertRaises(RateLimitError):
+                await limiter.acquire()
+
+        asyncio.run(run())
+
+    def test_wait_for_tokens(self):
+        """Test that a waiting limiter sleeps until enough tokens accrue"""
+        limiter = RateLimiter('test', rate=100.0, burst=1)
+
+        async def run():
+            await limiter.acquire()
+            waited = await limiter.acquire(2)
+            return waited, await limiter.execute(asyncio.sleep, 0, result='done')
+
+        waited, result = asyncio.run(run())
+        self.assertGreaterEqual(waited, 0.015)
+        self.assertEqual(result, 'done')
+
+
+class TestFailureDetector(unittest.TestCase):
+    """Test cases for the phi accrual failure detector"""
+
+    def _assert_sums(self, detector):
+        """Check the running sums against the sample window"""
+        samples = list(detector.samples)
+        self.assertTrue(math.isclose(detector._sum, sum(samples), rel_tol=1e-9))
+        self.assertTrue(math.isclose(detector._sum_sq, sum(s * s for s in samples), rel_tol=1e-9))
+
+    def test_running_sums_with_evictions(self):
+        """Test that running sums track the window as samples are evicted"""
+        detector = FailureDetector('test', window_size=20, min_samples=5)
+        rng = random.Random(3)
+        clock = 1000.0
+        with mock.patch.object(resilience.time, 'monotonic', lambda: clock):
+            for _ in range(75):
+                clock += rng.uniform(0.5, 1.5)
+                detector.record_heartbeat()
+
+        self.assertEqual(len(detector.samples), 20)
+        self.assertEqual(detector._evictions, 54 - 40)
+        self._assert_sums(detector)
+
+    def test_batch_matches_single(self):
+        """Test that batched heartbeats give the same window as single ones"""
+        rng = random.Random(4)
+        timestamps = []
+        clock = 1000.0
+        for _ in range(150):
+            clock += rng.uniform(0.5, 1.5)
+            timestamps.append(clock)
+
+        single = FailureDetector('single', window_size=50)
+        with mock.patch.object(resilience.time, 'monotonic', lambda: now):
+            for now in timestamps:
+                single.record_heartbeat()
+
+        for batch_sizes in ((150,), (10, 100, 40), (3,) * 50):
+            batched = FailureDetector('batched', window_size=50)
+            start = 0
+            for size in batch_sizes:
+                batched.record_heartbeats(timestamps[start:start + size])
+                start += size
+
+            self.assertEqual(batched.last_sample_time, single.last_sample_time)
+            self.assertEqual(len(batched.samples), 50)
+            for a, b in zip(batched.samples, single.samples):
+                self.assertAlmostEqual(a, b, places=9)
+            self._assert_sums(batched)
+
+    def test_phi(self):
+        """Test phi for regular heartbeats and a missed one"""
+        detector = FailureDetector('test', threshold=0.8, min_samples=3)
+        detector.record_heartbeats([1.0, 2.0, 3.0, 4.0])
+
+        with mock.patch.object(resilience.time, 'monotonic', lambda: 4.5):
+            self.assertEqual(detector.phi_value(), 0.0)
+            self.assertTrue(detector.is_available())
+        detector._phi_time = None
+        with mock.patch.object(resilience.time, 'monotonic', lambda: 6.0):
+            self.assertEqual(detector.phi_value(), 1.0)
+            self.assertFalse(detector.is_available())
+
+    def test_too_few_samples(self):
+        """Test that phi stays zero until min_samples intervals are seen"""
+        detector = FailureDetector('test', min_samples=10)
+        detector.record_heartbeats([1.0, 2.0, 3.0])
+
+        self.assertEqual(detector.phi_value(), 0.0)
+        self.assertEqual(detector.get_state()['samples'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Tests for the security module
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from hyperion.security import HAS_ARGON2, SecureCommunication, SecurityManager, User
+
+
+class _SecurityManagerMixin:
+    """Create a security manager backed by a temporary config file"""
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop('HYPERION_ADMIN_PASS', None)
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.config_path = os.path.join(tmpdir.name, 'security.json')
+        self.manager = SecurityManager(self.config_path)
+
+
+class TestApiKeyIndex(_SecurityManagerMixin, unittest.TestCase):
+    """Test cases for API key lookup through the keyed-hash index"""
+
+    def setUp(self):
+        super().setUp()
+        self.manager.create_user('alice', 'correct horse')
+        self.manager.create_user('bob', 'battery staple')
+
+    def test_authenticate(self):
+        """Test that generated keys authenticate their own user only"""
+        alice_key = self.manager.generate_api_key('alice', 'ci')
+        bob_key = self.manager.generate_api_key('bob', 'ci')
+
+        self.assertEqual(self.manager.authenticate_with_key(alice_key), 'alice')
+        self.assertEqual(self.manager.authenticate_with_key(bob_key), 'bob')
+        self.assertIsNone(self.manager.authenticate_with_key('not-a-key'))
+        self.assertIsNone(self.manager.generate_api_key('nobody', 'ci'))
+
+    def test_index_survives_save_and_load(self):
+        """Test that keys authenticate after reloading the configuration"""
+        api_key = self.manager.generate_api_key('alice', 'ci')
+
+        reloaded = SecurityManager(self.config_path)
+
+        self.assertEqual(reloaded.authenticate_with_key(api_key), 'alice')
+        self.assertNotEqual(reloaded._index_key, self.manager._index_key)
+
+    def test_revoke(self):
+        """Test that revoked keys are removed from the index and the user"""
+        api_key = self.manager.generate_api_key('alice', 'ci')
+
+        self.assertTrue(self.manager.revoke_api_key(api_key))
+        self.assertFalse(self.manager.revoke_api_key(api_key))
+        self.assertIsNone(self.manager.authenticate_with_key(api_key))
+        self.assertEqual(self.manager.users['alice'].api_keys, {})
+        self.assertEqual(self.manager._api_key_index, {})
+
+    def test_expired_key(self):
+        """Test that expired keys fail and leave the index"""
+        api_key = self.manager.generate_api_key('alice', 'ci', expires_in=60)
+        self.manager.users['alice'].api_keys[api_key]['expires_at'] = int(time.time()) - 1
+
+        self.assertIsNone(self.manager.authenticate_with_key(api_key))
+        self.assertEqual(self.manager._api_key_index, {})
+
+        # Expired keys are not indexed when the configuration is loaded
+        self.manager._save_config()
+        self.assertEqual(SecurityManager(self.config_path)._api_key_index, {})
+
+    def test_key_removed_from_user(self):
+        """Test that a key revoked on the user directly leaves the index on lookup"""
+        api_key = self.manager.generate_api_key('alice', 'ci')
+        self.manager.users['alice'].revoke_api_key(api_key)
+
+        self.assertIsNone(self.manager.authenticate_with_key(api_key))
+        self.assertEqual(self.manager._api_key_index, {})
+
+
+class TestTokenCache(_SecurityManagerMixin, unittest.TestCase):
+    """Test cases for the bounded token cache and its expiry sweep"""
+
+    def setUp(self):
+        super().setUp()
+        self.manager.create_user('alice', 'correct horse')
+
+    def _expire(self, token):
+        """Backdate a token's expiry"""
+        username, _ = self.manager.token_cache[token]
+        self.manager.token_cache[token] = (username, int(time.time()) - 1)
+
+    def test_lru_limit(self):
+        """Test that the least recently used token is evicted when full"""
+        self.manager._token_cache_max = 3
+        first, second, third = (self.manager.generate_token('alice') for _ in range(3))
+
+        self.assertEqual(self.manager.validate_token(first), 'alice')
+        fourth = self.manager.generate_token('alice')
+
+        self.assertEqual(list(self.manager.token_cache), [third, first, fourth])
+        self.assertIsNone(self.manager.validate_token(second))
+        self.assertIsNone(self.manager._token_sweep_task)
+
+    def test_validate_expired(self):
+        """Test that an expired token is rejected and removed"""
+        token = self.manager.generate_token('alice')
+        self._expire(token)
+
+        self.assertIsNone(self.manager.validate_token(token))
+        self.assertNotIn(token, self.manager.token_cache)
+
+    def test_sweep_expired_tokens(self):
+        """Test that the sweep scans a fraction of the cache from the LRU end"""
+        tokens = [self.manager.generate_token('alice') for _ in range(10)]
+        for token in tokens[:5]:
+            self._expire(token)
+
+        # int(10 * 0.2) + 1 = 3 tokens are scanned
+        self.assertEqual(self.manager.sweep_expired_tokens(fraction=0.2), 3)
+        self.assertEqual(list(self.manager.token_cache), tokens[3:])
+        self.assertEqual(self.manager.sweep_expired_tokens(fraction=1.0), 2)
+        self.assertEqual(self.manager.sweep_expired_tokens(fraction=1.0), 0)
+        self.assertEqual(list(self.manager.token_cache), tokens[5:])
+
+    def test_sweep_starts_with_first_token(self):
+        """Test that generating a token on the event loop starts the sweep"""
+        self.manager._token_sweep_interval = 0.01
+
+        async def run():
+            expired = self.manager.generate_token('alice')
+            task = self.manager._token_sweep_task
+            self.assertIsNotNone(task)
+            valid = self.manager.generate_token('alice')
+            self.assertIs(self.manager._token_sweep_task, task)
+
+            self._expire(expired)
+            await asyncio.sleep(0.05)
+            self.assertEqual(list(self.manager.token_cache), [valid])
+
+            await self.manager.stop_token_sweep()
+            self.assertTrue(task.cancelled())
+            self.assertIsNone(self.manager._token_sweep_task)
+
+        asyncio.run(run())
+
+
+class TestMessageSignatures(unittest.TestCase):
+    """Test cases for HMAC message signatures"""
+
+    def setUp(self):
+        self.comm = SecureCommunication('secret')
+
+    def test_round_trip(self):
+        """Test that a signature verifies for its own message only"""
+        signature = self.comm.sign_message('hello')
+
+        self.assertEqual(len(signature), 64)
+        self.assertTrue(self.comm.verify_signature('hello', signature))
+        self.assertFalse(self.comm.verify_signature('hello!', signature))
+        self.assertFalse(SecureCommunication('other').verify_signature('hello', signature))
+
+    def test_malformed_signatures(self):
+        """Test that only exactly 64 lowercase hex characters are accepted"""
+        signature = self.comm.sign_message('hello')
+        spaced = ' '.join(signature[i:i + 2] for i in range(0, 64, 2))
+
+        for malformed in (
+            spaced, f" {signature}", f"{signature}\n", signature.upper(),
+            signature[:-2], signature + '00', 'zz' * 32, '', None, signature.encode()
+        ):
+            self.assertFalse(self.comm.verify_signature('hello', malformed), repr(malformed))
+
+    def test_secret_key_change(self):
+        """Test that changing the secret key changes signatures"""
+        signature = self.comm.sign_message('hello')
+        self.comm.secret_key = 'rotated'
+
+        self.assertFalse(self.comm.verify_signature('hello', signature))
+        self.assertTrue(self.comm.verify_signature('hello', self.comm.sign_message('hello')))
+
+
+class TestPasswordHashing(_SecurityManagerMixin, unittest.TestCase):
+    """Test cases for password hashing and legacy hash migration"""
+
+    def _legacy_user(self, username, password):
+        """Add a user with a PBKDF2 password hash"""
+        password_hash, salt = self.manager._hash_password(password, 'legacy-salt')
+        self.manager.users[username] = User(username, password_hash, salt)
+
+    @unittest.skipUnless(HAS_ARGON2, "argon2-cffi is required")
+    def test_argon2(self):
+        """Test that new users get Argon2id hashes that verify"""
+        user = self.manager.create_user('alice', 'correct horse')
+
+        self.assertTrue(user.password_hash.startswith('$argon2id$'))
+        self.assertEqual(user.salt, '')
+        self.assertTrue(self.manager.authenticate('alice', 'correct horse'))
+        self.assertFalse(self.manager.authenticate('alice', 'wrong'))
+        self.assertFalse(self.manager.authenticate('nobody', 'correct horse'))
+
+    @unittest.skipUnless(HAS_ARGON2, "argon2-cffi is required")
+    def test_pbkdf2_migration(self):
+        """Test that a PBKDF2 hash is replaced with Argon2id on login"""
+        self._legacy_user('bob', 'battery staple')
+
+        self.assertFalse(self.manager.authenticate('bob', 'wrong'))
+        self.assertFalse(self.manager.users['bob'].password_hash.startswith('$argon2'))
+
+        self.assertTrue(self.manager.authenticate('bob', 'battery staple'))
+        user = self.manager.users['bob']
+        self.assertTrue(user.password_hash.startswith('$argon2id$'))
+        self.assertEqual(user.salt, '')
+
+        # The migrated hash is saved and verifies after a reload
+        reloaded = SecurityManager(self.config_path)
+        self.assertTrue(reloaded.authenticate('bob', 'battery staple'))
+
+    def test_pbkdf2_without_argon2(self):
+        """Test that PBKDF2 hashes keep working without argon2-cffi"""
+        self.manager._password_hasher = None
+        self._legacy_user('bob', 'battery staple')
+        user = self.manager.create_user('carol', 'hunter2')
+
+        self.assertEqual(len(user.salt), 32)
+        self.assertTrue(self.manager.authenticate('bob', 'battery staple'))
+        self.assertTrue(self.manager.authenticate('carol', 'hunter2'))
+        self.assertFalse(self.manager.authenticate('carol', 'wrong'))
+        self.assertEqual(self.manager.users['bob'].salt, 'legacy-salt')
+
+
+if __name__ == '__main__':
+    unittest.main()